@@ -0,0 +1 @@
+"""Núcleo compartilhado pelas calculadoras de orçamento (Revisão, VLA e ELIV)."""
@@ -0,0 +1,120 @@
+# orcamentos/api.py
+"""API HTTP (ASGI) de cotação e geração de orçamentos, ao lado da UI Streamlit.
+
+    uvicorn orcamentos.api:app --host 0.0.0.0 --port 8000 --workers 2
+
+Endpoints (JSON no corpo, JSON na resposta):
+
+- ``POST /revisao``  palavras, valor_palavra, desconto_pct, aplicar_desconto, parcelas,
+  cliente, consultor, observacoes
+- ``POST /vla``      tipo (Acadêmico/Literário), preco_capa, qtd, cliente, consultor, emojis
+- ``POST /eliv``     pacote, forma_pag, desconto_pct, cliente, consultor, obra, paginas,
+  observacoes e, opcionalmente, ``universidade: {nome, contato, tratamento,
+  preco_capa, qtd, desconto_pct, ebook_preco}``
+- ``GET /saude``
+- ``GET /metricas``  métricas do processo no formato texto do Prometheus
+
+Com ``"docx": true`` a resposta traz o DOCX em base64 (``docx_base64``); com o
+cabeçalho ``Accept`` do DOCX a resposta é o próprio arquivo. A renderização roda
+no pool de processos (``orcamentos.processos``), fora do event loop; com o pool
+lotado a resposta é 503 com Retry-After. Todo documento gerado vai
+para o histórico (``orcamentos.historico``). Campos, padrões e validação:
+``orcamentos.cotacao``, os mesmos do lote JSONL (``orcamentos.lote_jsonl``).
+"""
+import asyncio
+import base64
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from orcamentos import config, cotacao, desempenho, historico, processos
+from orcamentos.modelos import ler_arquivo
+
+MIME_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+ErroEntrada = cotacao.ErroEntrada
+
+_render_pool = ThreadPoolExecutor(max_workers=int(os.environ.get("ORCAMENTO_API_RENDER_WORKERS", "4")),
+                                  thread_name_prefix="render")
+
+
+async def _renderizar(caminho: Path, contexto: dict) -> bytes:
+    dados, h = ler_arquivo(caminho)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_render_pool, processos.renderizar, dados, contexto, h)
+
+
+async def _responder(request: Request, corpo: dict, cot: cotacao.Cotacao) -> Response:
+    """JSON da cotação; com DOCX pedido (e modelo), renderiza e registra no histórico."""
+    resultado = cot.resultado
+    quer_arquivo = MIME_DOCX in request.headers.get("accept", "")
+    if cot.modelo is not None and (quer_arquivo or corpo.get("docx")):
+        docx = await _renderizar(cot.modelo, cot.contexto)
+        desempenho.tamanho("api.docx", len(docx))
+        nome = f"{cot.nome}.docx"
+        dados, h = ler_arquivo(cot.modelo)
+        historico.registrar(cot.produto, cot.cliente, cot.consultor, cot.valor_cent, cot.contexto, cot.script,
+                            modelo=dados, modelo_hash=h)
+        if quer_arquivo:
+            return Response(docx, media_type=MIME_DOCX,
+                            headers={"Content-Disposition": f'attachment; filename="{nome}"'})
+        resultado["docx_base64"] = base64.b64encode(docx).decode("ascii")
+        resultado["docx_nome"] = nome
+    return JSONResponse(resultado)
+
+
+async def _corpo(request: Request) -> dict:
+    try:
+        corpo = await request.json()
+    except ValueError:
+        raise ErroEntrada("corpo precisa ser JSON") from None
+    if not isinstance(corpo, dict):
+        raise ErroEntrada("corpo precisa ser um objeto JSON")
+    return corpo
+
+
+async def cotar_revisao(request: Request) -> Response:
+    d = await _corpo(request)
+    return await _responder(request, d, cotacao.cotar_revisao(d))
+
+
+async def cotar_vla(request: Request) -> Response:
+    d = await _corpo(request)
+    return await _responder(request, d, cotacao.cotar_vla(d))
+
+
+async def cotar_eliv(request: Request) -> Response:
+    d = await _corpo(request)
+    return await _responder(request, d, cotacao.cotar_eliv(d))
+
+
+async def saude(request: Request) -> Response:
+    return JSONResponse({"ok": True, "config_versao": config.atual().versao})
+
+
+async def metricas(request: Request) -> Response:
+    return PlainTextResponse(desempenho.prometheus(), media_type="text/plain; version=0.0.4")
+
+
+async def _erro_entrada(request: Request, exc: ErroEntrada) -> Response:
+    return JSONResponse({"erro": str(exc)}, status_code=422)
+
+
+async def _fila_cheia(request: Request, exc: processos.FilaCheia) -> Response:
+    return JSONResponse({"erro": str(exc)}, status_code=503, headers={"Retry-After": "1"})
+
+
+app = Starlette(
+    routes=[
+        Route("/revisao", cotar_revisao, methods=["POST"]),
+        Route("/vla", cotar_vla, methods=["POST"]),
+        Route("/eliv", cotar_eliv, methods=["POST"]),
+        Route("/saude", saude, methods=["GET"]),
+        Route("/metricas", metricas, methods=["GET"]),
+    ],
+    exception_handlers={ErroEntrada: _erro_entrada, processos.FilaCheia: _fila_cheia},
+)
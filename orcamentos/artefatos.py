@@ -0,0 +1,183 @@
+# orcamentos/artefatos.py
+"""Downloads dos documentos gerados, servidos do disco em vez da memória.
+
+``st.download_button(data=...)`` guarda os bytes no gerenciador de mídia do
+Streamlit, na memória do processo, enquanto o botão estiver na tela de cada
+sessão. Aqui:
+
+- arquivos pequenos (até ORCAMENTO_DOWNLOAD_INLINE_KB, padrão 1024) continuam no
+  botão, enquanto a soma deles no processo couber em ORCAMENTO_DOWNLOAD_MEM_MB
+  (padrão 64);
+- os demais, e tudo que é escrito por partes (ZIPs, exportações), vão para
+  ``static/artefatos/<token>/<nome>`` e viram um link. O servidor de arquivos
+  estáticos do Streamlit (``server.enableStaticServing``, ligado em
+  .streamlit/config.toml) lê o arquivo do disco em blocos.
+
+A reserva de memória de uma sessão é liberada quando ela se desconecta (o
+Streamlit descarta a mídia dela), não só quando o TTL vence.
+
+O token é aleatório (não dá para adivinhar o link de outra sessão) e cada
+pasta é apagada ORCAMENTO_ARTEFATOS_TTL_MIN minutos (padrão 60) depois de
+criada. Sem o servidor estático, tudo volta para o ``st.download_button``.
+"""
+import html
+import os
+import secrets
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterator
+from urllib.parse import quote
+
+import streamlit as st
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from orcamentos import desempenho
+
+# o Streamlit serve <pasta do script principal>/static em app/static/
+DIRETORIO = Path(__file__).resolve().parent.parent / "static" / "artefatos"
+URL = "app/static/artefatos"
+TTL_S = float(os.environ.get("ORCAMENTO_ARTEFATOS_TTL_MIN", "60")) * 60
+MAX_INLINE = int(float(os.environ.get("ORCAMENTO_DOWNLOAD_INLINE_KB", "1024")) * 1024)
+MAX_MEMORIA = int(float(os.environ.get("ORCAMENTO_DOWNLOAD_MEM_MB", "64")) * 1024 * 1024)
+_LIMPEZA_S = 60
+
+MIMES = {
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".pdf": "application/pdf",
+    ".zip": "application/zip",
+    ".csv": "text/csv",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".txt": "text/plain",
+}
+
+
+@dataclass(frozen=True)
+class Artefato:
+    nome: str
+    caminho: Path
+    url: str
+
+    @property
+    def tamanho(self) -> int:
+        return self.caminho.stat().st_size
+
+
+_lock = threading.Lock()
+# (sessão, chave do botão) -> (bytes, instante): o que está no gerenciador de mídia
+_em_memoria: dict[tuple[str, str], tuple[int, float]] = {}
+_proxima_limpeza = 0.0
+
+
+def estatico_ativo() -> bool:
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def _soltar_encerradas() -> None:
+    """Tira de ``_em_memoria`` as sessões que já saíram (chamar com ``_lock``)."""
+    if not Runtime.exists():  # modo bare/testes: não há sessões para consultar
+        return
+    runtime = Runtime.instance()
+    encerradas = {s for s, _ in _em_memoria if s and not runtime.is_active_session(s)}
+    for chave in [k for k in _em_memoria if k[0] in encerradas]:
+        del _em_memoria[chave]
+
+
+def _limpar() -> None:
+    global _proxima_limpeza
+    agora = time.time()
+    with _lock:
+        if agora < _proxima_limpeza:
+            return
+        _proxima_limpeza = agora + _LIMPEZA_S
+        for chave in [k for k, (_, t) in _em_memoria.items() if agora - t > TTL_S]:
+            del _em_memoria[chave]
+        _soltar_encerradas()
+    try:
+        pastas = list(DIRETORIO.iterdir())
+    except FileNotFoundError:
+        return
+    for pasta in pastas:
+        try:
+            if agora - pasta.stat().st_mtime > TTL_S:
+                shutil.rmtree(pasta, ignore_errors=True)
+        except FileNotFoundError:
+            pass  # outro processo apagou primeiro
+
+
+@contextmanager
+def novo(nome: str) -> Iterator[tuple[IO[bytes], Artefato]]:
+    """Arquivo novo na pasta de artefatos: ``with novo("x.zip") as (f, art): ...``.
+
+    O arquivo só aparece com o nome final ao sair do bloco sem erro.
+    """
+    _limpar()
+    pasta = DIRETORIO / secrets.token_urlsafe(16)
+    pasta.mkdir(parents=True)
+    art = Artefato(nome, pasta / nome, f"{URL}/{pasta.name}/{quote(nome)}")
+    parte = pasta / f"{nome}.parte"
+    try:
+        with open(parte, "wb") as f:
+            yield f, art
+        os.replace(parte, art.caminho)
+    except BaseException:
+        shutil.rmtree(pasta, ignore_errors=True)
+        raise
+
+
+def publicar(nome: str, dados: bytes) -> Artefato:
+    with novo(nome) as (f, art):
+        f.write(dados)
+    return art
+
+
+def _reservar(chave: str, tamanho: int) -> bool:
+    """Conta ``tamanho`` bytes na memória do processo, se couber em MAX_MEMORIA."""
+    ctx = get_script_run_ctx()
+    chave = (ctx.session_id if ctx else "", chave)
+    with _lock:
+        _em_memoria.pop(chave, None)  # o botão anterior com a mesma chave sai da tela
+        if tamanho > MAX_INLINE:
+            return False
+        if sum(n for n, _ in _em_memoria.values()) + tamanho > MAX_MEMORIA:
+            _soltar_encerradas()  # antes de mandar para o disco, confere se alguém já saiu
+            if sum(n for n, _ in _em_memoria.values()) + tamanho > MAX_MEMORIA:
+                return False
+        _em_memoria[chave] = (tamanho, time.time())
+        return True
+
+
+def _link(rotulo: str, art: Artefato) -> None:
+    desempenho.contar("download.disco")
+    st.markdown(f'<a href="{art.url}" download="{html.escape(art.nome)}">{html.escape(rotulo)}</a>',
+                unsafe_allow_html=True)
+    st.caption(f"Link válido por {TTL_S / 60:.0f} min.")
+
+
+def oferecer(rotulo: str, nome: str, dados: bytes, key: str | None = None) -> None:
+    """Botão de download de ``dados``: da memória se couber, senão do disco (link)."""
+    if not estatico_ativo() or _reservar(key or nome, len(dados)):
+        desempenho.contar("download.memoria")
+        st.download_button(rotulo, data=dados, file_name=nome, mime=MIMES.get(Path(nome).suffix), key=key)
+    else:
+        _link(rotulo, publicar(nome, dados))
+
+
+def oferecer_artefato(rotulo: str, art: Artefato, key: str | None = None) -> None:
+    """Link para um artefato já gravado (``novo``); sem servidor estático, botão com os bytes."""
+    if estatico_ativo():
+        _link(rotulo, art)
+        return
+    dados = art.caminho.read_bytes()
+    shutil.rmtree(art.caminho.parent, ignore_errors=True)
+    desempenho.contar("download.memoria")
+    st.download_button(rotulo, data=dados, file_name=art.nome, mime=MIMES.get(Path(art.nome).suffix), key=key)
+
+
+def estatisticas() -> dict:
+    with _lock:
+        return {"em_memoria": sum(n for n, _ in _em_memoria.values()), "botoes": len(_em_memoria)}
@@ -0,0 +1,208 @@
+# orcamentos/cache_saida.py
+"""Cache dos documentos já gerados (DOCX/PDF), endereçado pelo conteúdo.
+
+A chave é o SHA-256 de (hash do modelo, contexto em JSON canônico, formato):
+reruns do Streamlit e cliques repetidos em "Gerar DOCX" com os mesmos dados
+devolvem os mesmos bytes sem renderizar de novo. Como o .docx é gravado de
+forma determinística (ordem fixa dos membros e data fixa no ZIP, ver
+``modelos.renderizar``), a mesma entrada sempre gera os mesmos bytes.
+
+Dois níveis, ambos LRU e limitados por tamanho:
+
+- memória: ORCAMENTO_CACHE_MEM_MB (padrão 64);
+- disco: o que sai da memória vai para ORCAMENTO_CACHE_DIR (padrão
+  dados/cache_saida) até ORCAMENTO_CACHE_DISCO_MB (padrão 256).
+
+ORCAMENTO_CACHE=0 desliga o cache. Acertos e faltas vão para
+``desempenho.contar`` (cache.hit_memoria, cache.hit_disco, cache.miss).
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+from orcamentos import desempenho
+
+ATIVO = os.environ.get("ORCAMENTO_CACHE", "1") != "0"
+MAX_MEMORIA = int(float(os.environ.get("ORCAMENTO_CACHE_MEM_MB", "64")) * 1024 * 1024)
+MAX_DISCO = int(float(os.environ.get("ORCAMENTO_CACHE_DISCO_MB", "256")) * 1024 * 1024)
+DIRETORIO = Path(os.environ.get("ORCAMENTO_CACHE_DIR")
+                 or Path(__file__).resolve().parent.parent / "dados" / "cache_saida")
+
+_lock = threading.Lock()
+_memoria: "OrderedDict[str, bytes]" = OrderedDict()
+_bytes_memoria = 0
+_disco: "OrderedDict[str, int] | None" = None  # chave -> tamanho, do menos para o mais recente
+_bytes_disco = 0
+_em_andamento: dict[str, threading.Event] = {}
+
+
+def chave(modelo_hash: str, contexto: dict, formato: str = "docx") -> str:
+    canonico = json.dumps(contexto, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    h = hashlib.sha256()
+    for parte in (formato, modelo_hash, canonico):
+        h.update(parte.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def chave_pdf(docx: bytes) -> str:
+    return hashlib.sha256(b"pdf\0" + docx).hexdigest()
+
+
+# ------------------------- disco -------------------------
+def _arquivo(k: str) -> Path:
+    return DIRETORIO / k[:2] / k
+
+
+def _indice_disco() -> "OrderedDict[str, int]":
+    """Índice do disco, montado na primeira vez a partir dos arquivos (mais antigos primeiro)."""
+    global _disco, _bytes_disco
+    if _disco is None:
+        itens = []
+        if DIRETORIO.exists():
+            for p in DIRETORIO.glob("??/*"):
+                if p.suffix == ".tmp":
+                    continue
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                itens.append((st.st_mtime, p.name, st.st_size))
+        itens.sort()
+        _disco = OrderedDict((nome, tam) for _, nome, tam in itens)
+        _bytes_disco = sum(_disco.values())
+    return _disco
+
+
+def _ler_disco(k: str) -> bytes | None:
+    global _bytes_disco
+    with _lock:
+        disco = _indice_disco()
+        if k not in disco:
+            return None
+        disco.move_to_end(k)
+    try:
+        dados = _arquivo(k).read_bytes()
+        os.utime(_arquivo(k))  # a ordem LRU sobrevive a reinícios pelo mtime
+        return dados
+    except OSError:
+        with _lock:
+            _bytes_disco -= disco.pop(k, 0)
+        return None
+
+
+def _gravar_disco(itens: list[tuple[str, bytes]]) -> None:
+    global _bytes_disco
+    removidos = []
+    for k, dados in itens:
+        if len(dados) > MAX_DISCO:
+            continue
+        destino = _arquivo(k)
+        try:
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            tmp = destino.with_name(f"{k}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(dados)
+            os.replace(tmp, destino)
+        except OSError:
+            continue
+        with _lock:
+            disco = _indice_disco()
+            _bytes_disco += len(dados) - disco.pop(k, 0)
+            disco[k] = len(dados)
+            while _bytes_disco > MAX_DISCO and disco:
+                velho, tam = disco.popitem(last=False)
+                _bytes_disco -= tam
+                removidos.append(velho)
+    for k in removidos:
+        try:
+            _arquivo(k).unlink()
+        except OSError:
+            pass
+
+
+# ------------------------- memória -------------------------
+def obter(k: str) -> bytes | None:
+    with _lock:
+        dados = _memoria.get(k)
+        if dados is not None:
+            _memoria.move_to_end(k)
+    if dados is not None:
+        desempenho.contar("cache.hit_memoria")
+        return dados
+    dados = _ler_disco(k)
+    if dados is not None:
+        desempenho.contar("cache.hit_disco")
+        guardar(k, dados)
+    return dados
+
+
+def guardar(k: str, dados: bytes) -> None:
+    global _bytes_memoria
+    if len(dados) > MAX_MEMORIA:
+        _gravar_disco([(k, dados)])
+        return
+    despejados = []
+    with _lock:
+        antigo = _memoria.pop(k, None)
+        if antigo is not None:
+            _bytes_memoria -= len(antigo)
+        _memoria[k] = dados
+        _bytes_memoria += len(dados)
+        while _bytes_memoria > MAX_MEMORIA:
+            velho, d = _memoria.popitem(last=False)
+            _bytes_memoria -= len(d)
+            despejados.append((velho, d))
+    if despejados:
+        _gravar_disco(despejados)
+
+
+def obter_ou_gerar(k: str, gerar: Callable[[], bytes]) -> bytes:
+    """Devolve do cache ou chama ``gerar()``; pedidos simultâneos da mesma chave geram uma vez só."""
+    if not ATIVO:
+        return gerar()
+    while True:
+        dados = obter(k)
+        if dados is not None:
+            return dados
+        with _lock:
+            evento = _em_andamento.get(k)
+            if evento is None:
+                evento = _em_andamento[k] = threading.Event()
+                dono = True
+            else:
+                dono = False
+        if not dono:
+            evento.wait()
+            continue  # o dono terminou (ou falhou): tenta o cache de novo
+        try:
+            desempenho.contar("cache.miss")
+            dados = gerar()
+            guardar(k, dados)
+            return dados
+        finally:
+            with _lock:
+                del _em_andamento[k]
+            evento.set()
+
+
+def estatisticas() -> dict:
+    with _lock:
+        disco = _disco or {}
+        return {
+            "memoria_itens": len(_memoria),
+            "memoria_bytes": _bytes_memoria,
+            "disco_itens": len(disco),
+            "disco_bytes": _bytes_disco,
+            **{k.split(".", 1)[1]: v for k, v in desempenho.contadores().items() if k.startswith("cache.")},
+        }
+
+
+def limpar_memoria() -> None:
+    global _bytes_memoria
+    with _lock:
+        _memoria.clear()
+        _bytes_memoria = 0
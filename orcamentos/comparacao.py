@@ -0,0 +1,104 @@
+# orcamentos/comparacao.py
+"""Comparação ELIV: todas as combinações pacote × forma × desconto numa passada.
+
+``matriz`` calcula os totais de uma vez (broadcasting em ``precos``), já com a
+tiragem da universidade e o total geral quando houver; ``gerar_zip`` renderiza
+os documentos escolhidos em paralelo e junta tudo num único ZIP.
+"""
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable
+
+import numpy as np
+
+from orcamentos import config, precos, processos
+from orcamentos.eliv import FORMAS, br_money
+from orcamentos.lote import WORKERS
+from orcamentos.modelos import ler_arquivo
+
+DESCONTOS = tuple(range(0, 41, 5))  # mesmos limites do slider da página (0 a 40%)
+
+
+@dataclass(frozen=True)
+class Documento:
+    nome: str          # nome do arquivo dentro do ZIP
+    modelo: Path
+    contexto: dict
+
+
+def matriz(descontos=DESCONTOS, tiragem_cent: int = 0) -> list[dict]:
+    """Uma linha por pacote × forma × desconto, com valores em centavos.
+
+    ``tiragem_cent`` (total da tiragem da universidade) entra em ``total_geral_cent``.
+    """
+    pacotes = config.atual().pacotes
+    nomes = list(pacotes)
+    listas = np.array([pacotes[p]["lista_pix"] for p in nomes])[:, None]
+    parcelas = np.array([pacotes[p]["parcelas"] for p in nomes])[:, None]
+    r = precos.eliv_pacote(listas, np.asarray(descontos, dtype=np.float64)[None, :], parcelas)
+    totais, mensais = r["total_com_desc"].tolist(), r["mensal"].tolist()
+    linhas = []
+    for i, pacote in enumerate(nomes):
+        for forma in FORMAS:
+            for j, desconto in enumerate(descontos):
+                linhas.append({
+                    "pacote": pacote,
+                    "forma_pag": forma,
+                    "desconto_pct": desconto,
+                    "parcelas": pacotes[pacote]["parcelas"],
+                    "total_cent": totais[i][j],
+                    "mensal_cent": mensais[i][j] if forma == FORMAS[0] else None,
+                    "tiragem_cent": int(tiragem_cent),
+                    "total_geral_cent": totais[i][j] + int(tiragem_cent),
+                })
+    return linhas
+
+
+def tabela(linhas: list[dict], campo: str = "total_cent") -> list[dict]:
+    """Matriz para exibir: uma linha por pacote/forma, uma coluna por desconto."""
+    out: dict[tuple[str, str], dict] = {}
+    for ln in linhas:
+        linha = out.setdefault((ln["pacote"], ln["forma_pag"]),
+                               {"Pacote": ln["pacote"], "Forma": ln["forma_pag"]})
+        valor = br_money(precos.reais(ln[campo]))
+        if campo == "total_cent" and ln["mensal_cent"] is not None:
+            valor += f" ({ln['parcelas']}x {br_money(precos.reais(ln['mensal_cent']))})"
+        linha[f"{ln['desconto_pct']:g}%"] = valor
+    return list(out.values())
+
+
+def nome_arquivo(tipo: str, pacote: str, forma_pag: str, desconto_pct: float) -> str:
+    forma = re.sub(r"[^0-9A-Za-z]+", "_", forma_pag.replace("à", "a")).strip("_")
+    return f"Orcamento_{tipo}_ELIV_{pacote.replace('á', 'a')}_{forma}_{desconto_pct:g}pct.docx"
+
+
+def gerar_zip(documentos: list[Documento], destino: IO[bytes], workers: int = WORKERS,
+              ao_gerar: Callable[[Documento], None] | None = None) -> list[tuple[str, str]]:
+    """Renderiza os documentos em paralelo e grava cada um no ZIP assim que termina.
+
+    Devolve a lista de (nome, erro) dos que falharam. ``ao_gerar(doc)`` é chamado
+    na thread de quem chamou para cada documento gravado.
+    """
+    erros = []
+
+    def tarefa(doc: Documento) -> bytes:
+        dados, h = ler_arquivo(doc.modelo)
+        return processos.renderizar(dados, doc.contexto, h, espera=None)
+
+    # DOCX já é compactado por dentro: ZIP_STORED evita comprimir de novo
+    with zipfile.ZipFile(destino, "w", zipfile.ZIP_STORED) as zf, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        futuros = {pool.submit(tarefa, doc): doc for doc in documentos}
+        for fut in as_completed(futuros):
+            doc = futuros[fut]
+            try:
+                zf.writestr(doc.nome, fut.result())
+            except Exception as e:
+                erros.append((doc.nome, str(e)))
+            else:
+                if ao_gerar:
+                    ao_gerar(doc)
+    return erros
@@ -0,0 +1,174 @@
+# orcamentos/config.py
+"""Configuração comercial (políticas VLA, pacotes ELIV, parcelas, prazos).
+
+Os valores ficam em precificacao.toml, na raiz do repositório, ou no arquivo
+indicado por ORCAMENTO_CONFIG (TOML ou JSON). O arquivo é validado e compilado
+uma única vez num ``Config`` imutável, com as políticas já em
+``TabelaDescontos``.
+
+``atual()`` devolve a configuração vigente. No máximo a cada INTERVALO_S
+(ORCAMENTO_CONFIG_INTERVALO_S, padrão 2 s) ela confere o mtime do arquivo. Se
+ele mudou, recompila e troca a referência de uma vez; quem já pegou a versão
+anterior termina a conta com ela. Um arquivo inválido é rejeitado (erro no
+log) e a versão anterior continua valendo.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+
+from orcamentos.politicas import TabelaDescontos
+
+log = logging.getLogger("orcamentos.config")
+
+CAMINHO = Path(os.environ.get("ORCAMENTO_CONFIG")
+               or Path(__file__).resolve().parent.parent / "precificacao.toml")
+INTERVALO_S = float(os.environ.get("ORCAMENTO_CONFIG_INTERVALO_S", "2"))
+
+
+class ConfigInvalida(ValueError):
+    pass
+
+
+@dataclass(frozen=True, eq=False)  # eq=False: hash por identidade, serve de chave de cache
+class Config:
+    versao: str
+    prazo_dias: int
+    vla_parcelas: int
+    frete_gratis_min_qtd: int
+    tabelas: Mapping[str, TabelaDescontos]
+    pacotes: Mapping[str, Mapping[str, float]]
+
+
+def _secao(d: dict, nome: str) -> dict:
+    v = d.get(nome)
+    if not isinstance(v, dict):
+        raise ConfigInvalida(f"seção [{nome}] ausente ou inválida.")
+    return v
+
+
+def _inteiro(d: dict, chave: str, onde: str, minimo: int = 0) -> int:
+    v = d.get(chave)
+    if not isinstance(v, int) or isinstance(v, bool) or v < minimo:
+        raise ConfigInvalida(f"{onde}.{chave} precisa ser inteiro >= {minimo} (veio {v!r}).")
+    return v
+
+
+def _numero(d: dict, chave: str, onde: str) -> float:
+    v = d.get(chave)
+    if not isinstance(v, (int, float)) or isinstance(v, bool) or v <= 0:
+        raise ConfigInvalida(f"{onde}.{chave} precisa ser número > 0 (veio {v!r}).")
+    return float(v)
+
+
+def compilar(dados: dict) -> Config:
+    """Valida o conteúdo já lido (TOML/JSON) e monta as estruturas de consulta."""
+    versao = dados.get("versao")
+    if not isinstance(versao, str) or not versao.strip():
+        raise ConfigInvalida("'versao' é obrigatória (texto).")
+    rev, vla, eliv = _secao(dados, "revisao"), _secao(dados, "vla"), _secao(dados, "eliv")
+
+    politicas = _secao(vla, "politicas")
+    if not politicas:
+        raise ConfigInvalida("[vla.politicas] precisa de pelo menos uma política.")
+    tabelas = {}
+    for nome, faixas in politicas.items():
+        if not isinstance(faixas, list) or not all(isinstance(f, dict) for f in faixas):
+            raise ConfigInvalida(f"política '{nome}' precisa ser uma lista de faixas.")
+        for f in faixas:
+            if (not isinstance(f.get("min"), int) or not isinstance(f.get("max", 0), int)
+                    or not isinstance(f.get("pct"), (int, float))):
+                raise ConfigInvalida(f"política '{nome}': faixa inválida {f!r}.")
+        tabelas[nome] = TabelaDescontos(nome, [
+            {"min": f.get("min"), "max": f.get("max"), "pct": f.get("pct")} for f in faixas
+        ])
+
+    pacotes = {}
+    for nome, p in _secao(eliv, "pacotes").items():
+        onde = f"eliv.pacotes.{nome}"
+        if not isinstance(p, dict):
+            raise ConfigInvalida(f"{onde} inválido.")
+        pacotes[nome] = MappingProxyType({
+            "lista_pix": _numero(p, "lista_pix", onde),
+            "mensal_6x": _numero(p, "mensal_6x", onde),
+            "parcelas": _inteiro(p, "parcelas", onde, minimo=1),
+        })
+    if not pacotes:
+        raise ConfigInvalida("[eliv.pacotes] precisa de pelo menos um pacote.")
+
+    return Config(
+        versao=versao.strip(),
+        prazo_dias=_inteiro(rev, "prazo_dias", "revisao"),
+        vla_parcelas=_inteiro(vla, "parcelas", "vla", minimo=1),
+        frete_gratis_min_qtd=_inteiro(vla, "frete_gratis_min_qtd", "vla", minimo=1),
+        tabelas=MappingProxyType(tabelas),
+        pacotes=MappingProxyType(pacotes),
+    )
+
+
+def ler(caminho: Path) -> Config:
+    texto = Path(caminho).read_text(encoding="utf-8")
+    try:
+        dados = json.loads(texto) if Path(caminho).suffix == ".json" else tomllib.loads(texto)
+    except ValueError as e:  # TOMLDecodeError e JSONDecodeError são ValueError
+        raise ConfigInvalida(f"{caminho}: {e}") from None
+    return compilar(dados)
+
+
+# ------------------------- recarga a quente -------------------------
+_lock = threading.Lock()
+_atual: Config | None = None
+_assinatura: tuple[int, int] | None = None  # (mtime_ns, tamanho) do arquivo carregado/rejeitado
+_proxima_checagem = 0.0
+
+
+def _verificar() -> Config:
+    global _atual, _assinatura, _proxima_checagem
+    with _lock:
+        if _atual is not None and time.monotonic() < _proxima_checagem:
+            return _atual  # outra thread acabou de conferir
+        _proxima_checagem = time.monotonic() + INTERVALO_S
+        try:
+            st = os.stat(CAMINHO)
+        except OSError as e:
+            if _atual is None:
+                raise ConfigInvalida(f"configuração não encontrada: {CAMINHO}") from e
+            log.error("configuração %s inacessível (%s); mantendo a versão %s", CAMINHO, e, _atual.versao)
+            return _atual
+        assinatura = (st.st_mtime_ns, st.st_size)
+        if assinatura == _assinatura and _atual is not None:
+            return _atual
+        try:
+            novo = ler(CAMINHO)
+        except (OSError, ValueError) as e:
+            if _atual is None:
+                raise
+            # não tenta de novo até o arquivo mudar outra vez
+            _assinatura = assinatura
+            log.error("configuração %s rejeitada; mantendo a versão %s: %s", CAMINHO, _atual.versao, e)
+            return _atual
+        if _atual is not None:
+            log.info("configuração recarregada: versão %s → %s", _atual.versao, novo.versao)
+        _atual, _assinatura = novo, assinatura
+        return novo
+
+
+def atual() -> Config:
+    """Configuração vigente (confere o arquivo no máximo a cada INTERVALO_S)."""
+    cfg = _atual
+    if cfg is not None and time.monotonic() < _proxima_checagem:
+        return cfg
+    return _verificar()
+
+
+def recarregar() -> Config:
+    """Confere o arquivo agora, sem esperar o intervalo."""
+    global _proxima_checagem
+    _proxima_checagem = 0.0
+    return _verificar()
@@ -0,0 +1,237 @@
+# orcamentos/conversor_pdf.py
+"""Conversão DOCX → PDF com backends plugáveis.
+
+Backends, em ordem de preferência no modo automático:
+
+- ``unoserver``: pool de processos LibreOffice headless que ficam quentes
+  entre pedidos. Cada worker é um ``unoserver`` na sua própria porta e com o
+  seu próprio perfil; o DOCX vai pelo stdin e o PDF volta pelo stdout do
+  ``unoconvert`` (sem arquivos temporários). Fila limitada, timeout por job,
+  reciclagem do worker após N conversões e no máximo um job por worker.
+- ``soffice``: ``soffice --headless --convert-to pdf`` a cada arquivo (frio).
+- ``word``: docx2pdf (precisa do Microsoft Word; Windows/macOS).
+
+O backend pode ser fixado com a variável ORCAMENTO_PDF_BACKEND
+(auto | unoserver | soffice | word | nenhum).
+"""
+import atexit
+import importlib
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from orcamentos import cache_saida, desempenho
+
+WORKERS = int(os.environ.get("ORCAMENTO_PDF_WORKERS", "2"))
+MAX_FILA = int(os.environ.get("ORCAMENTO_PDF_FILA", "8"))
+TIMEOUT_JOB = float(os.environ.get("ORCAMENTO_PDF_TIMEOUT", "60"))
+RECICLAR_APOS = int(os.environ.get("ORCAMENTO_PDF_RECICLAR", "200"))
+PORTA_BASE = int(os.environ.get("ORCAMENTO_PDF_PORTA", "2003"))
+
+
+class ConversaoIndisponivel(RuntimeError):
+    """Nenhum backend de PDF instalado neste servidor."""
+
+
+class FilaCheia(RuntimeError):
+    """Conversões demais em andamento; tente de novo em instantes."""
+
+
+class ConversorWord:
+    nome = "word"
+
+    def converter(self, docx: bytes) -> bytes:
+        from docx2pdf import convert as docx2pdf_convert
+
+        with tempfile.TemporaryDirectory() as td:
+            src = Path(td) / "saida.docx"
+            out_pdf = Path(td) / "saida.pdf"
+            src.write_bytes(docx)
+            docx2pdf_convert(src.as_posix(), out_pdf.as_posix())
+            return out_pdf.read_bytes()
+
+
+class ConversorSoffice:
+    """Um processo LibreOffice por arquivo: lento, mas sem dependências extras."""
+
+    nome = "soffice"
+
+    def __init__(self, executavel: str, timeout: float = TIMEOUT_JOB):
+        self.executavel = executavel
+        self.timeout = timeout
+        self._limite = threading.BoundedSemaphore(WORKERS)
+
+    def converter(self, docx: bytes) -> bytes:
+        with self._limite, tempfile.TemporaryDirectory() as td:
+            src = Path(td) / "saida.docx"
+            src.write_bytes(docx)
+            subprocess.run(
+                [self.executavel, "--headless", "--norestore",
+                 f"-env:UserInstallation={Path(td, 'perfil').as_uri()}",
+                 "--convert-to", "pdf", "--outdir", td, src.as_posix()],
+                check=True, capture_output=True, timeout=self.timeout,
+            )
+            return (Path(td) / "saida.pdf").read_bytes()
+
+
+class _WorkerUno:
+    def __init__(self, indice: int):
+        self.porta = PORTA_BASE + 2 * indice
+        self.porta_uno = PORTA_BASE + 2 * indice + 1
+        self.perfil = Path(tempfile.gettempdir()) / f"orcamento-uno-{os.getpid()}-{indice}"
+        self.proc: subprocess.Popen | None = None
+        self.jobs = 0
+
+    def _pronto(self) -> bool:
+        try:
+            with socket.create_connection(("127.0.0.1", self.porta), timeout=0.5):
+                return True
+        except OSError:
+            return False
+
+    def iniciar(self, timeout: float = 30.0) -> None:
+        self.proc = subprocess.Popen(
+            ["unoserver", "--interface", "127.0.0.1", "--port", str(self.porta),
+             "--uno-port", str(self.porta_uno), "--user-installation", self.perfil.as_uri()],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        limite = time.monotonic() + timeout
+        while not self._pronto():
+            if self.proc.poll() is not None or time.monotonic() > limite:
+                self.parar()
+                raise RuntimeError(f"unoserver não iniciou na porta {self.porta}")
+            time.sleep(0.2)
+        self.jobs = 0
+
+    def parar(self) -> None:
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        self.proc = None
+
+    def vivo(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def converter(self, docx: bytes, timeout: float) -> bytes:
+        if not self.vivo():
+            self.iniciar()
+        r = subprocess.run(
+            ["unoconvert", "--host", "127.0.0.1", "--port", str(self.porta),
+             "--convert-to", "pdf", "-", "-"],
+            input=docx, capture_output=True, timeout=timeout, check=True,
+        )
+        self.jobs += 1
+        return r.stdout
+
+
+class PoolUnoserver:
+    """Pool de LibreOffice headless (unoserver) mantido quente entre pedidos."""
+
+    nome = "unoserver"
+
+    def __init__(self, workers: int = WORKERS, max_fila: int = MAX_FILA,
+                 timeout: float = TIMEOUT_JOB, reciclar_apos: int = RECICLAR_APOS):
+        self.timeout = timeout
+        self.reciclar_apos = reciclar_apos
+        self._todos = [_WorkerUno(i) for i in range(workers)]
+        self._livres: queue.Queue[_WorkerUno] = queue.Queue()
+        for w in self._todos:
+            self._livres.put(w)
+        # admissão: jobs em execução + na fila; acima disso o pedido é recusado
+        self._admissao = threading.BoundedSemaphore(workers + max_fila)
+
+    def aquecer(self) -> None:
+        """Sobe os workers em segundo plano (opcional; senão sobem no 1º job)."""
+        def _subir(w):
+            if not w.vivo():
+                try:
+                    w.iniciar()
+                except RuntimeError:
+                    pass
+        for w in self._todos:
+            threading.Thread(target=_subir, args=(w,), daemon=True).start()
+
+    def converter(self, docx: bytes) -> bytes:
+        if not self._admissao.acquire(blocking=False):
+            raise FilaCheia("Muitas conversões para PDF em andamento. Tente novamente em instantes.")
+        try:
+            try:
+                w = self._livres.get(timeout=self.timeout)
+            except queue.Empty:
+                raise FilaCheia("Tempo esgotado aguardando um conversor de PDF livre.") from None
+            try:
+                return w.converter(docx, self.timeout)
+            except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
+                # LibreOffice travado ou em estado ruim: descarta o processo
+                w.parar()
+                raise
+            finally:
+                if w.jobs >= self.reciclar_apos:
+                    w.parar()
+                self._livres.put(w)
+        finally:
+            self._admissao.release()
+
+    def encerrar(self) -> None:
+        for w in self._todos:
+            w.parar()
+
+
+_conversor = None
+_conversor_lock = threading.Lock()
+
+
+def _criar_conversor():
+    backend = os.environ.get("ORCAMENTO_PDF_BACKEND", "auto").lower()
+    if backend == "nenhum":
+        return None
+    if backend in ("auto", "unoserver") and shutil.which("unoserver") and shutil.which("unoconvert"):
+        pool = PoolUnoserver()
+        atexit.register(pool.encerrar)
+        return pool
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    if backend in ("auto", "soffice") and soffice:
+        return ConversorSoffice(soffice)
+    if backend in ("auto", "word"):
+        try:
+            # só testa se o pacote importa (o conversor usa o Microsoft Word instalado)
+            importlib.import_module("docx2pdf")
+            if shutil.which("osascript") or os.name == "nt":
+                return ConversorWord()
+        except Exception:
+            pass
+    return None
+
+
+def obter_conversor():
+    global _conversor
+    with _conversor_lock:
+        if _conversor is None:
+            _conversor = _criar_conversor() or False
+        return _conversor or None
+
+
+def pdf_disponivel() -> bool:
+    return obter_conversor() is not None
+
+
+def converter_pdf(docx: bytes) -> bytes:
+    conversor = obter_conversor()
+    if conversor is None:
+        raise ConversaoIndisponivel("Nenhum conversor de PDF (LibreOffice/Word) disponível neste servidor.")
+
+    def converter():
+        with desempenho.etapa(f"pdf.{conversor.nome}"):
+            return conversor.converter(docx)
+
+    # o DOCX é determinístico: o mesmo DOCX já convertido sai do cache
+    return cache_saida.obter_ou_gerar(cache_saida.chave_pdf(docx), converter)
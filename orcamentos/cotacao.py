@@ -0,0 +1,141 @@
+# orcamentos/cotacao.py
+"""Pedido de cotação (dict vindo de JSON) → cálculo, script e contexto do documento.
+
+Os campos, padrões e validações da API HTTP (``api``) e do lote JSONL
+(``lote_jsonl``) ficam aqui, para os dois aceitarem exatamente o mesmo pedido.
+"""
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+from orcamentos import config, eliv, precos, revisao, vla
+
+MODELO_REVISAO = Path(__file__).resolve().parent.parent / "modelo_dialetica.docx"
+
+# Tetos de sanidade: nenhum pedido real chega perto, mas sem eles 1e308 passa na
+# validação e estoura em centavos/datas lá dentro.
+MAX_DINHEIRO = 1_000_000.0   # R$ por unidade (palavra, exemplar, e-book)
+MAX_QTD = 10_000_000         # palavras, exemplares, páginas
+
+
+class ErroEntrada(ValueError):
+    pass
+
+
+@dataclass
+class Cotacao:
+    produto: str           # como no histórico: revisao, vla, eliv_comum, eliv_universidade
+    resultado: dict        # o JSON de resposta: calculo, script, ...
+    contexto: dict
+    layout: str            # layout do pdf_nativo
+    modelo: Path | None    # DOCX do produto (a VLA não tem)
+    nome: str              # nome do arquivo, sem extensão
+    cliente: str
+    consultor: str
+    valor_cent: int
+    script: str
+
+
+def _num(d: dict, chave: str, padrao=None, tipo=float, minimo=None, maximo=None):
+    valor = d.get(chave, padrao)
+    if valor is None:
+        raise ErroEntrada(f"campo obrigatório: {chave}")
+    if isinstance(valor, bool):  # bool é int para o Python; true não é uma quantidade
+        raise ErroEntrada(f"{chave}: valor inválido {valor!r}")
+    try:
+        valor = tipo(valor)
+    except (TypeError, ValueError, OverflowError):
+        raise ErroEntrada(f"{chave}: valor inválido {valor!r}") from None
+    if not math.isfinite(valor):  # o json do Python aceita NaN e Infinity
+        raise ErroEntrada(f"{chave}: valor inválido {valor!r}")
+    if (minimo is not None and valor < minimo) or (maximo is not None and valor > maximo):
+        raise ErroEntrada(f"{chave}: fora do intervalo [{minimo}, {maximo}]")
+    return valor
+
+
+def _opcao(d: dict, chave: str, opcoes, padrao=None) -> str:
+    valor = d.get(chave, padrao)
+    if valor not in opcoes:
+        raise ErroEntrada(f"{chave}: use um de {list(opcoes)}")
+    return valor
+
+
+def _texto(d: dict, chave: str) -> str:
+    return str(d.get(chave) or "")
+
+
+def cotar_revisao(d: dict) -> Cotacao:
+    calc = revisao.calcular(
+        _num(d, "palavras", tipo=int, minimo=0, maximo=MAX_QTD),
+        _num(d, "valor_palavra", 0.03, minimo=0, maximo=MAX_DINHEIRO),
+        _num(d, "desconto_pct", 20.0, minimo=0, maximo=100),
+        _num(d, "parcelas", 4, tipo=int, minimo=1, maximo=revisao.MAX_PARCELAS),
+        bool(d.get("aplicar_desconto", True)),
+    )
+    data_orcamento, data_entrega = revisao.datas()
+    cliente, consultor, obs = _texto(d, "cliente"), _texto(d, "consultor"), _texto(d, "observacoes")
+    contexto = revisao.montar_contexto(calc, cliente, consultor, obs, data_orcamento, data_entrega)
+    script = revisao.montar_script(calc, cliente, consultor, obs, data_orcamento, data_entrega)
+    return Cotacao("revisao", {"produto": "revisao", "calculo": calc, "contexto": contexto, "script": script},
+                   contexto, "revisao", MODELO_REVISAO, "Orcamento_Rev", cliente, consultor,
+                   int(precos.centavos(calc["preco_final"])), script)
+
+
+def cotar_vla(d: dict) -> Cotacao:
+    calc = vla.calcular(
+        _opcao(d, "tipo", config.atual().tabelas, "Acadêmico"),
+        _num(d, "preco_capa", minimo=0, maximo=MAX_DINHEIRO),
+        _num(d, "qtd", tipo=int, minimo=1, maximo=MAX_QTD),
+    )
+    cliente, consultor = _texto(d, "cliente"), _texto(d, "consultor")
+    script = vla.montar_script(calc, cliente, consultor, bool(d.get("emojis")))
+    resultado = {"produto": "vla", "calculo": calc,
+                 "politica": config.atual().tabelas[calc["tipo"]].descricao(), "script": script}
+    return Cotacao("vla", resultado, vla.montar_contexto(calc, cliente, consultor), "vla", None,
+                   "Orcamento_VLA", cliente, consultor, int(precos.centavos(calc["total"])), script)
+
+
+def cotar_eliv(d: dict) -> Cotacao:
+    pac = eliv.calcular_pacote(
+        _opcao(d, "pacote", config.atual().pacotes, "Especial"),
+        _opcao(d, "forma_pag", eliv.FORMAS, eliv.FORMAS[0]),
+        _num(d, "desconto_pct", 15.0, minimo=0, maximo=100),
+    )
+    cliente, consultor, obra = _texto(d, "cliente"), _texto(d, "consultor"), _texto(d, "obra")
+    paginas = _num(d, "paginas", 250, tipo=int, minimo=1, maximo=MAX_QTD)
+    resultado = {"produto": "eliv", "calculo": pac, "script": eliv.resumo(pac)}
+
+    uni = d.get("universidade")
+    if uni:
+        if not isinstance(uni, dict):
+            raise ErroEntrada("universidade precisa ser um objeto")
+        tir = eliv.calcular_tiragem(
+            _num(uni, "preco_capa", 75.0, minimo=0, maximo=MAX_DINHEIRO),
+            _num(uni, "qtd", 100, tipo=int, minimo=1, maximo=MAX_QTD),
+            _num(uni, "desconto_pct", 30.0, minimo=0, maximo=100),
+        )
+        contexto = eliv.contexto_universidade(
+            pac, tir, cliente, obra, paginas, _texto(uni, "nome"), _texto(uni, "contato"),
+            _opcao(uni, "tratamento", eliv.TRATAMENTOS, "Profa."),
+            _num(uni, "ebook_preco", 0.0, minimo=0, maximo=MAX_DINHEIRO),
+        )
+        resultado["tiragem"] = tir
+        produto, modelo, nome = "eliv_universidade", eliv.TEMPLATE_UNI, "Orcamento_Universidade_ELIV"
+        valor_cent = pac["total_com_desc_cent"] + tir["total_tiragem_cent"]
+    else:
+        contexto = eliv.contexto_comum(pac, cliente, consultor, obra, paginas, _texto(d, "observacoes"))
+        produto, modelo, nome = "eliv_comum", eliv.TEMPLATE_COMUM, "Orcamento_Comum_ELIV"
+        valor_cent = pac["total_com_desc_cent"]
+    resultado["contexto"] = contexto
+    return Cotacao(produto, resultado, contexto, produto, modelo, nome, cliente, consultor, valor_cent,
+                   resultado["script"])
+
+
+PRODUTOS = {"revisao": cotar_revisao, "vla": cotar_vla, "eliv": cotar_eliv}
+
+
+def cotar(d: dict) -> Cotacao:
+    """Pedido com ``"produto"``: revisao, vla ou eliv (os mesmos campos das rotas da API)."""
+    if not isinstance(d, dict):
+        raise ErroEntrada("o pedido precisa ser um objeto JSON")
+    return PRODUTOS[_opcao(d, "produto", PRODUTOS)](d)
@@ -0,0 +1,284 @@
+# orcamentos/desempenho.py
+"""Medição do tempo de rerun das páginas, com alvo de latência por página.
+
+Uso no script da página::
+
+    t0 = desempenho.inicio_rerun()
+    ...  # corpo da página
+    desempenho.fim_rerun("revisao", t0)
+
+Fragmentos (``@st.fragment``) são medidos com ``@desempenho.medir("revisao.documento")``.
+As últimas medições ficam em memória por processo; ``resumo()`` devolve
+p50/p95 e se o alvo está sendo cumprido.
+
+Etapas do caminho quente (carregar modelo, render, save, PDF) são medidas com
+``with desempenho.etapa("docx.render"):`` e tamanhos de payload com
+``desempenho.tamanho("download.docx", n)``; contadores (ex.: acertos de cache)
+com ``desempenho.contar("cache.hit_memoria")``. Além da memória:
+
+- ORCAMENTO_DIAG_LOG=arquivo.jsonl acrescenta um evento JSON por linha;
+- ORCAMENTO_METRICAS_ARQUIVO=arquivo.prom grava ``prometheus()`` (formato texto
+  do Prometheus) a cada rerun, no máximo a cada 10 s;
+- ORCAMENTO_DIAG=0 desliga toda a medição: reruns, fragmentos, etapas, tamanhos
+  e contadores voltam sem tocar em lock, histograma nem log.
+
+Rerun acima do alvo vai para o log só em nível DEBUG (sob carga seria uma linha
+por rerun); o painel de diagnóstico mostra o p95 contra o alvo.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+log = logging.getLogger("orcamentos.desempenho")
+
+ATIVO = os.environ.get("ORCAMENTO_DIAG", "1") != "0"
+
+# Alvo de p95 do rerun de cada página/fragmento (ms)
+ALVO_RERUN_MS = {
+    "revisao": 150.0,
+    "vla": 80.0,
+    "eliv": 120.0,
+    "historico": 120.0,
+    # fragmentos que renderizam o DOCX quando o botão é clicado
+    "revisao.documento": 250.0,
+    "eliv.comum": 250.0,
+    "eliv.universidade": 250.0,
+}
+# Demais fragmentos rodam só um pedaço da página: alvo mais apertado
+ALVO_FRAGMENTO_MS = 50.0
+
+_JANELA = 500
+_lock = threading.Lock()
+_amostras: dict[str, deque] = {}
+
+
+def inicio_rerun() -> float:
+    return time.perf_counter()
+
+
+def registrar(nome: str, ms: float) -> None:
+    if not ATIVO:
+        return
+    with _lock:
+        _amostras.setdefault(nome, deque(maxlen=_JANELA)).append(ms)
+        _HIST_RERUN.observar(nome, ms / 1000)
+    _evento("rerun", nome, ms)
+    alvo = alvo_ms(nome)
+    if ms > alvo and log.isEnabledFor(logging.DEBUG):
+        log.debug("rerun de %s levou %.1f ms (alvo %.0f ms)", nome, ms, alvo)
+
+
+def fim_rerun(pagina: str, t0: float) -> float:
+    ms = (time.perf_counter() - t0) * 1000
+    if not ATIVO:
+        return ms
+    registrar(pagina, ms)
+    if _ARQUIVO_METRICAS:
+        _exportar_arquivo()
+    return ms
+
+
+def medir(nome: str):
+    """Decorador que registra a duração de cada execução (ex.: de um fragmento)."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ATIVO:  # lido a cada chamada: os processos de render desligam depois do import
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                registrar(nome, (time.perf_counter() - t0) * 1000)
+        return wrapper
+    return deco
+
+
+def alvo_ms(nome: str) -> float:
+    return ALVO_RERUN_MS.get(nome, ALVO_FRAGMENTO_MS)
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    i = min(len(ordenados) - 1, max(0, round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[i]
+
+
+def resumo() -> dict[str, dict]:
+    """{nome: {n, p50_ms, p95_ms, alvo_ms, ok}} das últimas medições."""
+    with _lock:
+        copia = {k: list(v) for k, v in _amostras.items()}
+    out = {}
+    for nome, valores in copia.items():
+        if not valores:
+            continue
+        p95 = _percentil(valores, 95)
+        out[nome] = {
+            "n": len(valores),
+            "p50_ms": round(_percentil(valores, 50), 2),
+            "p95_ms": round(p95, 2),
+            "alvo_ms": alvo_ms(nome),
+            "ok": p95 <= alvo_ms(nome),
+        }
+    return out
+
+
+# ------------------------- etapas e métricas -------------------------
+_LOG_JSONL = os.environ.get("ORCAMENTO_DIAG_LOG")
+_ARQUIVO_METRICAS = os.environ.get("ORCAMENTO_METRICAS_ARQUIVO")
+_INTERVALO_ARQUIVO_S = 10.0
+
+_BUCKETS_S = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_BUCKETS_BYTES = (1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 2e7, 1e8)
+
+
+class _Histograma:
+    """Histograma cumulativo por rótulo, no formato do Prometheus."""
+
+    def __init__(self, nome: str, rotulo: str, ajuda: str, buckets: tuple):
+        self.nome, self.rotulo, self.ajuda, self.buckets = nome, rotulo, ajuda, buckets
+        self.series: dict[str, list] = {}  # valor do rótulo -> [contagens..., soma, total]
+
+    def observar(self, chave: str, valor: float) -> None:
+        s = self.series.get(chave)
+        if s is None:
+            s = self.series[chave] = [0] * len(self.buckets) + [0.0, 0]
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                s[i] += 1
+        s[-2] += valor
+        s[-1] += 1
+
+    def texto(self) -> list[str]:
+        linhas = [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} histogram"]
+        for chave, s in sorted(self.series.items()):
+            r = f'{self.rotulo}="{chave}"'
+            for limite, n in zip(self.buckets, s):
+                linhas.append(f'{self.nome}_bucket{{{r},le="{limite:g}"}} {n}')
+            linhas.append(f'{self.nome}_bucket{{{r},le="+Inf"}} {s[-1]}')
+            linhas.append(f"{self.nome}_sum{{{r}}} {s[-2]:.6f}")
+            linhas.append(f"{self.nome}_count{{{r}}} {s[-1]}")
+        return linhas
+
+
+_HIST_RERUN = _Histograma("orcamento_rerun_segundos", "nome", "Duração dos reruns de página e fragmento.",
+                          _BUCKETS_S)
+_HIST_ETAPA = _Histograma("orcamento_etapa_segundos", "etapa", "Duração das etapas de geração de documento.",
+                          _BUCKETS_S)
+_HIST_BYTES = _Histograma("orcamento_payload_bytes", "nome", "Tamanho dos arquivos entregues.", _BUCKETS_BYTES)
+_contadores: dict[str, int] = {}
+
+# últimos eventos (para o painel de diagnóstico), com a sessão que os gerou
+_eventos: deque = deque(maxlen=2000)
+_log_lock = threading.Lock()
+_arquivo_lock = threading.Lock()
+_ultimo_arquivo = 0.0
+
+
+def _sem_sessao():
+    return None
+
+
+_sessao_atual = _sem_sessao
+
+
+def usar_sessao(fn) -> None:
+    """Registra a função que identifica a sessão atual (a UI usa a do Streamlit)."""
+    global _sessao_atual
+    _sessao_atual = fn
+
+
+def _evento(tipo: str, nome: str, valor: float) -> None:
+    ev = {"ts": round(time.time(), 3), "tipo": tipo, "nome": nome, "valor": round(valor, 3),
+          "sessao": _sessao_atual()}
+    _eventos.append(ev)
+    if _LOG_JSONL:
+        linha = json.dumps(ev, ensure_ascii=False) + "\n"
+        with _log_lock, open(_LOG_JSONL, "a", encoding="utf-8") as f:
+            f.write(linha)
+
+
+def registrar_etapa(nome: str, ms: float) -> None:
+    if not ATIVO:
+        return
+    with _lock:
+        _HIST_ETAPA.observar(nome, ms / 1000)
+    _evento("etapa", nome, ms)
+
+
+@contextmanager
+def _etapa(nome: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar_etapa(nome, (time.perf_counter() - t0) * 1000)
+
+
+def etapa(nome: str):
+    """Context manager que mede uma etapa do caminho quente (no-op com ORCAMENTO_DIAG=0)."""
+    return _etapa(nome) if ATIVO else nullcontext()
+
+
+def tamanho(nome: str, n_bytes: int) -> None:
+    """Registra o tamanho de um arquivo entregue (download, resposta da API)."""
+    if not ATIVO:
+        return
+    with _lock:
+        _HIST_BYTES.observar(nome, n_bytes)
+    _evento("bytes", nome, n_bytes)
+
+
+def contar(nome: str, n: int = 1) -> None:
+    if not ATIVO:
+        return
+    with _lock:
+        _contadores[nome] = _contadores.get(nome, 0) + n
+
+
+def contadores() -> dict[str, int]:
+    with _lock:
+        return dict(_contadores)
+
+
+def eventos(sessao=None, limite: int = 50) -> list[dict]:
+    """Últimos eventos (mais recentes primeiro), opcionalmente só de uma sessão."""
+    out = []
+    for ev in reversed(list(_eventos)):
+        if sessao is None or ev["sessao"] == sessao:
+            out.append(ev)
+            if len(out) >= limite:
+                break
+    return out
+
+
+def prometheus() -> str:
+    """Métricas do processo no formato texto do Prometheus (versão 0.0.4)."""
+    with _lock:
+        linhas = _HIST_RERUN.texto() + _HIST_ETAPA.texto() + _HIST_BYTES.texto()
+        linhas += ["# HELP orcamento_eventos_total Contadores de eventos (ex.: acertos de cache).",
+                   "# TYPE orcamento_eventos_total counter"]
+        linhas += [f'orcamento_eventos_total{{nome="{k}"}} {v}' for k, v in sorted(_contadores.items())]
+    return "\n".join(linhas) + "\n"
+
+
+def _exportar_arquivo() -> None:
+    global _ultimo_arquivo
+    agora = time.monotonic()
+    if agora - _ultimo_arquivo < _INTERVALO_ARQUIVO_S or not _arquivo_lock.acquire(blocking=False):
+        return
+    try:
+        _ultimo_arquivo = agora
+        tmp = f"{_ARQUIVO_METRICAS}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(prometheus())
+        os.replace(tmp, _ARQUIVO_METRICAS)  # quem lê nunca vê o arquivo pela metade
+    except OSError as e:
+        log.warning("não foi possível gravar métricas em %s: %s", _ARQUIVO_METRICAS, e)
+    finally:
+        _arquivo_lock.release()
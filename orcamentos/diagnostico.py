@@ -0,0 +1,83 @@
+# orcamentos/diagnostico.py
+"""Painel de diagnóstico das páginas (escondido; abra a página com ``?diag=1``).
+
+Mostra as etapas medidas por ``desempenho`` nesta sessão (carregar modelo,
+render, save, PDF, tamanho dos downloads), o p50/p95 dos reruns do processo e
+os acertos do cache de documentos.
+"""
+import datetime
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from orcamentos import artefatos, cache_saida, config, desempenho, incremental, nomes
+
+
+def _sessao():
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+desempenho.usar_sessao(_sessao)
+
+
+def ativo() -> bool:
+    return st.query_params.get("diag") == "1"
+
+
+def _linha(ev: dict) -> dict:
+    valor = f"{ev['valor'] / 1024:.1f} KiB" if ev["tipo"] == "bytes" else f"{ev['valor']:.1f} ms"
+    return {
+        "hora": datetime.datetime.fromtimestamp(ev["ts"]).strftime("%H:%M:%S"),
+        "tipo": ev["tipo"],
+        "nome": ev["nome"],
+        "valor": valor,
+    }
+
+
+# Fragmento: "Atualizar" mostra as etapas de fragmentos que rodaram depois da página
+@st.fragment
+def _conteudo():
+    st.button("Atualizar", key="diag_atualizar")
+    st.markdown("**Últimas etapas desta sessão**")
+    evs = desempenho.eventos(sessao=_sessao())
+    if evs:
+        st.dataframe([_linha(ev) for ev in evs], hide_index=True, use_container_width=True)
+    else:
+        st.caption("Nenhuma etapa medida ainda.")
+
+    st.markdown("**Reruns (processo)**")
+    resumo = desempenho.resumo()
+    st.dataframe([{"nome": k, **v} for k, v in sorted(resumo.items())], hide_index=True, use_container_width=True)
+    c = cache_saida.estatisticas()
+    st.markdown("**Cache de documentos (processo)**")
+    st.caption(f"acertos: {c.get('hit_memoria', 0)} em memória, {c.get('hit_disco', 0)} em disco • "
+               f"faltas: {c.get('miss', 0)} • memória: {c['memoria_itens']} itens "
+               f"({c['memoria_bytes'] / 1024:.0f} KiB) • disco: {c['disco_itens']} itens "
+               f"({c['disco_bytes'] / 1024:.0f} KiB)")
+    a = artefatos.estatisticas()
+    cont = desempenho.contadores()
+    inc = incremental.estatisticas()
+    st.caption(f"Revisões incrementais: {inc['esqueletos']} esqueletos • "
+               f"{inc['modelos_completos']} modelos só com render completo • "
+               f"divergências: {cont.get('render.incremental.divergente', 0)}")
+    n = nomes.estatisticas()
+    if n:
+        st.caption("Autocompletar: " + " • ".join(f"{campo} {total} nomes" for campo, total in n["nomes"].items())
+                   + f" • histórico lido até a linha {n['ate_id']}")
+    st.caption(f"Downloads: {cont.get('download.memoria', 0)} da memória, {cont.get('download.disco', 0)} do disco • "
+               f"na memória agora: ~{a['em_memoria'] / 1024:.0f} KiB de {artefatos.MAX_MEMORIA / 1024 / 1024:.0f} MiB")
+    cfg = config.atual()
+    st.caption(f"Configuração de preços: versão {cfg.versao} ({config.CAMINHO.name})")
+    st.download_button("Métricas (Prometheus)", data=desempenho.prometheus(), file_name="metricas.prom",
+                       mime="text/plain", key="diag_prometheus")
+
+
+def painel() -> None:
+    """Desenha o expander de diagnóstico se a URL tiver ``?diag=1``."""
+    if not ativo():
+        return
+    with st.expander("🔧 Diagnóstico", expanded=False):
+        if not desempenho.ATIVO:
+            st.caption("Medição desligada (ORCAMENTO_DIAG=0).")
+        _conteudo()
@@ -0,0 +1,114 @@
+# orcamentos/eliv.py
+"""Pacotes ELIV: tabela, cálculos e contexto dos modelos Comum e Universidade."""
+import datetime as dt
+from pathlib import Path
+
+from orcamentos import config, precos
+from orcamentos.formatacao import br_money as _br_money
+
+# Onde estão os templates (pasta templates/ na raiz do repo)
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+TEMPLATE_COMUM = TEMPLATES_DIR / "ELIV_Comum.docx"
+TEMPLATE_UNI   = TEMPLATES_DIR / "ELIV_Universidade.docx"
+
+# Pacotes (preço de lista, mensalidade e parcelas): precificacao.toml, via config.atual().pacotes
+FORMAS = ["6x sem juros", "à vista (PIX)"]
+
+TRATAMENTOS = ["Prof.", "Profa.", "Prof. Dr.", "Profa. Dra.", "Sr.", "Sra.", "Doutor", "Doutora"]
+
+
+def br_money(x: float | int | None) -> str:
+    """Formata para R$ 1.234,56."""
+    return _br_money(x, prefixo="R$ ")
+
+
+def calcular_pacote(pacote: str, forma_pag: str, desconto_pct: float) -> dict:
+    cfg = config.atual()
+    base = cfg.pacotes[pacote]["lista_pix"]
+    parcelas = cfg.pacotes[pacote]["parcelas"]
+    r = precos.escalar(precos.eliv_pacote(base, desconto_pct, parcelas))
+    return {
+        "pacote": pacote,
+        "forma_pag": forma_pag,
+        "base": base,
+        "parcelas": parcelas,
+        "desconto_pac_pct": float(desconto_pct),
+        "total_com_desc": precos.reais(r["total_com_desc"]),
+        "total_com_desc_cent": r["total_com_desc"],
+        "mensal": precos.reais(r["mensal"]) if forma_pag == FORMAS[0] else None,
+        "config_versao": cfg.versao,
+    }
+
+
+def calcular_tiragem(preco_capa: float, qtd: int, desconto_pct: float) -> dict:
+    r = precos.escalar(precos.eliv_tiragem(preco_capa, int(qtd), desconto_pct))
+    return {
+        "preco_capa": float(preco_capa),
+        "qtd": int(qtd),
+        "desc_pct": float(desconto_pct),
+        "unitario_desc": precos.reais(r["unitario_desc"]),
+        "total_tiragem": precos.reais(r["total_tiragem"]),
+        "total_tiragem_cent": r["total_tiragem"],
+    }
+
+
+def resumo(pac: dict) -> str:
+    """Linha de resumo do pacote (também usada como script de venda)."""
+    msg = f"Pacote **{pac['pacote']}** | **{pac['forma_pag']}** | **Com desconto:** {br_money(pac['total_com_desc'])}"
+    if pac["mensal"]:
+        msg += f" ({pac['parcelas']}x de {br_money(pac['mensal'])})"
+    return msg
+
+
+def _data(data: str | None) -> str:
+    return data or dt.date.today().strftime("%d/%m/%Y")
+
+
+def contexto_comum(pac: dict, cliente: str, consultor: str, obra: str, paginas: int,
+                   observacoes: str, data: str | None = None) -> dict:
+    return {
+        "data": _data(data),
+        "cliente": cliente or "",
+        "consultor": consultor or "",
+        "obra": obra or "",
+        "paginas": int(paginas),
+        "pacote": pac["pacote"],
+        "forma_pag": pac["forma_pag"],
+        "preco_lista": br_money(pac["base"]),
+        "desc_pac_pct": f"{pac['desconto_pac_pct']:.0f}%",
+        "valor_com_desconto": br_money(pac["total_com_desc"]),
+        "mensal_final": br_money(pac["mensal"]) if pac["mensal"] else "",
+        "observacoes": observacoes or "",
+    }
+
+
+def contexto_universidade(pac: dict, tir: dict, cliente: str, obra: str, paginas: int,
+                          universidade: str, contato: str, tratamento: str, ebook_preco: float,
+                          data: str | None = None) -> dict:
+    # Autor/responsável = nome do cliente
+    return {
+        "data": _data(data),
+        # Cabeçalho específico de universidade
+        "universidade": universidade or "",
+        "contato": contato or "",
+        "tratamento": tratamento or "",
+        "autor": cliente or "",
+        # Obra / pacote / forma de pagamento
+        "obra": obra or "",
+        "paginas": int(paginas),
+        "pacote": pac["pacote"],
+        "forma_pag": pac["forma_pag"],
+        "preco_lista": br_money(pac["base"]),
+        "desc_pac_pct": f"{pac['desconto_pac_pct']:.0f}%",
+        "valor_com_desconto": br_money(pac["total_com_desc"]),
+        "mensal_final": br_money(pac["mensal"]) if pac["mensal"] else "",
+        # Tiragem / e-book
+        "preco_capa": br_money(tir["preco_capa"]),
+        "desc_tiragem_pct": f"{tir['desc_pct']:.0f}%",
+        "preco_unitario": br_money(tir["unitario_desc"]),
+        "tiragem_qtd": tir["qtd"],
+        "total_tiragem": br_money(tir["total_tiragem"]),
+        "ebook_preco": br_money(ebook_preco),
+        # Total geral (editoração + tiragem)
+        "total_geral": br_money(precos.reais(pac["total_com_desc_cent"] + tir["total_tiragem_cent"])),
+    }
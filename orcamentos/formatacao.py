@@ -0,0 +1,18 @@
+# orcamentos/formatacao.py
+"""Formatação no padrão brasileiro usada nas telas, scripts e documentos."""
+
+
+def br_money(x: float | None, prefixo: str = "R$") -> str:
+    """Formata para R$1.234,56 (ou "R$ 1.234,56" com prefixo="R$ ")."""
+    if x is None:
+        return "—"
+    return f"{prefixo}{x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def br_int(x: int) -> str:
+    return f"{x:,}".replace(",", ".")
+
+
+def escape_md(s: str) -> str:
+    """Escapa caracteres que o Markdown usa como sintaxe ($, _)"""
+    return s.replace("$", r"\$").replace("_", r"\_")
@@ -0,0 +1,295 @@
+# orcamentos/historico.py
+"""Histórico de orçamentos gerados, num SQLite local em modo WAL.
+
+``registrar()`` só enfileira: uma thread gravadora junta os pedidos e grava em
+lote numa única transação, então a página nunca espera pelo disco. Cada
+orçamento guarda o contexto usado no modelo (JSON), o hash do modelo e a
+versão do precificacao.toml usada na conta; os bytes de cada modelo ficam uma
+vez só na tabela ``modelos``, o que permite regenerar qualquer documento depois.
+
+O arquivo fica em ORCAMENTO_HISTORICO (padrão: dados/historico.sqlite3 na raiz
+do repositório); ORCAMENTO_HISTORICO=0 desliga o histórico.
+"""
+import atexit
+import datetime
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+
+log = logging.getLogger("orcamentos.historico")
+
+_CAMINHO_PADRAO = Path(__file__).resolve().parent.parent / "dados" / "historico.sqlite3"
+_config = os.environ.get("ORCAMENTO_HISTORICO", "")
+ATIVO = _config != "0"
+CAMINHO = Path(_config) if _config and ATIVO else _CAMINHO_PADRAO
+
+PRODUTOS = {
+    "revisao": "Revisão",
+    "vla": "VLA",
+    "eliv_comum": "ELIV Comum",
+    "eliv_universidade": "ELIV Universidade",
+}
+
+LOTE_MAX = 500          # orçamentos por transação
+ESPERA_LOTE_S = 0.2     # quanto a gravadora espera para juntar mais pedidos
+LIMITE_BUSCA = 200
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS modelos (
+    hash  TEXT PRIMARY KEY,
+    dados BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS consultores (
+    busca TEXT PRIMARY KEY,
+    nome  TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS orcamentos (
+    id              INTEGER PRIMARY KEY,
+    criado_em       TEXT NOT NULL,     -- 'AAAA-MM-DD HH:MM:SS', hora local
+    produto         TEXT NOT NULL,
+    cliente         TEXT NOT NULL,
+    cliente_busca   TEXT NOT NULL,     -- minúsculas, sem acento e sem "Prof.", "Dra." etc.
+    consultor       TEXT NOT NULL,
+    consultor_busca TEXT NOT NULL,
+    valor_cent      INTEGER NOT NULL,
+    modelo_hash     TEXT,
+    contexto        TEXT NOT NULL,     -- JSON
+    script          TEXT,
+    config_versao   TEXT               -- "versao" do precificacao.toml
+);
+-- índices "cobrem" as combinações de filtro mais comuns: a busca escolhe os ids
+-- só pelo índice e lê da tabela apenas as linhas que vão para a tela
+CREATE INDEX IF NOT EXISTS ix_orc_cliente   ON orcamentos (cliente_busca, consultor_busca, criado_em);
+CREATE INDEX IF NOT EXISTS ix_orc_consultor ON orcamentos (consultor_busca, produto, criado_em);
+CREATE INDEX IF NOT EXISTS ix_orc_produto   ON orcamentos (produto, criado_em);
+CREATE INDEX IF NOT EXISTS ix_orc_data      ON orcamentos (criado_em);
+CREATE INDEX IF NOT EXISTS ix_orc_valor     ON orcamentos (valor_cent);
+"""
+
+
+@dataclass
+class Orcamento:
+    id: int
+    criado_em: str
+    produto: str
+    cliente: str
+    consultor: str
+    valor_cent: int
+    modelo_hash: str | None
+    contexto: dict
+    script: str | None
+    config_versao: str | None = None
+
+
+_TITULOS = ("prof.", "profa.", "prof", "profa", "dr.", "dra.", "dr", "dra", "sr.", "sra.", "sr", "sra",
+            "doutor", "doutora")
+
+
+def normalizar(texto: str) -> str:
+    """Forma de busca de um nome: minúsculas, sem acento e sem pronome de tratamento."""
+    s = unicodedata.normalize("NFKD", texto or "")
+    palavras = "".join(c for c in s if not unicodedata.combining(c)).casefold().split()
+    while len(palavras) > 1 and palavras[0] in _TITULOS:
+        palavras.pop(0)
+    return " ".join(palavras)
+
+
+def _conectar() -> sqlite3.Connection:
+    CAMINHO.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CAMINHO, timeout=5.0, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+_esquema_lock = threading.Lock()
+_esquema_ok = False
+
+
+def _garantir_esquema(conn: sqlite3.Connection) -> None:
+    global _esquema_ok
+    with _esquema_lock:
+        if not _esquema_ok:
+            conn.executescript(_ESQUEMA)
+            colunas = {r[1] for r in conn.execute("PRAGMA table_info(orcamentos)")}
+            if "config_versao" not in colunas:  # bancos criados antes da coluna
+                conn.execute("ALTER TABLE orcamentos ADD COLUMN config_versao TEXT")
+            _esquema_ok = True
+
+
+# ------------------------- gravação em lote -------------------------
+_fila: queue.Queue = queue.Queue()
+_gravadora: threading.Thread | None = None
+_gravadora_lock = threading.Lock()
+_modelos_gravados: set[str] = set()
+lotes_gravados = 0  # cresce a cada lote gravado (orcamentos.nomes relê só as linhas novas)
+
+
+def _gravar_lote(conn: sqlite3.Connection, lote: list[tuple]) -> None:
+    modelos = {}
+    linhas = []
+    for linha, modelo in lote:
+        linhas.append(linha)
+        h = linha[7]
+        if modelo is not None and h and h not in _modelos_gravados:
+            modelos[h] = modelo
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany("INSERT OR IGNORE INTO modelos (hash, dados) VALUES (?, ?)", modelos.items())
+        conn.executemany("INSERT OR REPLACE INTO consultores (busca, nome) VALUES (?, ?)",
+                         {linha[5]: linha[4] for linha in linhas if linha[5]}.items())
+        conn.executemany(
+            "INSERT INTO orcamentos (criado_em, produto, cliente, cliente_busca, consultor, consultor_busca,"
+            " valor_cent, modelo_hash, contexto, script, config_versao) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            linhas,
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    _modelos_gravados.update(modelos)
+
+
+def _laco_gravadora() -> None:
+    global lotes_gravados
+    conn = _conectar()
+    _garantir_esquema(conn)
+    while True:
+        lote = [_fila.get()]
+        prazo = time.monotonic() + ESPERA_LOTE_S
+        while len(lote) < LOTE_MAX:
+            restante = prazo - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                lote.append(_fila.get(timeout=restante))
+            except queue.Empty:
+                break
+        try:
+            _gravar_lote(conn, lote)
+            lotes_gravados += 1
+        except Exception:
+            log.exception("falha ao gravar %d orçamento(s) no histórico", len(lote))
+        finally:
+            for _ in lote:
+                _fila.task_done()
+
+
+def _iniciar_gravadora() -> None:
+    global _gravadora
+    with _gravadora_lock:
+        if _gravadora is None:
+            _gravadora = threading.Thread(target=_laco_gravadora, name="historico-gravadora", daemon=True)
+            _gravadora.start()
+            atexit.register(descarregar)
+
+
+def registrar(produto: str, cliente: str, consultor: str, valor_cent: int, contexto: dict,
+              script: str | None = None, modelo: bytes | None = None, modelo_hash: str | None = None,
+              config_versao: str | None = None) -> None:
+    """Enfileira um orçamento gerado (não bloqueia).
+
+    ``config_versao``: versão da configuração usada na conta (padrão: a vigente).
+    """
+    if not ATIVO:
+        return
+    if config_versao is None:
+        from orcamentos import config
+        config_versao = config.atual().versao
+    if modelo is not None and modelo_hash is None:
+        from orcamentos.modelos import hash_bytes
+        modelo_hash = hash_bytes(modelo)
+    agora = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    linha = (agora, produto, cliente or "", normalizar(cliente), consultor or "", normalizar(consultor),
+             int(valor_cent), modelo_hash, json.dumps(contexto, ensure_ascii=False), script, config_versao)
+    _iniciar_gravadora()
+    # bytes(): o modelo pode ser um mmap de upload que fecha antes da gravadora rodar
+    _fila.put((linha, None if modelo is None or modelo_hash in _modelos_gravados else bytes(modelo)))
+
+
+def descarregar() -> None:
+    """Espera a gravadora gravar tudo o que já foi enfileirado."""
+    if _gravadora is not None:
+        _fila.join()
+
+
+# ------------------------- consulta -------------------------
+_local = threading.local()
+
+
+def _leitura() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _conectar()
+        _garantir_esquema(conn)
+    return conn
+
+
+def _prefixo(coluna: str, valor: str, where: list, params: list) -> None:
+    # faixa [valor, valor + U+FFFF) usa o índice, ao contrário de LIKE 'valor%'
+    where.append(f"{coluna} >= ? AND {coluna} < ?")
+    params += [valor, valor + "\uffff"]
+
+
+def buscar(cliente: str = "", consultor: str = "", produtos: list[str] | None = None,
+           desde: datetime.date | None = None, ate: datetime.date | None = None,
+           valor_min_cent: int | None = None, valor_max_cent: int | None = None,
+           limite: int = LIMITE_BUSCA) -> list[dict]:
+    """Orçamentos mais recentes que batem com os filtros (cliente por prefixo, consultor exato)."""
+    where, params = [], []
+    if cliente.strip():
+        _prefixo("cliente_busca", normalizar(cliente), where, params)
+    if consultor.strip():
+        where.append("consultor_busca = ?")
+        params.append(normalizar(consultor))
+    if produtos:
+        where.append(f"produto IN ({','.join('?' * len(produtos))})")
+        params += list(produtos)
+    if desde:
+        where.append("criado_em >= ?")
+        params.append(desde.isoformat())
+    if ate:
+        where.append("criado_em < ?")
+        params.append((ate + datetime.timedelta(days=1)).isoformat())
+    if valor_min_cent is not None:
+        where.append("valor_cent >= ?")
+        params.append(int(valor_min_cent))
+    if valor_max_cent is not None:
+        where.append("valor_cent <= ?")
+        params.append(int(valor_max_cent))
+    ids = "SELECT id FROM orcamentos"
+    if where:
+        ids += " WHERE " + " AND ".join(where)
+    ids += " ORDER BY criado_em DESC, id DESC LIMIT ?"
+    params.append(int(limite))
+    sql = (f"SELECT id, criado_em, produto, cliente, consultor, valor_cent FROM orcamentos"
+           f" WHERE id IN ({ids}) ORDER BY criado_em DESC, id DESC")
+    cur = _leitura().execute(sql, params)
+    nomes = [c[0] for c in cur.description]
+    return [dict(zip(nomes, r)) for r in cur.fetchall()]
+
+
+def consultores() -> list[str]:
+    """Nomes de consultor já usados (um por forma de busca), em ordem alfabética."""
+    return [r[0] for r in _leitura().execute("SELECT nome FROM consultores ORDER BY busca")]
+
+
+def obter(id_: int) -> Orcamento | None:
+    r = _leitura().execute(
+        "SELECT id, criado_em, produto, cliente, consultor, valor_cent, modelo_hash, contexto, script,"
+        " config_versao FROM orcamentos WHERE id = ?", (int(id_),)).fetchone()
+    if r is None:
+        return None
+    return Orcamento(*r[:7], contexto=json.loads(r[7]), script=r[8], config_versao=r[9])
+
+
+def modelo(h: str) -> bytes | None:
+    r = _leitura().execute("SELECT dados FROM modelos WHERE hash = ?", (h,)).fetchone()
+    return r[0] if r else None
@@ -0,0 +1,194 @@
+# orcamentos/incremental.py
+"""Revisões de um orçamento sem renderizar o DOCX de novo.
+
+Pedido típico: "o mesmo orçamento com 25% em vez de 20%" ou com uma parcela a
+mais. Só os valores (``VARIAVEIS``) mudam; cliente, palavras, datas e o resto
+do contexto ficam iguais. Na primeira vez, o modelo é renderizado (no pool de
+``processos``) com um marcador único no lugar de cada valor, e o resultado vira
+um *esqueleto*: os membros do ZIP que não têm marcador já comprimidos, e os que
+têm (em geral ``word/document.xml``), cortados nos marcadores. Daí em diante,
+cada revisão com os mesmos campos fixos só cola os valores nos cortes e
+comprime esses membros, em poucos milissegundos e sem passar pelo Jinja.
+
+Vale só quando o resultado é byte a byte o de um render completo:
+
+- o modelo usa as ``VARIAVEIS`` apenas como ``{{ variavel }}`` direto (sem
+  filtro, ``if``, ``for`` ou ``set`` em cima delas), conferido na árvore do
+  Jinja; senão o modelo fica marcado e sempre renderiza completo;
+- o valor não tem caractere que o lxml reescreveria (``& < > " '``, quebras de
+  linha e controle).
+
+Fora disso, ou com ORCAMENTO_INCREMENTAL=0, é o render completo de sempre.
+Com ORCAMENTO_INCREMENTAL_VERIFICAR=1 toda revisão é comparada com um render
+completo; na diferença vale o completo, o modelo passa a renderizar completo e
+``render.incremental.divergente`` é contado (``tools/verificar_docx.py`` faz a
+mesma prova para os modelos do repositório).
+"""
+import io
+import os
+import re
+import secrets
+import threading
+import zlib
+from collections import OrderedDict
+
+from orcamentos import cache_saida, desempenho, modelos, processos
+
+# campos do contexto da Revisão que mudam numa revisão de desconto/parcelas
+VARIAVEIS = ("desconto_percent", "valor_desconto", "preco_final", "num_parcelas", "valor_parcela",
+             "parcelamento_texto")
+
+ATIVO = os.environ.get("ORCAMENTO_INCREMENTAL", "1") != "0"
+VERIFICAR = os.environ.get("ORCAMENTO_INCREMENTAL_VERIFICAR", "0") == "1"
+MAX_ESQUELETOS = 64
+MAX_COMPLETOS = 4 * modelos.MAX_MODELOS  # como o cache de variáveis de ``modelos``
+
+_PROIBIDOS = re.compile(r"[&<>\"']")
+
+_lock = threading.Lock()
+# chave (modelo + campos fixos) -> membros: Membro pronto ou pedaços (bytes e índices de VARIAVEIS)
+_esqueletos: "OrderedDict[str, list]" = OrderedDict()
+# hashes de modelos que não admitem o render incremental (LRU: uploads novos não crescem sem fim)
+_completos: "OrderedDict[str, None]" = OrderedDict()
+
+
+def _marcar_completo(h: str) -> None:
+    """Chamar com ``_lock``."""
+    _completos[h] = None
+    _completos.move_to_end(h)
+    while len(_completos) > MAX_COMPLETOS:
+        _completos.popitem(last=False)
+
+
+def _so_completo(h: str) -> bool:
+    with _lock:
+        if h not in _completos:
+            return False
+        _completos.move_to_end(h)
+        return True
+
+
+# ------------------------- no processo de render -------------------------
+def _uso_direto(tpl, variaveis: tuple[str, ...]) -> bool:
+    """True se cada uso das ``variaveis`` no modelo é um ``{{ variavel }}`` solto."""
+    from jinja2 import Environment, nodes
+
+    xml = tpl.patch_xml(tpl.get_xml())
+    for uri in (tpl.HEADER_URI, tpl.FOOTER_URI):
+        for _, parte in tpl.get_headers_footers(uri):
+            xml += tpl.patch_xml(tpl.get_part_xml(parte))
+    arvore = Environment().parse(xml)
+    usos = sum(1 for n in arvore.find_all(nodes.Name) if n.name in variaveis)
+    diretos = sum(1 for saida in arvore.find_all(nodes.Output) for n in saida.nodes
+                  if isinstance(n, nodes.Name) and n.name in variaveis)
+    return usos == diretos
+
+
+def _montar_esqueleto(dados: bytes, contexto: dict, h: str, variaveis: tuple[str, ...]) -> list | None:
+    from orcamentos import zip_docx  # python-docx: só quando um documento é gerado
+
+    tpl, ref = modelos._clonar(dados, h)
+    if not _uso_direto(tpl, variaveis):
+        return None
+    marca = f"ORCMARCA{secrets.token_hex(6).upper()}N"
+    tpl.render({**contexto, **{v: f"{marca}{i:02d}F" for i, v in enumerate(variaveis)}})
+    if tpl.pics_to_replace or tpl.crc_to_new_media or tpl.crc_to_new_embedded or tpl.zipname_to_replace:
+        return None
+    corte = re.compile(rf"{marca}(\d\d)F".encode())
+    pacote = tpl.docx.part.package
+    for parte in pacote.parts:
+        parte.before_marshal()
+    esqueleto = []
+    for nome, xml in zip_docx.membros(pacote):
+        pedacos = corte.split(xml)
+        if len(pedacos) == 1:
+            m = ref.get(nome)
+            if m is None or m.crc != zlib.crc32(xml) or m.tamanho != len(xml):
+                m = zip_docx.membro(xml)
+            esqueleto.append((nome, m))
+        else:
+            # split com grupo: texto, índice, texto, índice, ..., texto
+            esqueleto.append((nome, [p if i % 2 == 0 else int(p) for i, p in enumerate(pedacos)]))
+    return esqueleto
+
+
+# ------------------------- no processo do servidor -------------------------
+def _valores(contexto: dict, variaveis: tuple[str, ...]) -> list[bytes] | None:
+    """Valores como o Jinja os escreveria (ausente = vazio); None se algum não é seguro."""
+    valores = []
+    for v in variaveis:
+        texto = str(contexto[v]) if v in contexto else ""
+        if _PROIBIDOS.search(texto) or not texto.replace("\xa0", " ").isprintable():
+            return None
+        valores.append(texto.encode("utf-8"))
+    return valores
+
+
+def _preencher(esqueleto: list, valores: list[bytes]) -> bytes:
+    from orcamentos import zip_docx
+
+    def membros():
+        for nome, m in esqueleto:
+            if isinstance(m, zip_docx.Membro):
+                yield nome, m
+            else:
+                yield nome, zip_docx.membro(b"".join(p if isinstance(p, bytes) else valores[p] for p in m))
+
+    buf = io.BytesIO()
+    zip_docx.escrever(membros(), buf, data_hora=modelos.DATA_ZIP)
+    return buf.getvalue()
+
+
+def _obter_esqueleto(dados: bytes, contexto: dict, h: str, variaveis: tuple[str, ...],
+                     espera: float | None) -> list | None:
+    fixos = {k: v for k, v in contexto.items() if k not in variaveis}
+    chave = cache_saida.chave(h, {"fixos": fixos, "variaveis": variaveis}, "esqueleto")
+    with _lock:
+        esqueleto = _esqueletos.get(chave)
+        if esqueleto is not None:
+            _esqueletos.move_to_end(chave)
+            return esqueleto
+    # bytes(): o modelo pode ser um mmap de upload, que não vai por pickle
+    esqueleto = processos.executar(_montar_esqueleto, bytes(dados), contexto, h, variaveis,
+                                   espera=espera, etapa="render.esqueleto")
+    with _lock:
+        if esqueleto is None:
+            _marcar_completo(h)
+            return None
+        _esqueletos[chave] = esqueleto
+        while len(_esqueletos) > MAX_ESQUELETOS:
+            _esqueletos.popitem(last=False)
+    return esqueleto
+
+
+def _incremental(dados: bytes, contexto: dict, h: str, variaveis: tuple[str, ...],
+                 espera: float | None) -> bytes:
+    valores = _valores(contexto, variaveis)
+    esqueleto = None if valores is None else _obter_esqueleto(dados, contexto, h, variaveis, espera)
+    if esqueleto is None:
+        return processos.renderizar(dados, contexto, h, usar_cache=False, espera=espera)
+    with desempenho.etapa("render.incremental"):
+        docx = _preencher(esqueleto, valores)
+    if VERIFICAR:
+        completo = processos.renderizar(dados, contexto, h, usar_cache=False, espera=espera)
+        if completo != docx:
+            desempenho.contar("render.incremental.divergente")
+            with _lock:
+                _marcar_completo(h)
+            return completo
+    return docx
+
+
+def renderizar(dados: bytes, contexto: dict, h: str | None = None, variaveis: tuple[str, ...] = VARIAVEIS,
+               espera: float | None = processos.ESPERA_S) -> bytes:
+    """Como ``processos.renderizar`` (com o cache de saída), mas revisões só trocam os valores."""
+    h = h or modelos.hash_bytes(dados)
+    if not ATIVO or _so_completo(h):
+        return processos.renderizar(dados, contexto, h, espera=espera)
+    return cache_saida.obter_ou_gerar(cache_saida.chave(h, contexto),
+                                      lambda: _incremental(dados, contexto, h, variaveis, espera))
+
+
+def estatisticas() -> dict:
+    with _lock:
+        return {"esqueletos": len(_esqueletos), "modelos_completos": len(_completos)}
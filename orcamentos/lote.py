@@ -0,0 +1,200 @@
+# orcamentos/lote.py
+"""Orçamentos de Revisão em lote: planilha (CSV/XLSX) de clientes → ZIP de DOCX.
+
+As linhas são renderizadas em paralelo e cada .docx vai direto para o ZIP
+(em arquivo temporário) assim que fica pronto, com no máximo alguns
+documentos em memória ao mesmo tempo.
+"""
+import csv
+import io
+import re
+import unicodedata
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import IO, Callable, Iterable
+
+from orcamentos import processos, revisao
+from orcamentos.modelos import hash_bytes
+
+COLUNAS = ["cliente", "consultor", "palavras", "valor_palavra", "desconto", "parcelas", "observacoes"]
+WORKERS = 4
+
+
+@dataclass
+class LinhaLote:
+    linha: int  # número da linha na planilha (cabeçalho = 1)
+    cliente: str
+    consultor: str
+    palavras: int
+    valor_palavra: float
+    desconto: float
+    parcelas: int
+    observacoes: str = ""
+
+
+@dataclass
+class ResultadoLote:
+    gerados: int = 0
+    erros: list[tuple[int, str]] = field(default_factory=list)
+
+
+def _normalizar_coluna(nome) -> str:
+    s = unicodedata.normalize("NFKD", str(nome or "")).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "_", s.strip().lower()).strip("_")
+
+
+def _numero(valor, padrao: float) -> float:
+    if valor is None or str(valor).strip() == "":
+        return padrao
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    s = str(valor).strip().replace("R$", "").replace("%", "").strip()
+    if "," in s:  # formato BR: 1.234,56
+        s = s.replace(".", "").replace(",", ".")
+    return float(s)
+
+
+def ler_planilha(arquivo: IO[bytes], nome: str) -> Iterable[dict]:
+    """Itera as linhas da planilha como dicts com as colunas normalizadas."""
+    if nome.lower().endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(arquivo, read_only=True, data_only=True)
+        try:
+            linhas = wb.active.iter_rows(values_only=True)
+            cab = [_normalizar_coluna(c) for c in next(linhas, [])]
+            for valores in linhas:
+                if any(v not in (None, "") for v in valores):
+                    yield dict(zip(cab, valores))
+        finally:
+            wb.close()
+        return
+
+    texto = io.TextIOWrapper(arquivo, encoding="utf-8-sig", newline="")
+    amostra = texto.read(4096)
+    texto.seek(0)
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=";,\t")
+    except csv.Error:
+        dialeto = csv.excel
+    leitor = csv.reader(texto, dialeto)
+    cab = [_normalizar_coluna(c) for c in next(leitor, [])]
+    for valores in leitor:
+        if any(v.strip() for v in valores):
+            yield dict(zip(cab, valores))
+
+
+def validar(linhas: Iterable[dict], valor_palavra: float, desconto: float,
+            parcelas: int) -> tuple[list[LinhaLote], list[tuple[int, str]]]:
+    """Converte as linhas cruas; colunas vazias usam os valores padrão da tela."""
+    ok: list[LinhaLote] = []
+    erros: list[tuple[int, str]] = []
+    for n, d in enumerate(linhas, start=2):
+        try:
+            item = LinhaLote(
+                linha=n,
+                cliente=str(d.get("cliente") or "").strip(),
+                consultor=str(d.get("consultor") or "").strip(),
+                palavras=int(_numero(d.get("palavras"), -1)),
+                valor_palavra=_numero(d.get("valor_palavra"), valor_palavra),
+                desconto=_numero(d.get("desconto"), desconto),
+                parcelas=int(_numero(d.get("parcelas"), parcelas)),
+                observacoes=str(d.get("observacoes") or "").strip(),
+            )
+        except (TypeError, ValueError) as e:
+            erros.append((n, f"valor inválido: {e}"))
+            continue
+        if item.palavras < 0:
+            erros.append((n, "coluna 'palavras' vazia ou negativa"))
+        elif not 0 <= item.desconto <= 100:
+            erros.append((n, f"desconto fora de 0–100: {item.desconto}"))
+        elif not 1 <= item.parcelas <= revisao.MAX_PARCELAS:
+            erros.append((n, f"parcelas fora de 1–{revisao.MAX_PARCELAS}: {item.parcelas}"))
+        elif item.valor_palavra < 0:
+            erros.append((n, f"valor por palavra negativo: {item.valor_palavra}"))
+        else:
+            ok.append(item)
+    return ok, erros
+
+
+def calcular_linha(item: LinhaLote) -> dict:
+    return revisao.calcular(item.palavras, item.valor_palavra, item.desconto, item.parcelas,
+                            aplicar_desconto=item.desconto > 0)
+
+
+def contexto_da_linha(item: LinhaLote, data_orcamento: str, data_entrega: str,
+                      calc: dict | None = None) -> dict:
+    calc = calc or calcular_linha(item)
+    return revisao.montar_contexto(calc, item.cliente, item.consultor, item.observacoes,
+                                   data_orcamento, data_entrega)
+
+
+def nome_arquivo(item: LinhaLote) -> str:
+    slug = _normalizar_coluna(item.cliente) or "cliente"
+    return f"Orcamento_Rev_{item.linha:05d}_{slug[:40]}.docx"
+
+
+def gerar_zip(itens: list[LinhaLote], modelo: bytes, destino: IO[bytes],
+              progresso: Callable[[int, int], None] | None = None,
+              workers: int = WORKERS,
+              erros: list[tuple[int, str]] | None = None,
+              ao_gerar: Callable[[LinhaLote, dict, dict], None] | None = None) -> ResultadoLote:
+    """Renderiza os itens em paralelo e grava cada DOCX no ZIP assim que termina.
+
+    No máximo ``2 * workers`` documentos ficam em voo/na memória ao mesmo tempo.
+    ``erros`` (ex.: da validação) entram no relatório erros.csv junto com os de render.
+    ``ao_gerar(item, calc, contexto)`` é chamado (na thread de quem chamou) para
+    cada documento gravado.
+    """
+    h = hash_bytes(modelo)
+    data_orcamento, data_entrega = revisao.datas()
+    res = ResultadoLote(erros=list(erros or []))
+    total = len(itens)
+    feitos = 0
+
+    def tarefa(item: LinhaLote) -> tuple[dict, dict, bytes]:
+        calc = calcular_linha(item)
+        ctx = contexto_da_linha(item, data_orcamento, data_entrega, calc)
+        # cada linha é um orçamento diferente: não passa pelo cache de saída
+        # espera=None: o lote aguarda vaga no pool de processos em vez de desistir
+        return calc, ctx, processos.renderizar(modelo, ctx, h, usar_cache=False, espera=None)
+
+    # DOCX já é compactado por dentro: ZIP_STORED evita comprimir de novo
+    with zipfile.ZipFile(destino, "w", zipfile.ZIP_STORED) as zf, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        pendentes = {}
+        fila = iter(itens)
+
+        def abastecer():
+            for item in fila:
+                pendentes[pool.submit(tarefa, item)] = item
+                if len(pendentes) >= 2 * workers:
+                    break
+
+        abastecer()
+        while pendentes:
+            prontos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for fut in prontos:
+                item = pendentes.pop(fut)
+                try:
+                    calc, ctx, docx = fut.result()
+                    zf.writestr(nome_arquivo(item), docx)
+                    res.gerados += 1
+                except Exception as e:
+                    res.erros.append((item.linha, f"falha ao gerar DOCX: {e}"))
+                else:
+                    if ao_gerar:
+                        ao_gerar(item, calc, ctx)
+                feitos += 1
+                if progresso:
+                    progresso(feitos, total)
+            abastecer()
+
+        if res.erros:
+            relatorio = io.StringIO()
+            w = csv.writer(relatorio, delimiter=";")
+            w.writerow(["linha", "erro"])
+            w.writerows(sorted(res.erros))
+            zf.writestr("erros.csv", relatorio.getvalue().encode("utf-8-sig"))
+    return res
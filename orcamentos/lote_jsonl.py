@@ -0,0 +1,224 @@
+# orcamentos/lote_jsonl.py
+"""Cotações em lote por linha de comando: JSON lines na entrada, JSON lines na saída.
+
+Para a sincronização noturna com o CRM. Cada linha da entrada é um pedido com
+``"produto"`` (revisao, vla ou eliv) e os mesmos campos das rotas da API
+(``orcamentos.cotacao``); ``"id"``, se vier, volta na resposta. Cada linha da
+saída traz ``linha`` (número na entrada), o cálculo, o script de WhatsApp/CRM
+e o contexto, ou ``erro``. Linhas com erro não param o lote.
+
+    python -m orcamentos.lote_jsonl pedidos.jsonl -o cotacoes.jsonl
+    zcat pedidos.jsonl.gz | python -m orcamentos.lote_jsonl -o cotacoes.jsonl --checkpoint cotacoes.ckpt
+    python -m orcamentos.lote_jsonl pedidos.jsonl -o cotacoes.jsonl --documentos docs/ --formato pdf
+
+A entrada é lida como gerador, em blocos: no máximo dois blocos ficam em
+memória (um sendo calculado nos processos, outro sendo escrito), então 1M de
+linhas usa a mesma memória que mil. A saída sai na ordem da entrada.
+
+``--checkpoint``: depois de cada bloco a saída vai para o disco (fsync) e o
+arquivo de checkpoint guarda a última linha escrita e o tamanho da saída. Se o
+lote cair, rodar o mesmo comando de novo corta a saída nesse tamanho (some a
+linha pela metade) e continua da linha seguinte. No fim o checkpoint é apagado.
+
+``--documentos``: grava o DOCX (ou PDF, ``--formato pdf``, via ``pdf_nativo``)
+de cada cotação nesse diretório, como ``00000042_Orcamento_Rev.docx``; a saída
+traz o nome em ``arquivo``. A VLA só tem PDF. O lote não grava no histórico.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+from orcamentos import cotacao, desempenho, modelos
+
+POR_TAREFA = 64  # linhas por tarefa enviada a um processo
+
+_diretorio: Path | None = None
+_formato = "docx"
+
+
+# ------------------------- nos processos -------------------------
+def _iniciar(diretorio: str | None, formato: str) -> None:
+    global _diretorio, _formato
+    desempenho.ATIVO = False
+    _diretorio = Path(diretorio) if diretorio else None
+    _formato = formato
+
+
+def _documento(n: int, cot: cotacao.Cotacao) -> str | None:
+    if _formato == "pdf":
+        from orcamentos import pdf_nativo
+
+        dados = pdf_nativo.gerar_sem_cache(cot.layout, cot.contexto)
+    elif cot.modelo is None:
+        return None
+    else:
+        modelo, h = modelos.ler_arquivo(cot.modelo)
+        dados = modelos.renderizar(modelo, cot.contexto, h, usar_cache=False)
+    destino = _diretorio / f"{n:08d}_{cot.nome}.{_formato}"
+    tmp = destino.with_name(destino.name + ".tmp")
+    tmp.write_bytes(dados)
+    os.replace(tmp, destino)
+    return destino.name
+
+
+def _processar(item: tuple[int, str]) -> tuple[bool, bytes]:
+    """(ok, linha de saída já codificada) para a linha ``n`` da entrada."""
+    n, texto = item
+    saida: dict = {"linha": n}
+    try:
+        d = json.loads(texto)
+        if isinstance(d, dict) and "id" in d:
+            saida["id"] = d["id"]
+        cot = cotacao.cotar(d)
+        resultado = dict(cot.resultado)
+        if _diretorio is not None:
+            resultado["arquivo"] = _documento(n, cot)
+    except json.JSONDecodeError as e:
+        saida["erro"] = f"JSON inválido: {e}"
+    except cotacao.ErroEntrada as e:
+        saida["erro"] = str(e)
+    except Exception as e:
+        saida["erro"] = f"falha: {e}"
+    else:
+        saida.update(resultado)
+    try:
+        texto = json.dumps(saida, ensure_ascii=False, allow_nan=False)
+    except ValueError:  # NaN/Infinity no "id" ecoado: a saída tem de continuar JSON válido
+        saida = {"linha": n, "erro": "número não finito no pedido"}
+        texto = json.dumps(saida, ensure_ascii=False)
+    return "erro" not in saida, (texto + "\n").encode("utf-8")
+
+
+# ------------------------- no processo principal -------------------------
+def _linhas(entrada: Iterable[str], pular: int) -> Iterator[tuple[int, str]]:
+    for n, texto in enumerate(entrada, start=1):
+        if n > pular and texto.strip():
+            yield n, texto
+
+
+def _blocos(linhas: Iterator[tuple[int, str]], tamanho: int) -> Iterator[list[tuple[int, str]]]:
+    while bloco := list(islice(linhas, tamanho)):
+        yield bloco
+
+
+def _ler_checkpoint(caminho: Path, entrada: str) -> dict | None:
+    if not caminho.exists():
+        return None
+    estado = json.loads(caminho.read_text(encoding="utf-8"))
+    if estado["entrada"] != entrada:
+        raise SystemExit(f"{caminho}: checkpoint de outra entrada ({estado['entrada']}); apague-o para recomeçar")
+    return estado
+
+
+def _gravar_checkpoint(caminho: Path, estado: dict) -> None:
+    tmp = caminho.with_name(caminho.name + ".tmp")
+    tmp.write_text(json.dumps(estado), encoding="utf-8")
+    os.replace(tmp, caminho)
+
+
+def processar(entrada: IO[str], saida: IO[bytes], processos: int, por_tarefa: int = POR_TAREFA,
+              diretorio: Path | None = None, formato: str = "docx", pular: int = 0,
+              ao_terminar_bloco=None, ok: int = 0, erros: int = 0) -> tuple[int, int]:
+    """Cota as linhas de ``entrada`` (a partir da ``pular + 1``) e escreve em ``saida``.
+
+    ``ao_terminar_bloco(ultima_linha, ok, erros)`` roda depois de cada bloco escrito.
+    ``ok``/``erros`` partem das contagens de um checkpoint ao retomar.
+    ``processos=0`` calcula tudo neste processo. Retorna (ok, erros) do lote inteiro.
+    """
+    blocos = _blocos(_linhas(entrada, pular), max(processos, 1) * por_tarefa * 4)
+    args = (str(diretorio) if diretorio else None, formato)
+
+    def escrever(ultima: int, resultados) -> None:
+        nonlocal ok, erros
+        for certo, linha in resultados:
+            saida.write(linha)
+            ok += certo
+            erros += not certo
+        if ao_terminar_bloco:
+            ao_terminar_bloco(ultima, ok, erros)
+
+    if processos <= 0:
+        _iniciar(*args)
+        for bloco in blocos:
+            escrever(bloco[-1][0], map(_processar, bloco))
+        return ok, erros
+
+    with multiprocessing.Pool(processos, initializer=_iniciar, initargs=args) as pool:
+        # imap enfileira o bloco inteiro de uma vez: o próximo bloco só é lido
+        # depois que o anterior foi enviado, enquanto o anterior a ele é escrito
+        pendente = None
+        for bloco in blocos:
+            atual = (bloco[-1][0], pool.imap(_processar, bloco, por_tarefa))
+            if pendente:
+                escrever(*pendente)
+            pendente = atual
+        if pendente:
+            escrever(*pendente)
+    return ok, erros
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m orcamentos.lote_jsonl", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("entrada", nargs="?", default="-", help="arquivo .jsonl (padrão: stdin)")
+    ap.add_argument("-o", "--saida", type=Path, help="arquivo .jsonl de saída (padrão: stdout)")
+    ap.add_argument("--checkpoint", type=Path, help="retoma daqui se o lote tiver caído (exige --saida)")
+    ap.add_argument("--documentos", type=Path, help="diretório onde gravar o documento de cada cotação")
+    ap.add_argument("--formato", choices=["docx", "pdf"], default="docx")
+    ap.add_argument("--processos", type=int, default=os.cpu_count() or 1,
+                    help="processos de cálculo (0 = tudo neste processo)")
+    ap.add_argument("--por-tarefa", type=int, default=POR_TAREFA, help="linhas por tarefa de cada processo")
+    args = ap.parse_args(argv)
+
+    if args.checkpoint and not args.saida:
+        ap.error("--checkpoint exige --saida")
+    if args.formato == "pdf" and args.documentos:
+        from orcamentos import pdf_nativo
+
+        if not pdf_nativo.disponivel():
+            ap.error("--formato pdf precisa do fpdf2 (pip install fpdf2)")
+    if args.documentos:
+        args.documentos.mkdir(parents=True, exist_ok=True)
+
+    estado = _ler_checkpoint(args.checkpoint, args.entrada) if args.checkpoint else None
+    pular = estado["linha"] if estado else 0
+    ok0, erros0 = (estado.get("ok", 0), estado.get("erros", 0)) if estado else (0, 0)
+    if estado:
+        os.truncate(args.saida, estado["bytes"])
+        print(f"retomando depois da linha {pular}", file=sys.stderr)
+
+    def ao_terminar_bloco(ultima: int, ok: int, erros: int) -> None:
+        saida.flush()
+        if args.checkpoint:
+            os.fsync(saida.fileno())
+            _gravar_checkpoint(args.checkpoint, {"entrada": args.entrada, "linha": ultima,
+                                                 "bytes": saida.tell(), "ok": ok, "erros": erros})
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8")
+    saida = open(args.saida, "ab" if estado else "wb") if args.saida else sys.stdout.buffer
+    t0 = time.perf_counter()
+    try:
+        ok, erros = processar(entrada, saida, args.processos, args.por_tarefa, args.documentos,
+                              args.formato, pular, ao_terminar_bloco, ok0, erros0)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if saida is not sys.stdout.buffer:
+            saida.close()
+    if args.checkpoint:
+        args.checkpoint.unlink(missing_ok=True)
+    dt = time.perf_counter() - t0
+    feitas = ok + erros - ok0 - erros0  # a taxa é só desta execução; os totais, do lote inteiro
+    print(f"{ok + erros} linhas ({erros} com erro); {feitas} nesta execução em {dt:.1f} s: "
+          f"{feitas / max(dt, 1e-9):.0f} linhas/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
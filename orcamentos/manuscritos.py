@@ -0,0 +1,305 @@
+# orcamentos/manuscritos.py
+"""Contagem de palavras e páginas de manuscritos enviados (.docx, .odt, .txt, .pdf).
+
+O texto é lido em blocos, sem montar o documento inteiro na memória:
+
+- .docx: ``word/document.xml`` (mais notas de rodapé e de fim), cortado em
+  parágrafos; só o conteúdo de ``<w:t>`` conta (campos e texto excluído em
+  revisão ficam de fora);
+- .odt: ``content.xml``, com as marcações removidas;
+- .txt: UTF-8 (ou Windows-1252, se não for UTF-8 válido); ``contar_arquivo``
+  lê arquivos em disco por ``mmap``;
+- .pdf: texto extraído página a página com ``pypdf`` (opcional; PDF só de
+  imagem dá 0 palavras).
+
+Uma palavra é uma sequência de letras/dígitos (acentos incluídos), unida por
+hífen ou apóstrofo ("guarda-chuva", "d'água" = 1), por hífen no fim da linha
+("pala-⏎vra" = 1) e, entre dígitos, por ponto ou vírgula ("1.000,50" = 1).
+
+Páginas: as do PDF; nos outros formatos, palavras ÷ PALAVRAS_POR_PAGINA
+(ORCAMENTO_PALAVRAS_POR_PAGINA, padrão 300: A4, corpo 12, entrelinha 1,5). A
+paginação que .docx/.odt guardam nos metadados não é usada: só o editor que
+salvou por último a atualiza (arquivos gerados por programa trazem a do modelo).
+
+O resultado fica em cache pelo SHA-256 do conteúdo; vários arquivos são
+contados em paralelo no pool de ``processos``.
+"""
+import codecs
+import html
+import io
+import math
+import mmap
+import os
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from orcamentos import desempenho, processos
+from orcamentos.modelos import hash_bytes
+
+FORMATOS = ("docx", "odt", "txt", "pdf")
+PALAVRAS_POR_PAGINA = int(os.environ.get("ORCAMENTO_PALAVRAS_POR_PAGINA", "300"))
+BLOCO = 1024 * 1024  # bytes lidos por vez
+MAX_CACHE = 256
+
+PALAVRA = re.compile(r"[^\W_]+(?:(?:[-\u2010\u00ad][ \t]*\r?\n[ \t]*|[-\u2010'\u2019\u00ad]|(?<=\d)[.,](?=\d))[^\W_]+)*")
+
+_HIFENS = "-\u2010\u00ad"
+
+_DOCX_PARTES = ("word/document.xml", "word/footnotes.xml", "word/endnotes.xml")
+_DOCX_ESPACO = re.compile(rb"<w:(?:tab|br|cr)/>")
+_DOCX_TEXTO = re.compile(rb"<w:t(?:\s[^>]*)?>([^<]*)</w:t>")
+_ODT_ESPACO = re.compile(rb"</text:[ph]>|<text:(?:s|tab|line-break)\b[^>]*>")
+_ODT_TAG = re.compile(rb"<[^>]*>")
+
+
+class FormatoNaoSuportado(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Contagem:
+    nome: str
+    hash: str
+    palavras: int
+    paginas: int
+    paginas_do_arquivo: bool  # False = estimativa por palavras (só PDF tem páginas de fato)
+
+
+def contar_palavras(texto: str) -> int:
+    return PALAVRA.subn("", texto)[1]
+
+
+def _corte(texto: str) -> int:
+    """Até onde ``texto`` pode ser contado sem partir uma palavra: a última quebra de
+    linha (ou espaço) que não segue um hífen; o resto vai para o próximo bloco."""
+    for separador in ("\n", " "):
+        corte = texto.rfind(separador)
+        while corte > 0:
+            i = corte - 1
+            while i >= 0 and texto[i] in " \t\r":
+                i -= 1
+            if i < 0 or texto[i] not in _HIFENS:
+                return corte + 1
+            corte = texto.rfind(separador, 0, i)
+    return 0
+
+
+def _estimar_paginas(palavras: int) -> int:
+    return max(1, math.ceil(palavras / PALAVRAS_POR_PAGINA))
+
+
+# ------------------------- por formato -------------------------
+def _xml_em_paragrafos(membro, fim: bytes):
+    """Blocos do XML cortados logo depois do último ``fim`` (fecha parágrafo)."""
+    resto = b""
+    while bloco := membro.read(BLOCO):
+        bloco = resto + bloco
+        corte = bloco.rfind(fim)
+        if corte < 0:
+            resto = bloco
+            continue
+        corte += len(fim)
+        yield bloco[:corte]
+        resto = bloco[corte:]
+    if resto:
+        yield resto
+
+
+def _texto_xml(xml: bytes) -> str:
+    texto = xml.decode("utf-8", errors="replace")
+    return html.unescape(texto) if "&" in texto else texto
+
+
+def _palavras_docx(zf: zipfile.ZipFile) -> int:
+    nomes = set(zf.namelist())
+    total = 0
+    for parte in _DOCX_PARTES:
+        if parte not in nomes:
+            continue
+        with zf.open(parte) as membro:
+            for bloco in _xml_em_paragrafos(membro, b"</w:p>"):
+                bloco = _DOCX_ESPACO.sub(b"<w:t> </w:t>", bloco)
+                # runs do mesmo parágrafo se juntam (uma palavra pode estar partida em vários)
+                texto = b"\n".join(b"".join(_DOCX_TEXTO.findall(p)) for p in bloco.split(b"</w:p>"))
+                total += contar_palavras(_texto_xml(texto))
+    return total
+
+
+def _palavras_odt(zf: zipfile.ZipFile) -> int:
+    total = 0
+    with zf.open("content.xml") as membro:
+        for bloco in _xml_em_paragrafos(membro, b"</text:p>"):
+            total += contar_palavras(_texto_xml(_ODT_TAG.sub(b"", _ODT_ESPACO.sub(b" ", bloco))))
+    return total
+
+
+def _palavras_txt_como(mv: memoryview, codificacao: str) -> int:
+    decodificador = codecs.getincrementaldecoder(codificacao)()
+    total, resto = 0, ""
+    for i in range(0, len(mv), BLOCO):
+        texto = resto + decodificador.decode(mv[i:i + BLOCO])
+        corte = _corte(texto)
+        total += contar_palavras(texto[:corte])
+        resto = texto[corte:]
+    return total + contar_palavras(resto + decodificador.decode(b"", final=True))
+
+
+def _palavras_txt(dados) -> int:
+    with memoryview(dados) as mv:
+        try:
+            return _palavras_txt_como(mv, "utf-8")
+        except UnicodeDecodeError:
+            pass
+        try:
+            return _palavras_txt_como(mv, "cp1252")
+        except UnicodeDecodeError:
+            return _palavras_txt_como(mv, "latin-1")  # decodifica qualquer byte
+
+
+def _contar_pdf(dados) -> tuple[int, int]:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise FormatoNaoSuportado("para contar PDF instale o pacote pypdf.") from None
+    leitor = PdfReader(_arquivo(dados))
+    # hifenização no fim da página também é unida: a última linha segue para a próxima
+    palavras = 0
+    resto = ""
+    for pagina in leitor.pages:
+        texto = resto + (pagina.extract_text() or "") + "\n"
+        corte = _corte(texto)
+        palavras += contar_palavras(texto[:corte])
+        resto = texto[corte:]
+    return palavras + contar_palavras(resto), len(leitor.pages)
+
+
+def _formato(nome: str) -> str:
+    formato = Path(nome).suffix.lower().lstrip(".")
+    if formato not in FORMATOS:
+        raise FormatoNaoSuportado(f"formato .{formato} não suportado (use {', '.join(FORMATOS)}).")
+    return formato
+
+
+def _arquivo(dados):
+    return dados if hasattr(dados, "seek") else io.BytesIO(dados)
+
+
+def _contar(nome: str, dados, h: str) -> Contagem:
+    """Conta sem cache (roda no processo do pool). ``dados``: bytes ou arquivo aberto."""
+    formato = _formato(nome)
+    paginas = None
+    if formato == "txt":
+        palavras = _palavras_txt(dados)
+    elif formato == "pdf":
+        palavras, paginas = _contar_pdf(dados)
+    else:
+        try:
+            with zipfile.ZipFile(_arquivo(dados)) as zf:
+                palavras = _palavras_docx(zf) if formato == "docx" else _palavras_odt(zf)
+        except (zipfile.BadZipFile, KeyError):  # KeyError: falta a parte principal (content.xml)
+            raise FormatoNaoSuportado(f"{nome} não é um .{formato} válido.") from None
+    return Contagem(nome, h, palavras, paginas or _estimar_paginas(palavras), paginas is not None)
+
+
+# ------------------------- cache e paralelismo -------------------------
+_lock = threading.Lock()
+_cache: "OrderedDict[str, Contagem]" = OrderedDict()
+
+
+def _do_cache(h: str, nome: str) -> Contagem | None:
+    with _lock:
+        c = _cache.get(h)
+        if c is not None:
+            _cache.move_to_end(h)
+            desempenho.contar("manuscrito.cache.acerto")
+    return c if c is None or c.nome == nome else replace(c, nome=nome)
+
+
+def _guardar(c: Contagem) -> None:
+    with _lock:
+        _cache[c.hash] = c
+        while len(_cache) > MAX_CACHE:
+            _cache.popitem(last=False)
+
+
+def contar(nome: str, dados) -> Contagem:
+    """Contagem de um arquivo já na memória (bytes, memoryview ou mmap); o formato vem do nome."""
+    _formato(nome)  # erro de formato antes de hashear
+    h = hash_bytes(dados)
+    c = _do_cache(h, nome)
+    if c is None:
+        with desempenho.etapa("manuscrito.contar"):
+            # bytes(): memoryview/mmap não vão por pickle
+            c = processos.executar(_contar, nome, bytes(dados), h, espera=None, etapa="manuscrito.processo")
+        _guardar(c)
+    return c
+
+
+def contar_arquivo(caminho: Path | str) -> Contagem:
+    """Como ``contar``, para um arquivo em disco (conta no próprio processo).
+
+    O hash e o .txt leem o arquivo por ``mmap``; .docx/.odt/.pdf, pelo arquivo aberto.
+    """
+    caminho = Path(caminho)
+    formato = _formato(caminho.name)
+    with open(caminho, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise FormatoNaoSuportado(f"{caminho.name} está vazio.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            h = hash_bytes(mapa)
+            c = _do_cache(h, caminho.name)
+            if c is None:
+                c = _contar(caminho.name, mapa if formato == "txt" else f, h)
+                _guardar(c)
+    return c
+
+
+def _em_paralelo(arquivos: list[tuple[str, bytes]], workers: int | None) -> list[Contagem | Exception]:
+    if not arquivos:
+        return []
+    workers = workers or max(1, processos.PROCESSOS)
+    with ThreadPoolExecutor(max_workers=min(workers, len(arquivos))) as pool:
+        futuros = [pool.submit(contar, nome, dados) for nome, dados in arquivos]
+    resultados = []
+    for fut in futuros:
+        try:
+            resultados.append(fut.result())
+        except Exception as e:
+            resultados.append(e)
+    return resultados
+
+
+def contar_varios(arquivos: list[tuple[str, bytes]], workers: int | None = None
+                  ) -> tuple[list[Contagem], list[tuple[str, str]]]:
+    """Conta ``(nome, dados)`` em paralelo. Devolve as contagens (na ordem) e os (nome, erro)."""
+    contagens, erros = [], []
+    for (nome, _), r in zip(arquivos, _em_paralelo(arquivos, workers)):
+        if isinstance(r, Exception):
+            erros.append((nome, str(r)))
+        else:
+            contagens.append(r)
+    return contagens, erros
+
+
+def contar_enviados(arquivos, memo: dict) -> tuple[list[Contagem], list[tuple[str, str]]]:
+    """``contar_varios`` para UploadedFile do Streamlit.
+
+    ``memo`` (ex.: um dict em ``st.session_state``) guarda file_id -> Contagem,
+    para os reruns não re-hashearem os arquivos; perde os que saíram da lista.
+    """
+    faltam = [a for a in arquivos if a.file_id not in memo]
+    erros = []
+    for a, r in zip(faltam, _em_paralelo([(a.name, a.getvalue()) for a in faltam], None)):
+        if isinstance(r, Exception):
+            erros.append((a.name, str(r)))
+        else:
+            memo[a.file_id] = r
+    ids = {a.file_id for a in arquivos}
+    for file_id in [k for k in memo if k not in ids]:
+        del memo[file_id]
+    return [memo[a.file_id] for a in arquivos if a.file_id in memo], erros
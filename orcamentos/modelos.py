@@ -0,0 +1,212 @@
+# orcamentos/modelos.py
+"""Cache de modelos DOCX já interpretados, compartilhado por todo o processo.
+
+Abrir um .docx com o DocxTemplate significa descompactar o arquivo e montar a
+árvore lxml de cada parte. Aqui isso acontece uma única vez por conteúdo
+(chave = SHA-256 dos bytes); cada renderização recebe uma cópia profunda do
+documento já interpretado, que é bem mais barata que interpretar de novo.
+Na gravação, os membros do ZIP que o render não alterou são copiados já
+comprimidos (ver ``zip_docx``), sempre com a mesma data: o mesmo modelo com o
+mesmo contexto gera exatamente os mesmos bytes, o que permite guardar o
+resultado em ``cache_saida``.
+"""
+import copy
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from orcamentos import cache_saida, desempenho
+
+# docxtpl (jinja2 + lxml + python-docx) só é importado quando um documento é
+# de fato renderizado, para não pesar no primeiro carregamento da página
+if TYPE_CHECKING:
+    from docxtpl import DocxTemplate
+
+# Limites do cache (número de modelos e soma do tamanho dos .docx de origem)
+MAX_MODELOS = 16
+MAX_BYTES = 32 * 1024 * 1024
+
+_lock = threading.Lock()
+# hash -> (modelo interpretado, tamanho do .docx, referência de membros do zip_docx)
+_modelos: "OrderedDict[str, tuple[DocxTemplate, int, dict]]" = OrderedDict()
+_bytes_em_cache = 0
+_aquecidos: set[str] = set()
+
+# Data gravada em todos os membros do ZIP (a menor que o formato aceita)
+DATA_ZIP = (1980, 1, 1, 0, 0, 0)
+
+# caminho -> (mtime_ns, tamanho, bytes, hash): evita reler o arquivo a cada rerun
+_arquivos: dict[str, tuple[int, int, bytes, str]] = {}
+
+
+def _apos_fork() -> None:
+    # filho do pool de render (orcamentos.processos): o fork copia o lock como
+    # estava, inclusive preso por outra thread do servidor, que no filho não existe
+    global _lock
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_apos_fork)
+
+
+def hash_bytes(dados: bytes) -> str:
+    return hashlib.sha256(dados).hexdigest()
+
+
+def ler_arquivo(caminho: Path | str) -> tuple[bytes, str]:
+    """Lê um modelo do disco só quando ele muda (mtime/tamanho). Retorna (bytes, hash)."""
+    p = Path(caminho)
+    st = p.stat()
+    chave = str(p.resolve())
+    atual = _arquivos.get(chave)
+    if atual and atual[0] == st.st_mtime_ns and atual[1] == st.st_size:
+        return atual[2], atual[3]
+    dados = p.read_bytes()
+    h = hash_bytes(dados)
+    _arquivos[chave] = (st.st_mtime_ns, st.st_size, dados, h)
+    return dados, h
+
+
+def _interpretar(dados: bytes) -> "DocxTemplate":
+    from docxtpl import DocxTemplate
+
+    tpl = DocxTemplate(io.BytesIO(dados))
+    tpl.init_docx()
+    return tpl
+
+
+def _obter_original(dados: bytes, h: str) -> "tuple[DocxTemplate, dict]":
+    global _bytes_em_cache
+    with _lock:
+        item = _modelos.get(h)
+        if item is not None:
+            _modelos.move_to_end(h)
+            return item[0], item[2]
+
+    # interpretação fora do lock: dois cliques simultâneos no mesmo modelo novo
+    # podem interpretar duas vezes, mas ninguém espera pelo modelo do outro
+    from orcamentos import zip_docx
+
+    tpl = _interpretar(dados)
+    ref = zip_docx.referencia(tpl.docx.part.package)
+
+    with _lock:
+        if h not in _modelos:
+            _modelos[h] = (tpl, len(dados), ref)
+            _bytes_em_cache += len(dados)
+            while len(_modelos) > 1 and (len(_modelos) > MAX_MODELOS or _bytes_em_cache > MAX_BYTES):
+                _, (_, tam, _) = _modelos.popitem(last=False)
+                _bytes_em_cache -= tam
+        else:
+            _modelos.move_to_end(h)
+        item = _modelos[h]
+        return item[0], item[2]
+
+
+def _clonar(dados: bytes, h: str | None) -> "tuple[DocxTemplate, dict]":
+    from docxtpl import DocxTemplate
+
+    h = h or hash_bytes(dados)
+    original, ref = _obter_original(dados, h)
+    tpl = DocxTemplate(io.BytesIO(dados))
+    tpl.docx = copy.deepcopy(original.docx)
+    return tpl, ref
+
+
+def obter_modelo(dados: bytes, h: str | None = None) -> "DocxTemplate":
+    """Devolve um DocxTemplate pronto para render(), clonado do modelo em cache."""
+    return _clonar(dados, h)[0]
+
+
+def obter_modelo_arquivo(caminho: Path | str) -> "DocxTemplate":
+    dados, h = ler_arquivo(caminho)
+    return obter_modelo(dados, h)
+
+
+def renderizar(dados: bytes, contexto: dict, h: str | None = None, usar_cache: bool = True) -> bytes:
+    """Renderiza o modelo com o contexto e devolve os bytes do .docx gerado.
+
+    Com ``usar_cache`` o resultado vem de/vai para ``cache_saida``.
+    """
+    h = h or hash_bytes(dados)
+    if usar_cache:
+        return cache_saida.obter_ou_gerar(cache_saida.chave(h, contexto),
+                                          lambda: _renderizar(dados, contexto, h))
+    return _renderizar(dados, contexto, h)
+
+
+def _renderizar(dados: bytes, contexto: dict, h: str) -> bytes:
+    from orcamentos import zip_docx
+
+    with desempenho.etapa("modelo.carregar"):
+        tpl, ref = _clonar(dados, h)
+    with desempenho.etapa("docx.render"):
+        tpl.render(contexto)
+    with desempenho.etapa("docx.save"):
+        buf = io.BytesIO()
+        # troca de imagens/mídia do docxtpl mexe no zip depois do save: caminho normal
+        if tpl.pics_to_replace or tpl.crc_to_new_media or tpl.crc_to_new_embedded or tpl.zipname_to_replace:
+            tpl.save(buf)
+        else:
+            zip_docx.gravar(tpl.docx.part.package, buf, ref, data_hora=DATA_ZIP)
+    return buf.getvalue()
+
+
+_variaveis: dict[str, frozenset] = {}
+
+
+def variaveis_do_modelo(dados: bytes, h: str | None = None) -> frozenset:
+    """Placeholders que o modelo usa (corpo, cabeçalhos e rodapés), uma análise por modelo.
+
+    Levanta a exceção do Jinja se o modelo tiver erro de sintaxe nos placeholders.
+    """
+    h = h or hash_bytes(dados)
+    with _lock:
+        if h in _variaveis:
+            return _variaveis[h]
+    variaveis = frozenset(obter_modelo(dados, h).get_undeclared_template_variables())
+    with _lock:
+        _variaveis[h] = variaveis
+        while len(_variaveis) > 4 * MAX_MODELOS:
+            del _variaveis[next(iter(_variaveis))]
+    return variaveis
+
+
+def placeholders_sem_valor(dados: bytes, h: str | None, chaves) -> list[str]:
+    """Placeholders do modelo que não estão entre as ``chaves`` do contexto."""
+    return sorted(variaveis_do_modelo(dados, h) - set(chaves))
+
+
+def estatisticas() -> dict:
+    with _lock:
+        return {"modelos": len(_modelos), "bytes": _bytes_em_cache}
+
+
+def aquecer_em_segundo_plano(caminhos: list[Path | str]) -> None:
+    """Pré-carrega docxtpl e os modelos numa thread (cada arquivo uma vez por processo).
+
+    Chamar no fim do script da página (depois que a UI foi desenhada). Desligue
+    com ORCAMENTO_AQUECER=0.
+    """
+    if os.environ.get("ORCAMENTO_AQUECER", "1") == "0":
+        return
+    with _lock:
+        novos = [c for c in map(str, caminhos) if c not in _aquecidos]
+        _aquecidos.update(novos)
+    if not novos:
+        return
+
+    def _aquecer():
+        for caminho in novos:
+            try:
+                dados, h = ler_arquivo(caminho)
+                _obter_original(dados, h)
+            except Exception:
+                pass  # o erro aparece de novo (e na tela) quando o usuário gerar o documento
+
+    threading.Thread(target=_aquecer, name="aquecer-modelos", daemon=True).start()
@@ -0,0 +1,332 @@
+# orcamentos/nomes.py
+"""Autocompletar de cliente, consultor, obra e universidade a partir do histórico.
+
+Cada campo tem um ``Indice`` em memória: uma lista ordenada de chaves, uma por
+começo de palavra do nome na forma de busca do histórico (minúsculas, sem
+acento e sem "Prof.", "Dra." etc.), e a consulta é ``bisect`` nessa lista.
+"silva" acha "Prof. João Silva"; "joao s" também. Com poucas respostas por
+prefixo, a consulta tenta as variações do texto a uma edição de distância
+(letra a mais, a menos, trocada ou duas invertidas), andando só pelos ramos
+que existem na lista, como numa trie: "jaoa" ainda acha "João".
+
+Os nomes vêm do histórico (``orcamentos.historico``) e entram aos poucos: a
+cada lote que a gravadora grava (e a cada SINCRONIZAR_S, para os orçamentos
+de outros processos), só as linhas novas são lidas. O índice vai, já ordenado,
+para um arquivo compacto (zlib) ao lado do banco, com a última linha lida; ao
+subir, o processo carrega o arquivo e lê só o que veio depois.
+
+Com 300 mil clientes (``tools/popular_historico.py``): consulta por prefixo
+~0,05 ms, com erro de digitação 0,1–0,5 ms; arquivo de ~11 MiB carregado em
+menos de 1 s (montar do histórico leva ~13 s).
+"""
+import array
+import bisect
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+
+from orcamentos import historico
+
+CAMPOS = ("cliente", "consultor", "obra", "universidade")
+LIMITE = 8
+MAX_CANDIDATOS = 256     # chaves lidas por prefixo antes de ordenar por uso
+MIN_PARECIDOS = 3        # letras mínimas para tentar variações
+MAX_PALAVRAS = 4         # começos de palavra indexados por nome
+SINCRONIZAR_S = 30.0
+SALVAR_A_CADA = 500      # nomes novos entre uma gravação do arquivo e outra
+
+_FIM = "\U0010ffff"      # depois de qualquer chave com o mesmo começo
+_MAGICO = b"ORCNOMES1\n"
+
+
+class Indice:
+    """Nomes de um campo, com o número de orçamentos de cada um.
+
+    ``chaves`` (ordenada) e ``ids`` andam juntas: ``ids[k]`` é o nome de ``chaves[k]``.
+    """
+
+    def __init__(self, nomes: list[str] | None = None, usos: list[int] | None = None,
+                 buscas: list[str] | None = None, chaves: list[str] | None = None,
+                 ids: list[int] | None = None):
+        self.nomes = nomes or []
+        self.usos = usos or []
+        self.buscas = buscas or []
+        self.chaves = chaves or []
+        self.ids = ids or []
+        self._por_busca = {b: i for i, b in enumerate(self.buscas)}
+
+    def incorporar(self, contagem: dict[str, int]) -> None:
+        """Soma usos; nomes novos (pela forma de busca) entram com a grafia recebida."""
+        novas = []
+        for nome, n in contagem.items():
+            nome = " ".join("".join(c for c in nome if c.isprintable()).split())
+            busca = historico.normalizar(nome)
+            if not busca:
+                continue
+            i = self._por_busca.get(busca)
+            if i is None:
+                i = self._por_busca[busca] = len(self.nomes)
+                self.nomes.append(nome)
+                self.usos.append(0)
+                self.buscas.append(busca)
+                palavras = busca.split()
+                novas += [(" ".join(palavras[k:]), i) for k in range(min(len(palavras), MAX_PALAVRAS))]
+            self.usos[i] += n
+        if len(novas) > len(self.chaves) // 16:
+            pares = sorted([*zip(self.chaves, self.ids), *novas])
+            self.chaves, self.ids = [c for c, _ in pares], [i for _, i in pares]
+        else:
+            for chave, i in novas:
+                k = bisect.bisect_right(self.chaves, chave)
+                self.chaves.insert(k, chave)
+                self.ids.insert(k, i)
+
+    def _faixa(self, prefixo: str, maximo: int = MAX_CANDIDATOS) -> list[int]:
+        """Nomes das (até ``maximo``) primeiras chaves que começam com ``prefixo``."""
+        i = bisect.bisect_left(self.chaves, prefixo)
+        j = bisect.bisect_left(self.chaves, prefixo + _FIM, i, min(i + maximo, len(self.chaves)))
+        return self.ids[i:j]
+
+    def _proximas_letras(self, prefixo: str) -> list[str]:
+        """Letras que seguem ``prefixo`` em alguma chave (um ramo da trie)."""
+        chaves, n, letras = self.chaves, len(prefixo), []
+        i = bisect.bisect_right(chaves, prefixo)  # pula a chave igual ao prefixo
+        fim = bisect.bisect_left(chaves, prefixo + _FIM, i)
+        while i < fim:
+            letra = chaves[i][n]
+            letras.append(letra)
+            i = bisect.bisect_left(chaves, prefixo + chr(ord(letra) + 1), i, fim)
+        return letras
+
+    def _variacoes(self, q: str, inicio: int = 0) -> dict[str, None]:
+        """Prefixos a uma edição de ``q`` (a partir de ``inicio``) que existem no índice."""
+        variacoes = {}
+        for i in range(inicio, len(q)):
+            variacoes[q[:i] + q[i + 1:]] = None
+            if i + 1 < len(q):
+                variacoes[q[:i] + q[i + 1] + q[i] + q[i + 2:]] = None
+            for letra in self._proximas_letras(q[:i]):
+                if letra != q[i]:
+                    variacoes[q[:i] + letra + q[i + 1:]] = None
+                variacoes[q[:i] + letra + q[i:]] = None
+            if not self._faixa(q[:i + 1], 1):
+                break  # uma edição depois daqui manteria q[:i + 1], que não existe
+        variacoes.pop(q, None)
+        return variacoes
+
+    def _ordenar(self, ids, limite: int) -> list[str]:
+        usos = self.usos
+        return [self.nomes[i] for i in sorted(ids, key=lambda i: -usos[i])[:limite]]
+
+    def prefixo(self, texto: str, limite: int = LIMITE) -> list[str]:
+        q = historico.normalizar(texto)
+        return self._ordenar(dict.fromkeys(self._faixa(q)), limite) if q else []
+
+    def sugerir(self, texto: str, limite: int = LIMITE) -> list[str]:
+        """Por prefixo (mais usados primeiro) e, se faltar, a uma edição de distância."""
+        q = historico.normalizar(texto)
+        if not q:
+            return []
+        achados = dict.fromkeys(self._faixa(q))
+        saida = self._ordenar(achados, limite)
+        if len(saida) < limite and len(q) >= MIN_PARECIDOS:
+            parecidos: dict[int, None] = {}
+            # se as palavras anteriores existem como digitadas, só a última é corrigida
+            inicio = q.rfind(" ") + 1
+            if inicio and not self._faixa(q[:inicio], 1):
+                inicio = 0
+            for v in self._variacoes(q, inicio):
+                parecidos.update(dict.fromkeys(self._faixa(v, 2 * limite)))
+            saida += self._ordenar(parecidos.keys() - achados.keys(), limite - len(saida))
+        return saida
+
+
+# ------------------------- arquivo -------------------------
+def caminho_arquivo() -> Path:
+    return historico.CAMINHO.with_name(historico.CAMINHO.stem + ".nomes")
+
+
+def _bloco(dados: bytes) -> bytes:
+    return struct.pack("<Q", len(dados)) + dados
+
+
+def salvar(indices: dict[str, Indice], ate_id: int, caminho: Path) -> None:
+    """Grava os índices já ordenados: carregar não normaliza nem ordena de novo."""
+    cab = {"ate_id": ate_id, "historico": str(historico.CAMINHO), "campos": list(indices)}
+    partes = [_bloco(json.dumps(cab).encode())]
+    for ind in indices.values():
+        partes += [_bloco("\n".join(ind.nomes).encode("utf-8")), _bloco(array.array("Q", ind.usos).tobytes()),
+                   _bloco("\n".join(ind.buscas).encode("utf-8")), _bloco("\n".join(ind.chaves).encode("utf-8")),
+                   _bloco(array.array("L", ind.ids).tobytes())]
+    tmp = caminho.with_name(caminho.name + ".tmp")
+    tmp.write_bytes(_MAGICO + zlib.compress(b"".join(partes), 6))
+    os.replace(tmp, caminho)
+
+
+def _blocos(dados: bytes):
+    pos = 0
+    while pos < len(dados):
+        (n,) = struct.unpack_from("<Q", dados, pos)
+        yield dados[pos + 8:pos + 8 + n]
+        pos += 8 + n
+
+
+def _linhas(b: bytes) -> list[str]:
+    return b.decode("utf-8").split("\n") if b else []
+
+
+def _numeros(b: bytes, tipo: str) -> list[int]:
+    a = array.array(tipo)
+    a.frombytes(b)
+    return a.tolist()
+
+
+def carregar(caminho: Path) -> tuple[dict[str, Indice], int] | None:
+    """(índices, última linha do histórico já lida), ou None se o arquivo não serve."""
+    try:
+        bruto = caminho.read_bytes()
+        if not bruto.startswith(_MAGICO):
+            return None
+        blocos = _blocos(zlib.decompress(bruto[len(_MAGICO):]))
+        cab = json.loads(next(blocos))
+        if cab["historico"] != str(historico.CAMINHO) or cab["campos"] != list(CAMPOS):
+            return None
+        indices = {}
+        for campo in CAMPOS:
+            nomes, usos, buscas, chaves, ids = (next(blocos) for _ in range(5))
+            indices[campo] = Indice(_linhas(nomes), _numeros(usos, "Q"), _linhas(buscas), _linhas(chaves),
+                                    _numeros(ids, "L"))
+        return indices, int(cab["ate_id"])
+    except (OSError, ValueError, KeyError, StopIteration, struct.error, zlib.error):
+        return None
+
+
+# ------------------------- no processo -------------------------
+_lock = threading.Lock()
+_salvando = threading.Lock()
+_indices: dict[str, Indice] | None = None
+_ate_id = 0
+_lotes_vistos = -1
+_sincronizado_em = 0.0
+_nao_salvos = 0
+
+
+def _ler_novos(ate_id: int) -> tuple[dict[str, Counter], int]:
+    contagens = {campo: Counter() for campo in CAMPOS}
+    cur = historico._leitura().execute(
+        "SELECT id, cliente, consultor,"
+        " CASE WHEN produto LIKE 'eliv%' THEN json_extract(contexto, '$.obra') END,"
+        " CASE WHEN produto = 'eliv_universidade' THEN json_extract(contexto, '$.universidade') END"
+        " FROM orcamentos WHERE id > ? ORDER BY id", (ate_id,))
+    for id_, *valores in cur:
+        ate_id = id_
+        for campo, valor in zip(CAMPOS, valores):
+            if valor:
+                contagens[campo][valor] += 1
+    return contagens, ate_id
+
+
+def _sincronizar() -> None:
+    global _indices, _ate_id, _lotes_vistos, _sincronizado_em, _nao_salvos
+    lotes = historico.lotes_gravados
+    if _indices is None:
+        carregado = carregar(caminho_arquivo())
+        maior = historico._leitura().execute("SELECT COALESCE(MAX(id), 0) FROM orcamentos").fetchone()[0]
+        if carregado and carregado[1] > maior:
+            carregado = None  # histórico recriado: o arquivo é de outro banco
+        _indices, _ate_id = carregado or ({campo: Indice() for campo in CAMPOS}, 0)
+        _nao_salvos = 0 if carregado else SALVAR_A_CADA
+    contagens, ate_id = _ler_novos(_ate_id)
+    for campo, contagem in contagens.items():
+        _indices[campo].incorporar(contagem)
+        _nao_salvos += len(contagem)
+    _ate_id, _lotes_vistos, _sincronizado_em = ate_id, lotes, time.monotonic()
+    if _nao_salvos >= SALVAR_A_CADA and not _salvando.locked():
+        # cópias rasas (milissegundos); comprimir e gravar (segundos) fica fora do _lock
+        copia = {campo: Indice(list(ind.nomes), list(ind.usos), list(ind.buscas), list(ind.chaves), list(ind.ids))
+                 for campo, ind in _indices.items()}
+        _nao_salvos = 0
+        threading.Thread(target=_salvar, args=(copia, _ate_id), name="salvar-nomes", daemon=True).start()
+
+
+def _salvar(indices: dict[str, Indice], ate_id: int) -> None:
+    with _salvando:
+        try:
+            salvar(indices, ate_id, caminho_arquivo())
+        except OSError:
+            pass  # sem o arquivo o próximo processo só relê o histórico
+
+
+def indice(campo: str) -> Indice | None:
+    """Índice do campo, em dia com o histórico (None com o histórico desligado)."""
+    if not historico.ATIVO:
+        return None
+    with _lock:
+        if (_indices is None or historico.lotes_gravados != _lotes_vistos
+                or time.monotonic() - _sincronizado_em > SINCRONIZAR_S):
+            _sincronizar()
+        return _indices[campo]
+
+
+def sugerir(campo: str, texto: str, limite: int = LIMITE) -> list[str]:
+    ind = indice(campo)
+    return ind.sugerir(texto, limite) if ind is not None else []
+
+
+def estatisticas() -> dict:
+    """Nomes por campo e última linha lida ({} antes do primeiro uso). Sem o _lock: é só leitura."""
+    indices = _indices
+    if indices is None:
+        return {}
+    return {"nomes": {campo: len(ind.nomes) for campo, ind in indices.items()}, "ate_id": _ate_id}
+
+
+def aquecer() -> None:
+    """Carrega o índice numa thread (a primeira vez lê o histórico inteiro ou o arquivo).
+
+    Chamar no fim do script da página, como ``processos.aquecer``.
+    """
+    if not historico.ATIVO or _indices is not None or os.environ.get("ORCAMENTO_AQUECER", "1") == "0":
+        return
+
+    def _aquecer():
+        try:
+            indice(CAMPOS[0])
+        except Exception:
+            pass  # o erro aparece de novo (sem sugestões) quando o consultor digitar
+
+    threading.Thread(target=_aquecer, name="aquecer-nomes", daemon=True).start()
+
+
+# ------------------------- na página -------------------------
+def _escolher(chave: str) -> None:
+    import streamlit as st
+
+    escolhido = st.session_state.get(f"{chave}_sugestao")
+    if escolhido:
+        st.session_state[chave] = escolhido
+    st.session_state[f"{chave}_sugestao"] = None
+
+
+def sugestoes(campo: str, chave: str, limite: int = 5) -> None:
+    """Nomes já usados parecidos com o ``st.text_input`` de ``key=chave``; clicar troca o texto.
+
+    Chamar fora do ``st.form`` do campo (widgets com callback não podem ficar no form).
+    """
+    import streamlit as st
+
+    texto = st.session_state.get(chave) or ""
+    if len(historico.normalizar(texto)) < 2:
+        return
+    try:
+        nomes = sugerir(campo, texto, limite)
+    except Exception:
+        return  # sem sugestão o campo continua funcionando
+    if not nomes or " ".join(texto.split()) in nomes:
+        return
+    st.pills("Já usados:", nomes, key=f"{chave}_sugestao", on_change=_escolher, args=(chave,))
@@ -0,0 +1,314 @@
+# orcamentos/pagina_revisao.py
+"""Página da calculadora de Revisão.
+
+``app.py`` e ``Orcamento_Revisao.py`` são a mesma página com outro valor por
+palavra padrão; cada um só chama ``desenhar``.
+"""
+import datetime
+from pathlib import Path
+
+import streamlit as st
+
+from orcamentos import (artefatos, config, conversor_pdf, desempenho, diagnostico, historico, incremental, lote,
+                        manuscritos, nomes, pdf_nativo, precos, processos, revisao, uploads)
+from orcamentos.formatacao import br_int, br_money
+from orcamentos.modelos import hash_bytes, ler_arquivo, placeholders_sem_valor
+
+MODELO_PADRAO_PATH = Path("modelo_dialetica.docx")  # coloque este arquivo na raiz do repo
+
+
+def _render_docx(bytes_or_none, ctx, h=None):
+    if not bytes_or_none:
+        st.warning("Selecione um modelo válido (embutido ou enviado).")
+        return None
+    try:
+        # o render roda no pool de processos: as outras sessões não esperam por ele;
+        # revisões do mesmo orçamento (outro desconto/parcelas) só trocam os valores
+        with st.spinner("Gerando documento..."):
+            return incremental.renderizar(bytes_or_none, ctx, h)
+    except processos.FilaCheia as e:
+        st.warning(str(e))
+        return None
+    except Exception as e:
+        st.error(f"Falha ao gerar DOCX: {e}")
+        return None
+
+
+def _gerar_pdf(bytes_or_none, ctx, h, nativo):
+    # modelo padrão: PDF direto do contexto (pdf_nativo, dezenas de ms);
+    # modelo enviado: o DOCX renderizado, convertido pelo LibreOffice/Word
+    if nativo and pdf_nativo.disponivel():
+        try:
+            with st.spinner("Gerando PDF..."):
+                return pdf_nativo.gerar("revisao", ctx)
+        except processos.FilaCheia as e:
+            st.warning(str(e))
+        except Exception as e:
+            st.error(f"Falha ao gerar PDF: {e}")
+        return None
+    if not conversor_pdf.pdf_disponivel():
+        st.info("PDF automático não está disponível neste servidor (sem LibreOffice/Word). Gere o DOCX e exporte para PDF.")
+        return None
+    docx = _render_docx(bytes_or_none, ctx, h)
+    if not docx:
+        return None
+    try:
+        with st.spinner("Convertendo para PDF..."):
+            return conversor_pdf.converter_pdf(docx)
+    except conversor_pdf.FilaCheia as e:
+        st.warning(str(e))
+    except Exception as e:
+        st.error(f"Falha ao gerar PDF: {e}")
+    return None
+
+
+def _registrar_historico(ctx, script, valor_cent, modelo_bytes, modelo_hash):
+    historico.registrar("revisao", ctx["nome_cliente"], ctx["consultor"], valor_cent, ctx, script,
+                        modelo=modelo_bytes, modelo_hash=modelo_hash)
+
+
+# Fragmento: marcar a caixa ou clicar em gerar reroda só esta seção
+@st.fragment
+@desempenho.medir("revisao.documento")
+def secao_documento(modelo_bytes, modelo_hash, contexto, script, valor_cent, modelo_padrao):
+    incluir_script_no_docx = st.checkbox("Incluir o script de venda dentro do DOCX", value=False)
+    if incluir_script_no_docx:
+        contexto = {**contexto, "script": script}
+
+    colA, colB = st.columns(2)
+    with colA:
+        gerar_docx = st.button("📄 Gerar DOCX")
+    with colB:
+        gerar_pdf = st.button("🧾 Gerar PDF")
+
+    if gerar_docx:
+        docx = _render_docx(modelo_bytes, contexto, modelo_hash)
+        if docx:
+            _registrar_historico(contexto, script, valor_cent, modelo_bytes, modelo_hash)
+            nome = f"Orcamento_Rev_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
+            st.success("DOCX gerado com sucesso!")
+            desempenho.tamanho("download.docx", len(docx))
+            artefatos.oferecer("⬇️ Baixar DOCX", nome, docx)
+
+    if gerar_pdf:
+        pdf = _gerar_pdf(modelo_bytes, contexto, modelo_hash, modelo_padrao)
+        if pdf:
+            _registrar_historico(contexto, script, valor_cent, modelo_bytes, modelo_hash)
+            st.success("PDF gerado com sucesso!")
+            desempenho.tamanho("download.pdf", len(pdf))
+            artefatos.oferecer("⬇️ Baixar PDF",
+                               f"Orcamento_Rev_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf", pdf)
+
+
+@st.fragment
+@desempenho.medir("revisao.lote")
+def secao_lote(modelo_bytes, padroes):
+    planilha = st.file_uploader("Planilha de clientes", type=["csv", "xlsx"], key="lote_planilha")
+    if planilha and st.button("📦 Gerar ZIP do lote"):
+        if not modelo_bytes:
+            st.warning("Selecione um modelo válido (embutido ou enviado).")
+        else:
+            try:
+                itens, erros = lote.validar(
+                    lote.ler_planilha(planilha, planilha.name), **padroes
+                )
+            except Exception as e:
+                st.error(f"Não foi possível ler a planilha: {e}")
+                itens, erros = None, []
+
+            if itens is not None:
+                barra = st.progress(0.0, text=f"0/{len(itens)} orçamentos")
+
+                def _progresso(feitos, total):
+                    barra.progress(feitos / total, text=f"{feitos}/{total} orçamentos")
+
+                h_modelo = hash_bytes(modelo_bytes)
+
+                def _registrar_lote(item, calc, ctx):
+                    historico.registrar("revisao", item.cliente, item.consultor,
+                                        int(precos.centavos(calc["preco_final"])), ctx,
+                                        modelo=modelo_bytes, modelo_hash=h_modelo)
+
+                # o ZIP vai direto para o disco e é baixado de lá (artefatos)
+                nome_zip = f"Orcamentos_Rev_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+                with artefatos.novo(nome_zip) as (zip_f, zip_art):
+                    res = lote.gerar_zip(itens, modelo_bytes, zip_f, progresso=_progresso, erros=erros,
+                                         ao_gerar=_registrar_lote)
+                    desempenho.tamanho("download.zip", zip_f.tell())
+                if res.gerados:
+                    st.success(f"{res.gerados} orçamento(s) gerado(s).")
+                    artefatos.oferecer_artefato("⬇️ Baixar ZIP", zip_art)
+                if res.erros:
+                    st.warning(f"{len(res.erros)} linha(s) com erro (também em erros.csv dentro do ZIP).")
+                    st.dataframe(
+                        [{"linha": n, "erro": msg} for n, msg in sorted(res.erros)],
+                        hide_index=True, use_container_width=True,
+                    )
+
+
+def desenhar(valor_palavra_padrao: float) -> None:
+    """Desenha a página inteira (um rerun); ``valor_palavra_padrao`` é o valor inicial do campo."""
+    _t0_rerun = desempenho.inicio_rerun()
+
+    # ----------------- CONFIG -----------------
+    st.set_page_config(page_title="Calculadora de Revisão", page_icon="📝")
+    st.title("📝 Calculadora de Orçamento de Revisão (Dialética)")
+    st.caption("Link único para o time. Desconto sem limite, parcelas editáveis e modelo DOCX padrão embutido.")
+
+    # ----------------- DADOS DO ORÇAMENTO -----------------
+    # Formulário: digitar nos campos não roda a página; só "Aplicar dados" (ou Enter)
+    st.markdown("### Dados do orçamento")
+    with st.form("dados_orcamento", border=False):
+        cA, cB = st.columns(2)
+        with cA:
+            nome_cliente = st.text_input("Nome do cliente", placeholder="Ex.: Prof. João Silva", key="cliente")
+        with cB:
+            consultor = st.text_input("Consultor", placeholder="Ex.: Lucas Martins", key="consultor")
+        observacoes = st.text_area(
+            "Observações (opcional)",
+            placeholder="Ex.: Valores válidos por 7 dias. Entrega estimada conforme cronograma.",
+        )
+        st.form_submit_button("Aplicar dados")
+    # nomes já usados em outros orçamentos (fora do form: clicar troca o texto do campo)
+    nomes.sugestoes("cliente", "cliente")
+    nomes.sugestoes("consultor", "consultor")
+
+    # ----------------- ENTRADAS -----------------
+    st.markdown("### Entradas de cálculo")
+    enviados = st.file_uploader("Manuscrito (opcional): conta as palavras e preenche o campo abaixo",
+                                type=list(manuscritos.FORMATOS), accept_multiple_files=True, key="manuscrito")
+    if enviados:
+        with st.spinner("Contando palavras..."):
+            contagens, erros = manuscritos.contar_enviados(
+                enviados, st.session_state.setdefault("manuscrito_contagens", {}))
+        for nome, erro in erros:
+            st.error(f"{nome}: {erro}")
+        if contagens:
+            total_palavras = sum(c.palavras for c in contagens)
+            # só preenche quando os arquivos mudam: depois o consultor pode ajustar o número
+            assinatura = tuple(c.hash for c in contagens)
+            if st.session_state.get("manuscrito_aplicado") != assinatura:
+                st.session_state["palavras"] = total_palavras
+                st.session_state["manuscrito_aplicado"] = assinatura
+            st.caption(f"{br_int(total_palavras)} palavras em {len(contagens)} arquivo(s): "
+                       + ", ".join(f"{c.nome} ({br_int(c.palavras)})" for c in contagens))
+    else:
+        st.session_state.pop("manuscrito_aplicado", None)
+
+    st.session_state.setdefault("palavras", 30000)
+    colI, colII = st.columns(2)
+    with colI:
+        palavras = st.number_input("Contagem de palavras", min_value=0, step=100, key="palavras")
+    with colII:
+        valor_palavra = st.number_input("Valor por palavra (R$)", min_value=0.00, step=0.01, value=valor_palavra_padrao, format="%.2f")
+
+    st.markdown("### Desconto e parcelamento")
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        aplicar_desconto = st.toggle("Aplicar desconto?", value=True)
+    with c2:
+        taxa_desconto_pct = st.number_input("% de desconto", min_value=0.0, max_value=100.0, value=20.0, step=1.0, format="%.1f")
+    with c3:
+        num_parcelas = st.number_input("Nº de parcelas (1 a 6)", min_value=1, max_value=6, value=4, step=1)
+
+    prazo_dias = config.atual().prazo_dias
+
+    # ----------------- CÁLCULOS -----------------
+    calc = revisao.calcular(palavras, valor_palavra, taxa_desconto_pct, num_parcelas, aplicar_desconto)
+    preco_base = calc["preco_base"]
+    valor_desconto = calc["valor_desconto"]
+    preco_final = calc["preco_final"]
+    parcelamento_texto = calc["parcelamento_texto"]
+
+    data_orcamento, data_entrega = revisao.datas(prazo_dias=prazo_dias)
+
+    # ----------------- RESULTADOS -----------------
+    st.subheader("Resultados")
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Preço base", br_money(preco_base))
+    m2.metric("Desconto aplicado?", "Sim" if aplicar_desconto and taxa_desconto_pct > 0 else "Não")
+    m3.metric("Preço final", br_money(preco_final))
+
+    st.write(f"**Data do orçamento:** {data_orcamento}")
+    st.write(f"**% de desconto aplicado:** {taxa_desconto_pct if aplicar_desconto else 0:.1f}%")
+    st.write(f"**Valor do desconto:** {br_money(valor_desconto)}")
+    st.write(f"**Parcelamento:** {parcelamento_texto}")
+    st.write(f"**Prazo estimado:** {prazo_dias} dias (até {data_entrega})")
+
+    st.divider()
+
+    # ----------------- SCRIPT (para copiar – não vai para o DOCX por padrão) -----------------
+    script = revisao.montar_script(calc, nome_cliente, consultor, observacoes,
+                                  data_orcamento, data_entrega, prazo_dias)
+
+    st.subheader("Copiar e enviar (WhatsApp/CRM)")
+    st.text_area("Script de venda (não vai para o DOCX por padrão)", script, height=220)
+
+    st.divider()
+
+    # ----------------- DOCX/PDF -----------------
+    st.subheader("Gerar orçamento (DOCX/PDF)")
+
+    # 1) Escolha do modelo
+    modelo_opcao = st.radio(
+        "Escolha o modelo:",
+        ["Usar modelo padrão (embutido)", "Enviar meu modelo .docx"],
+        horizontal=True,
+    )
+
+    modelo_bytes = None
+    modelo_hash = None
+
+    if modelo_opcao == "Usar modelo padrão (embutido)":
+        if MODELO_PADRAO_PATH.exists():
+            modelo_bytes, modelo_hash = ler_arquivo(MODELO_PADRAO_PATH)
+            st.success("Usando o modelo padrão embutido (logo/identidade já no arquivo).")
+        else:
+            st.error("Arquivo 'modelo_dialetica.docx' não encontrado no app. Envie seu modelo abaixo ou adicione ao repositório.")
+    else:
+        up = st.file_uploader("Envie um modelo .docx com placeholders compatíveis", type=["docx"])
+        if up:
+            # hash e análise uma vez por arquivo; sessões com o mesmo arquivo dividem uma cópia
+            try:
+                ref = uploads.abrir(up, st.session_state.get("modelo_upload"))
+                st.session_state["modelo_upload"] = ref
+                faltando = placeholders_sem_valor(ref.dados, ref.hash, revisao.CHAVES_CONTEXTO)
+            except Exception as e:
+                st.error(f"Modelo inválido (arquivo ou placeholders): {e}")
+            else:
+                modelo_bytes, modelo_hash = ref.dados, ref.hash
+                if faltando:
+                    st.warning("Placeholders do modelo que esta calculadora não preenche (ficarão em branco): "
+                               + ", ".join(faltando))
+                else:
+                    st.success("Modelo enviado: todos os placeholders serão preenchidos.")
+        else:
+            st.session_state.pop("modelo_upload", None)
+
+    # Contexto para o template
+    contexto = revisao.montar_contexto(calc, nome_cliente, consultor, observacoes,
+                                       data_orcamento, data_entrega, prazo_dias)
+    secao_documento(modelo_bytes, modelo_hash, contexto, script, int(precos.centavos(calc["preco_final"])),
+                    modelo_opcao == "Usar modelo padrão (embutido)")
+
+    st.divider()
+
+    # ----------------- LOTE (planilha → ZIP) -----------------
+    st.subheader("Orçamentos em lote (CSV/XLSX → ZIP)")
+    st.caption(
+        "Colunas: " + ", ".join(lote.COLUNAS) + ". Colunas vazias usam os valores desta tela "
+        "(valor por palavra, % de desconto e nº de parcelas). Usa o mesmo modelo escolhido acima."
+    )
+
+    secao_lote(modelo_bytes, {
+        "valor_palavra": float(valor_palavra),
+        "desconto": float(taxa_desconto_pct) if aplicar_desconto else 0.0,
+        "parcelas": int(num_parcelas),
+    })
+
+    # UI já desenhada: carrega docxtpl e o modelo padrão em segundo plano
+    processos.aquecer([MODELO_PADRAO_PATH])
+    nomes.aquecer()
+
+    diagnostico.painel()
+    desempenho.fim_rerun("revisao", _t0_rerun)
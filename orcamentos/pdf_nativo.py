@@ -0,0 +1,367 @@
+# orcamentos/pdf_nativo.py
+"""Orçamentos em PDF gerados direto do contexto, sem DOCX nem LibreOffice/Word.
+
+Os layouts de Revisão, ELIV (Comum e Universidade) e VLA são fixos: aqui cada
+um é uma lista de linhas (texto com os mesmos placeholders do modelo .docx,
+tamanho, alinhamento) desenhada com o fpdf2 sobre as faixas de cabeçalho e
+rodapé do modelo_dialetica.docx, nas mesmas medidas da página A4 do Word.
+
+O que é caro fica pronto uma vez por processo (``preparar``):
+
+- a fonte (DejaVu Sans, Liberation Sans ou Arial, o que houver; ou o .ttf de
+  ORCAMENTO_PDF_FONTE e ORCAMENTO_PDF_FONTE_NEGRITO) é reduzida aos caracteres
+  do Windows-1252 e gravada em dados/pdf_nativo/: ler a fonte inteira custa
+  ~130 ms por documento, a reduzida ~5 ms. Sem nenhum .ttf, usa a Helvetica
+  embutida no leitor de PDF;
+- as faixas (PNG) são lidas do .docx uma vez e ficam na memória.
+
+Cada PDF leva algumas dezenas de ms, roda no pool de ``processos`` (como o
+render do DOCX) e vai para ``cache_saida``. Caracteres fora da fonte (emojis)
+são removidos. ORCAMENTO_PDF_NATIVO=0 volta para a conversão do DOCX.
+"""
+import datetime
+import functools
+import hashlib
+import importlib.util
+import io
+import os
+import re
+import threading
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from orcamentos import cache_saida, desempenho, processos
+
+RAIZ = Path(__file__).resolve().parent.parent
+DIRETORIO = RAIZ / "dados" / "pdf_nativo"
+MODELO_BANNERS = RAIZ / "modelo_dialetica.docx"
+ATIVO = os.environ.get("ORCAMENTO_PDF_NATIVO", "1") != "0"
+
+# Caracteres que a fonte reduzida cobre (Windows-1252, mais a seta dos modelos ELIV)
+CARACTERES = bytes(range(0x20, 0x100)).decode("cp1252", errors="ignore") + "→"
+
+_FONTES_CONHECIDAS = (
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+     "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf"),
+    ("C:/Windows/Fonts/arial.ttf", "C:/Windows/Fonts/arialbd.ttf"),
+    ("/Library/Fonts/Arial.ttf", "/Library/Fonts/Arial Bold.ttf"),
+)
+
+# Página A4 do modelo_dialetica.docx (mm): margens e faixas de cabeçalho/rodapé
+MARGEM_ESQ, MARGEM_DIR = 30.0, 20.0
+TOPO = 48.0  # abaixo da faixa do cabeçalho
+CABECALHO = (0.0, 0.0, 214.1)  # x, y, largura (a altura sai da proporção do PNG)
+RODAPE = (0.0, 261.2, 185.5)
+MARGEM_INF = 297.0 - RODAPE[1] + 4.0
+PT = 25.4 / 72  # mm por ponto
+ENTRELINHA = 1.15
+RECUO_MARCADOR, DESLOC_MARCADOR = 12.7, 6.35  # lista com marcador do Word (0,5" e 0,25")
+DATA_FIXA = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)  # mesma entrada, mesmos bytes
+
+
+@dataclass(frozen=True)
+class Linha:
+    texto: str = ""  # ``str.format`` com o contexto; vazio = linha em branco
+    tamanho: float = 12
+    negrito: bool = False
+    alinhar: str = "L"  # L, R, C ou J
+    marcador: bool = False
+    se: str | None = None  # só entra se o contexto tiver esta chave preenchida
+
+
+_VALIDADE = Linha("Validade da proposta: 15 dias.")
+
+LAYOUTS: dict[str, tuple[Linha, ...]] = {
+    # modelo_dialetica.docx (contexto de revisao.montar_contexto)
+    "revisao": (
+        Linha(tamanho=20),
+        Linha("Cliente: {nome_cliente}", 20),
+        Linha(tamanho=16),
+        Linha("Data do orçamento: {data_orcamento}", 16, alinhar="R"),
+        Linha(tamanho=16),
+        Linha("Contagem de palavras: {palavras}", 16, marcador=True),
+        Linha(tamanho=16),
+        Linha("Preço base: {preco_base}", 16, marcador=True),
+        Linha(tamanho=16),
+        Linha("Desconto: {desconto_percent}", 16, marcador=True),
+        Linha("Valor final: {preco_final}", 20, marcador=True),
+        Linha(tamanho=16),
+        Linha("Parcelado em {num_parcelas}x:  {valor_parcela}", 16, marcador=True),
+        Linha(tamanho=16),
+        Linha("Prazo estimado para a entrega do serviço a partir da data atual: {prazo_dias} dias "
+              "(até {data_entrega})", 14, marcador=True),
+        Linha(tamanho=16),
+        Linha("Consultor(a): {consultor}", 16),
+        Linha("Observações: {observacoes}", 16),
+        Linha("Submeta seu texto agora: https://plataforma.editoradialetica.com/auth/login", 16),
+        Linha(se="script"),
+        Linha("{script}", 11, se="script"),
+    ),
+    # templates/ELIV_Comum.docx (eliv.contexto_comum)
+    "eliv_comum": (
+        Linha("ORÇAMENTO PARA PUBLICAÇÃO", negrito=True, alinhar="C"),
+        Linha("Data: {data}", alinhar="R"),
+        Linha(),
+        Linha(),
+        Linha("Cliente: {cliente}", alinhar="J"),
+        Linha("Consultor: {consultor}", alinhar="J"),
+        Linha(),
+        Linha("Obra: “{obra}” — {paginas} páginas.", alinhar="J"),
+        Linha(),
+        Linha("Pacote selecionado: {pacote}", alinhar="J"),
+        Linha("Forma de pagamento: {forma_pag}", alinhar="J"),
+        Linha(),
+        Linha("Preço de Capa: {preco_lista}", alinhar="J"),
+        Linha("Desconto aplicado: {desc_pac_pct} → {valor_com_desconto}", alinhar="J"),
+        Linha("Parcelado: 6x de {mensal_final}", alinhar="J", se="mensal_final"),
+        Linha(),
+        Linha("Observações:", alinhar="J"),
+        Linha("{observacoes}", alinhar="J"),
+        Linha(),
+        _VALIDADE,
+    ),
+    # templates/ELIV_Universidade.docx (eliv.contexto_universidade)
+    "eliv_universidade": (
+        Linha("ORÇAMENTO PARA PUBLICAÇÃO", negrito=True, alinhar="C"),
+        Linha(),
+        Linha("Data: {data}", alinhar="R"),
+        Linha(),
+        Linha("Instituição: {universidade}"),
+        Linha("Contato: {contato}"),
+        Linha("Autor(a)/Responsável: {autor}"),
+        Linha(),
+        Linha("Obra: “{obra}” — {paginas} páginas"),
+        Linha("Pacote: {pacote} | {forma_pag}"),
+        Linha(),
+        Linha("Preço de lista: {preco_lista}"),
+        Linha("Desconto no pacote: {desc_pac_pct} → {valor_com_desconto}"),
+        Linha("Parcelado: 6x de {mensal_final}", se="mensal_final"),
+        Linha(),
+        Linha("Preço de capa (físico): {preco_capa}"),
+        Linha("Desconto da universidade: {desc_tiragem_pct} → Unitário: {preco_unitario}"),
+        Linha("Tiragem: {tiragem_qtd} un. | Total da tiragem: {total_tiragem}"),
+        Linha(),
+        Linha("Preço do e-book: {ebook_preco}"),
+        Linha(),
+        Linha("Custo total (editoração + tiragem): {total_geral}"),
+        Linha(),
+        Linha("* O preço de capa é estimativo e pode mudar após a diagramação."),
+        Linha("* A tiragem deve ser contratada ao final do processo de publicação."),
+        Linha(),
+        _VALIDADE,
+    ),
+    # Calculadora VLA (vla.montar_contexto); não há modelo .docx
+    "vla": (
+        Linha("ORÇAMENTO DE TIRAGEM", negrito=True, alinhar="C"),
+        Linha(),
+        Linha("Data: {data}", alinhar="R"),
+        Linha(),
+        Linha("Autor(a): {cliente}"),
+        Linha("Consultor: {consultor}"),
+        Linha(),
+        Linha("Tipo de livro: {tipo}"),
+        Linha("Preço de capa: {preco_capa}"),
+        Linha("Tiragem: {qtd} un."),
+        Linha("Desconto aplicado (política): {desconto_pct}"),
+        Linha(),
+        Linha("Total a pagar: {total}", negrito=True),
+        Linha("Valor unitário: {unitario}"),
+        Linha("Parcelado: {parcelas}x sem juros de {parcela}"),
+        Linha("Frete: {frete}"),
+    ),
+}
+
+TITULOS = {
+    "revisao": "Orçamento de Revisão",
+    "eliv_comum": "Orçamento para Publicação",
+    "eliv_universidade": "Orçamento para Publicação (Universidade)",
+    "vla": "Orçamento de Tiragem",
+}
+
+
+def disponivel() -> bool:
+    """fpdf2 instalado e geração nativa ligada (sem importar o fpdf)."""
+    return ATIVO and importlib.util.find_spec("fpdf") is not None
+
+
+# ------------------------- recursos (uma vez por processo) -------------------------
+_lock = threading.Lock()
+_recursos: dict | None = None
+
+
+def _apos_fork() -> None:
+    # mesmo caso de modelos._apos_fork: o lock pode ter vindo preso no fork
+    global _lock
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_apos_fork)
+
+
+def _fontes_de_origem() -> tuple[str, str] | None:
+    regular = os.environ.get("ORCAMENTO_PDF_FONTE")
+    if regular:
+        return regular, os.environ.get("ORCAMENTO_PDF_FONTE_NEGRITO") or regular
+    for regular, negrito in _FONTES_CONHECIDAS:
+        if os.path.exists(regular):
+            return regular, negrito if os.path.exists(negrito) else regular
+    return None
+
+
+def _reduzir(origem: str) -> Path:
+    """Cópia da fonte só com CARACTERES, gravada uma vez em DIRETORIO (compartilhada entre processos)."""
+    st = os.stat(origem)
+    assinatura = hashlib.sha256(f"{origem}\0{st.st_size}\0{st.st_mtime_ns}\0{CARACTERES}".encode()).hexdigest()
+    destino = DIRETORIO / f"{Path(origem).stem}-{assinatura[:12]}.ttf"
+    if destino.exists():
+        return destino
+    from fontTools import subset
+
+    opcoes = subset.Options()
+    opcoes.drop_tables += ["FFTM"]
+    opcoes.name_IDs = ["*"]  # o fpdf2 lê o nome da fonte da tabela name
+    fonte = subset.load_font(origem, opcoes)
+    redutor = subset.Subsetter(opcoes)
+    redutor.populate(unicodes=map(ord, CARACTERES))
+    redutor.subset(fonte)
+    DIRETORIO.mkdir(parents=True, exist_ok=True)
+    tmp = destino.with_name(f"{destino.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    subset.save_font(fonte, str(tmp), opcoes)
+    os.replace(tmp, destino)
+    return destino
+
+
+def _ler_banners() -> tuple[bytes | None, bytes | None]:
+    try:
+        with zipfile.ZipFile(MODELO_BANNERS) as zf:
+            return zf.read("word/media/image1.png"), zf.read("word/media/image2.png")
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None, None  # PDF sai sem as faixas
+
+
+def preparar() -> dict:
+    """Fontes reduzidas e faixas do cabeçalho/rodapé, carregadas na primeira chamada do processo."""
+    global _recursos
+    with _lock:
+        if _recursos is None:
+            with desempenho.etapa("pdf.nativo.preparar"):
+                origem = _fontes_de_origem()
+                fontes = None
+                if origem:
+                    try:
+                        fontes = {"": str(_reduzir(origem[0])), "B": str(_reduzir(origem[1]))}
+                    except Exception:
+                        fontes = None  # .ttf ilegível: Helvetica
+                cabecalho, rodape = _ler_banners()
+                _classe()  # importa o fpdf
+                _recursos = {"fontes": fontes, "cabecalho": cabecalho, "rodape": rodape}
+        return _recursos
+
+
+@functools.cache
+def _classe():
+    from fpdf import FPDF
+
+    class Documento(FPDF):
+        banners: tuple[bytes | None, bytes | None] = (None, None)
+
+        def header(self):
+            if self.banners[0]:
+                x, y, w = CABECALHO
+                self.image(io.BytesIO(self.banners[0]), x=x, y=y, w=w)
+
+        def footer(self):
+            if self.banners[1]:
+                x, y, w = RODAPE
+                self.image(io.BytesIO(self.banners[1]), x=x, y=y, w=w)
+
+    return Documento
+
+
+# ------------------------- geração -------------------------
+class _Contexto(dict):
+    def __missing__(self, chave):
+        return ""  # como o docxtpl: placeholder sem valor sai em branco
+
+
+# mesma faixa de CARACTERES, em intervalos (a classe com os 224 caracteres leva ms para compilar)
+_FORA_DA_FONTE = re.compile("[^\n\x20-\x7f\xa0-\xff"
+                            + re.escape(bytes(range(0x80, 0xa0)).decode("cp1252", errors="ignore")) + "→]")
+_ESPACO_INICIAL = re.compile(r"^[ \t]+", re.MULTILINE)
+
+
+def _limpar(texto: str, com_ttf: bool) -> str:
+    texto = _ESPACO_INICIAL.sub("", _FORA_DA_FONTE.sub("", texto))
+    return texto if com_ttf else texto.replace("→", "->")
+
+
+def _gerar(layout: str, contexto: dict) -> bytes:
+    """Monta o PDF (roda no processo do pool)."""
+    recursos = preparar()
+    fontes = recursos["fontes"]
+    with desempenho.etapa("pdf.nativo"):
+        pdf = _classe()(format="A4", unit="mm")
+        pdf.banners = (recursos["cabecalho"], recursos["rodape"])
+        pdf.set_margins(MARGEM_ESQ, TOPO, MARGEM_DIR)
+        pdf.set_auto_page_break(True, margin=MARGEM_INF)
+        pdf.set_creation_date(DATA_FIXA)
+        pdf.set_title(TITULOS[layout])
+        pdf.set_author("Editora Dialética")
+        if fontes:
+            familia = "texto"
+            # cada fonte adicionada é reduzida de novo no output(): negrito só se o layout usa
+            negrito = any(linha.negrito for linha in LAYOUTS[layout])
+            for estilo, caminho in fontes.items():
+                if estilo == "" or negrito:
+                    pdf.add_font(familia, estilo, caminho)
+        else:
+            familia = "helvetica"
+            pdf.core_fonts_encoding = "windows-1252"
+        pdf.add_page()
+
+        valores = _Contexto(contexto)
+        for linha in LAYOUTS[layout]:
+            if linha.se and not contexto.get(linha.se):
+                continue
+            altura = linha.tamanho * PT * ENTRELINHA
+            texto = _limpar(linha.texto.format_map(valores), fontes is not None).strip()
+            if not texto:
+                pdf.ln(altura)
+                continue
+            pdf.set_font(familia, "B" if linha.negrito else "", linha.tamanho)
+            if linha.marcador:
+                pdf.set_x(pdf.l_margin + RECUO_MARCADOR - DESLOC_MARCADOR)
+                pdf.cell(DESLOC_MARCADOR, altura, "•")
+            pdf.multi_cell(0, altura, texto, align=linha.alinhar, new_x="LMARGIN", new_y="NEXT")
+        return bytes(pdf.output())
+
+
+def _versao(layout: str) -> str:
+    """Entra na chave do cache: mudar o layout ou a fonte não devolve PDFs antigos."""
+    return hashlib.sha256(f"{layout}\0{LAYOUTS[layout]!r}\0{_fontes_de_origem()}".encode()).hexdigest()
+
+
+def gerar(layout: str, contexto: dict, espera: float | None = processos.ESPERA_S) -> bytes:
+    """PDF do orçamento ``layout`` (chave de LAYOUTS) com o ``contexto`` do modelo .docx equivalente.
+
+    Pode levantar ``processos.FilaCheia``, como o render do DOCX.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout desconhecido: {layout}")
+    return cache_saida.obter_ou_gerar(
+        cache_saida.chave(_versao(layout), contexto, "pdf_nativo"),
+        lambda: processos.executar(_gerar, layout, contexto, espera=espera, etapa="pdf.processo"),
+    )
+
+
+def gerar_sem_cache(layout: str, contexto: dict) -> bytes:
+    """Os mesmos bytes de ``gerar``, montados neste processo, sem cache_saida nem pool.
+
+    Para quem já roda num processo próprio (lote JSONL) ou quer medir só a montagem (bench).
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout desconhecido: {layout}")
+    return _gerar(layout, contexto)
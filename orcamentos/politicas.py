@@ -0,0 +1,79 @@
+# orcamentos/politicas.py
+"""Políticas de desconto por quantidade (VLA), compiladas em tabelas de faixas.
+
+Cada política é validada e compilada uma única vez num array ordenado com o
+início de cada faixa. A consulta de uma quantidade é uma busca binária
+(``bisect``) e a versão vetorizada (``np.searchsorted``) responde milhões de
+quantidades de uma vez. O texto da política exibido na tela sai da mesma
+tabela, então texto e conta não têm como divergir.
+
+As faixas de cada política ficam em precificacao.toml (ver ``config``).
+"""
+from bisect import bisect_right
+
+import numpy as np
+
+
+class PoliticaInvalida(ValueError):
+    pass
+
+
+class TabelaDescontos:
+    """Política compilada: ``inicios[i]`` é a menor quantidade da faixa ``i``."""
+
+    __slots__ = ("nome", "inicios", "fins", "pcts", "_inicios_np", "_pcts_np")
+
+    def __init__(self, nome: str, faixas: list[dict]):
+        self.nome = nome
+        faixas = sorted(faixas, key=lambda f: f["min"])
+        if not faixas:
+            raise PoliticaInvalida(f"Política '{nome}' sem faixas.")
+        if faixas[0]["min"] != 1:
+            raise PoliticaInvalida(f"Política '{nome}': a primeira faixa deve começar em 1, não em {faixas[0]['min']}.")
+        for atual, prox in zip(faixas, faixas[1:]):
+            if atual["max"] is None or atual["max"] >= prox["min"]:
+                raise PoliticaInvalida(f"Política '{nome}': faixas sobrepostas em {atual['min']}–{atual['max']} e {prox['min']}.")
+            if atual["max"] + 1 != prox["min"]:
+                raise PoliticaInvalida(f"Política '{nome}': lacuna entre {atual['max']} e {prox['min']}.")
+        for f in faixas:
+            if f["max"] is not None and f["max"] < f["min"]:
+                raise PoliticaInvalida(f"Política '{nome}': faixa {f['min']}–{f['max']} invertida.")
+            if not 0 <= f["pct"] <= 100:
+                raise PoliticaInvalida(f"Política '{nome}': desconto {f['pct']}% fora de 0–100.")
+        if faixas[-1]["max"] is not None:
+            raise PoliticaInvalida(f"Política '{nome}': a última faixa deve ser aberta (max = None).")
+
+        self.inicios = tuple(int(f["min"]) for f in faixas)
+        self.fins = tuple(f["max"] for f in faixas)
+        self.pcts = tuple(float(f["pct"]) for f in faixas)
+        self._inicios_np = np.asarray(self.inicios, dtype=np.int64)
+        self._pcts_np = np.asarray(self.pcts, dtype=np.float64)
+
+    def pct(self, qtd: int) -> float:
+        """Desconto (%) para uma quantidade, em O(log n)."""
+        i = bisect_right(self.inicios, qtd) - 1
+        if i < 0:
+            raise ValueError(f"Quantidade {qtd} abaixo da primeira faixa ({self.inicios[0]}).")
+        return self.pcts[i]
+
+    def pcts_vetor(self, qtds) -> np.ndarray:
+        """Descontos (%) para um array de quantidades (>= 1)."""
+        qtds = np.asarray(qtds, dtype=np.int64)
+        if qtds.size and qtds.min() < self.inicios[0]:
+            raise ValueError(f"Quantidades abaixo da primeira faixa ({self.inicios[0]}).")
+        return self._pcts_np[np.searchsorted(self._inicios_np, qtds, side="right") - 1]
+
+    def descricao(self) -> str:
+        """Texto da política, ex.: "50–99: 20%, ..., 1000+: 50%" (faixas sem desconto omitidas)."""
+        partes = []
+        for lo, hi, pct in zip(self.inicios, self.fins, self.pcts):
+            if pct == 0:
+                continue
+            faixa = f"{lo}+" if hi is None else f"{lo}–{hi}"
+            partes.append(f"{faixa}: {pct:g}%")
+        return ", ".join(partes)
+
+
+def pct_por_qtd(qtd: int, politica: str) -> float:
+    from orcamentos import config  # config importa este módulo
+    return config.atual().tabelas[politica].pct(qtd)
@@ -0,0 +1,90 @@
+# orcamentos/precos.py
+"""Motor de preços vetorizado (NumPy), compartilhado pelas três calculadoras.
+
+Todas as funções aceitam escalares ou arrays (com broadcasting) e devolvem
+dicts de arrays int64 em CENTAVOS, de modo que somas de lotes são exatas.
+Percentuais são tratados em pontos-base (20,5% → 2050) e os arredondamentos
+são "meio para cima", como na conta feita à mão.
+
+    >>> r = revisao(palavras=[30000, 1000], valor_palavra=0.03, desconto_pct=20, parcelas=4)
+    >>> r["preco_final"]
+    array([72000,  2400])
+"""
+import numpy as np
+
+# valor por palavra aceita até 4 casas decimais (R$0,0325)
+_ESCALA_PALAVRA = 10_000
+
+
+def centavos(reais) -> np.ndarray:
+    return np.rint(np.asarray(reais, dtype=np.float64) * 100).astype(np.int64)
+
+
+def reais(cent) -> float | np.ndarray:
+    """Centavos → reais (float), só para exibição."""
+    r = np.asarray(cent, dtype=np.float64) / 100
+    return float(r) if r.ndim == 0 else r
+
+
+def _pontos_base(pct) -> np.ndarray:
+    return np.rint(np.asarray(pct, dtype=np.float64) * 100).astype(np.int64)
+
+
+def _dividir(a, b) -> np.ndarray:
+    """Divisão inteira arredondando meio para cima (a >= 0, b > 0)."""
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    return (2 * a + b) // (2 * b)
+
+
+def aplicar_pct(valor_cent, pct) -> np.ndarray:
+    """Parcela ``pct``% de um valor em centavos."""
+    return _dividir(np.asarray(valor_cent, dtype=np.int64) * _pontos_base(pct), 10_000)
+
+
+def revisao(palavras, valor_palavra, desconto_pct, parcelas) -> dict[str, np.ndarray]:
+    """Revisão por palavra: preço base, desconto, preço final e parcela."""
+    palavras = np.asarray(palavras, dtype=np.int64)
+    valor = np.rint(np.asarray(valor_palavra, dtype=np.float64) * _ESCALA_PALAVRA).astype(np.int64)
+    preco_base = _dividir(palavras * valor, _ESCALA_PALAVRA // 100)
+    valor_desconto = aplicar_pct(preco_base, desconto_pct)
+    preco_final = preco_base - valor_desconto
+    parcelas = np.asarray(parcelas, dtype=np.int64)
+    valor_parcela = np.where(preco_final > 0, _dividir(np.maximum(preco_final, 0), parcelas), 0)
+    return {
+        "preco_base": preco_base,
+        "valor_desconto": valor_desconto,
+        "preco_final": preco_final,
+        "valor_parcela": valor_parcela,
+    }
+
+
+def vla(preco_capa, qtd, desconto_pct, parcelas) -> dict[str, np.ndarray]:
+    """Tiragem VLA: bruto, desconto, total, unitário e parcela."""
+    qtd = np.asarray(qtd, dtype=np.int64)
+    bruto = centavos(preco_capa) * qtd
+    desconto = aplicar_pct(bruto, desconto_pct)
+    total = bruto - desconto
+    unitario = np.where(qtd > 0, _dividir(total, np.maximum(qtd, 1)), 0)
+    parcela = _dividir(total, parcelas)
+    return {"bruto": bruto, "desconto": desconto, "total": total,
+            "unitario": unitario, "parcela": parcela}
+
+
+def eliv_pacote(preco_lista, desconto_pct, parcelas) -> dict[str, np.ndarray]:
+    """Pacote ELIV: total com desconto e mensalidade."""
+    lista = centavos(preco_lista)
+    total = lista - aplicar_pct(lista, desconto_pct)
+    return {"lista": lista, "total_com_desc": total, "mensal": _dividir(total, parcelas)}
+
+
+def eliv_tiragem(preco_capa, qtd, desconto_pct) -> dict[str, np.ndarray]:
+    """Tiragem da universidade: unitário com desconto e total (= unitário × qtd)."""
+    capa = centavos(preco_capa)
+    unitario = capa - aplicar_pct(capa, desconto_pct)
+    return {"unitario_desc": unitario, "total_tiragem": unitario * np.asarray(qtd, dtype=np.int64)}
+
+
+def escalar(resultado: dict[str, np.ndarray]) -> dict[str, int]:
+    """Converte o resultado de uma única cotação em ints do Python."""
+    return {k: int(v) for k, v in resultado.items()}
@@ -0,0 +1,194 @@
+# orcamentos/processos.py
+"""Renderização de DOCX num pool de processos, fora do GIL do servidor.
+
+O Streamlit roda o script de cada sessão numa thread do mesmo processo, e
+``DocxTemplate.render`` + ``save`` é trabalho Python/lxml que segura o GIL: um
+documento grande deixava os reruns de todas as outras sessões lentos. Aqui o
+render vai para ORCAMENTO_RENDER_PROCESSOS processos (padrão: até 4, um por
+CPU), com prioridade menor que a do servidor (``nice``), e a thread da sessão
+só espera o resultado.
+
+Os processos são criados com ``fork``, todos de uma vez no primeiro uso: o
+Streamlit troca ``__main__`` pelo script da página, e com ``spawn``/``forkserver``
+cada filho rodaria a página de novo ao iniciar. Onde não há ``fork`` (Windows)
+o padrão é 0 processos.
+
+Admissão: no máximo ORCAMENTO_RENDER_FILA documentos em voo (padrão 2 por
+processo). Um pedido novo espera até ``espera`` segundos por uma vaga e depois
+recebe ``FilaCheia`` (as páginas mostram o aviso; a API responde 503). Os lotes
+passam ``espera=None`` e apenas aguardam a vez.
+
+O cache de saída (``cache_saida``) continua no processo principal: um acerto
+não passa pelo pool. Cada processo tem o seu próprio cache de modelos
+interpretados (``modelos``) e as fontes do ``pdf_nativo``, aquecidos por
+``aquecer``. Com ORCAMENTO_RENDER_PROCESSOS=0 tudo roda na própria thread,
+como antes.
+
+Com uma CPU só (``ISOLA`` falso) o pool não isola: o processo de render disputa
+o mesmo núcleo com o servidor e só o ``nice`` segura a latência. Medido com 4
+renders simultâneos numa máquina de 1 CPU: p95 dos reruns entre 1,0x e 3x o de
+base, conforme o escalonador (com os renders em threads, ~5x). Por isso
+``tools/carga_render.py`` e o teste de latência só exigem o p95 estável com 2
+ou mais CPUs.
+"""
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from orcamentos import cache_saida, desempenho, modelos
+
+_TEM_FORK = "fork" in multiprocessing.get_all_start_methods()
+PROCESSOS = int(os.environ.get("ORCAMENTO_RENDER_PROCESSOS",
+                               str(min(4, os.cpu_count() or 1)) if _TEM_FORK else "0"))
+MAX_EM_VOO = int(os.environ.get("ORCAMENTO_RENDER_FILA", str(2 * max(PROCESSOS, 1))))
+ESPERA_S = float(os.environ.get("ORCAMENTO_RENDER_ESPERA", "10"))
+TIMEOUT_S = float(os.environ.get("ORCAMENTO_RENDER_TIMEOUT", "60"))
+NICE = int(os.environ.get("ORCAMENTO_RENDER_NICE", "5"))
+# o render sai do núcleo do servidor: só com processos e mais de uma CPU
+ISOLA = PROCESSOS > 0 and (os.cpu_count() or 1) >= 2
+
+
+class FilaCheia(RuntimeError):
+    """Documentos demais sendo gerados; tente de novo em instantes."""
+
+
+_vagas = threading.BoundedSemaphore(MAX_EM_VOO)
+_em_voo = 0
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_aquecidos: set[str] = set()
+
+
+# ------------------------- dentro do processo filho -------------------------
+def _iniciar_processo() -> None:
+    desempenho.ATIVO = False  # métricas do filho não chegariam ao painel nem ao /metricas
+    if NICE and hasattr(os, "nice"):
+        os.nice(NICE)
+    importlib.import_module("docxtpl")  # primeiro render do processo já sai quente
+
+
+def _renderizar_no_processo(dados: bytes, contexto: dict, h: str) -> bytes:
+    return modelos.renderizar(dados, contexto, h, usar_cache=False)
+
+
+def _aquecer_no_processo(caminhos: list[str]) -> None:
+    from orcamentos import pdf_nativo  # importa este módulo: não pode ir no topo
+
+    for caminho in caminhos:
+        try:
+            dados, h = modelos.ler_arquivo(caminho)
+            modelos._obter_original(dados, h)
+        except Exception:
+            pass  # o erro aparece (e na tela) quando o usuário gerar o documento
+    if pdf_nativo.disponivel():
+        try:
+            pdf_nativo.preparar()
+        except Exception:
+            pass
+
+
+# ------------------------- no processo do servidor -------------------------
+def _obter_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(PROCESSOS, mp_context=multiprocessing.get_context("fork"),
+                                        initializer=_iniciar_processo)
+        return _pool
+
+
+def _descartar_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _liberar_vaga() -> None:
+    global _em_voo
+    with _pool_lock:
+        _em_voo -= 1
+    _vagas.release()
+
+
+def _no_pool(fn, args: tuple, espera: float | None, etapa: str = "render.processo"):
+    global _em_voo
+    t0 = time.perf_counter()
+    if not _vagas.acquire(timeout=espera):
+        desempenho.contar("render.recusado")
+        raise FilaCheia("Muitos documentos sendo gerados agora; tente de novo em instantes.")
+    desempenho.registrar_etapa("render.fila", (time.perf_counter() - t0) * 1000)
+    with _pool_lock:
+        _em_voo += 1
+    pool = _obter_pool()
+    try:
+        fut = pool.submit(fn, *args)
+    except BaseException:
+        _liberar_vaga()
+        raise
+    # a vaga só volta quando o processo termina (mesmo se quem pediu desistir no timeout)
+    fut.add_done_callback(lambda _: _liberar_vaga())
+    try:
+        with desempenho.etapa(etapa):
+            return fut.result(timeout=TIMEOUT_S)
+    except BrokenProcessPool:
+        _descartar_pool(pool)  # um filho morreu (ex.: memória): o próximo pedido cria outro pool
+        raise
+
+
+def renderizar(dados: bytes, contexto: dict, h: str | None = None, usar_cache: bool = True,
+               espera: float | None = ESPERA_S) -> bytes:
+    """Como ``modelos.renderizar``, mas o render roda no pool de processos.
+
+    ``espera``: segundos aguardando vaga antes de ``FilaCheia`` (None = sem limite).
+    """
+    if PROCESSOS <= 0:
+        return modelos.renderizar(dados, contexto, h, usar_cache)
+    h = h or modelos.hash_bytes(dados)
+    # bytes(): o modelo pode ser um mmap de upload, que não vai por pickle
+    args = (bytes(dados), contexto, h)
+    if usar_cache:
+        return cache_saida.obter_ou_gerar(cache_saida.chave(h, contexto),
+                                          lambda: _no_pool(_renderizar_no_processo, args, espera))
+    return _no_pool(_renderizar_no_processo, args, espera)
+
+
+def executar(fn, *args, espera: float | None = ESPERA_S, etapa: str = "processo"):
+    """``fn(*args)`` num processo do pool, com a mesma admissão dos renders.
+
+    ``fn`` precisa ser uma função de módulo (vai por pickle). Sem pool, roda aqui.
+    """
+    if PROCESSOS <= 0:
+        return fn(*args)
+    return _no_pool(fn, args, espera, etapa)
+
+
+def aquecer(caminhos: list[Path | str]) -> None:
+    """Sobe os processos e pré-carrega docxtpl e os modelos em cada um (sem bloquear).
+
+    Chamar no fim do script da página, como ``modelos.aquecer_em_segundo_plano``.
+    """
+    if PROCESSOS <= 0:
+        modelos.aquecer_em_segundo_plano(caminhos)
+        return
+    if os.environ.get("ORCAMENTO_AQUECER", "1") == "0":
+        return
+    with _pool_lock:
+        novos = [c for c in map(str, caminhos) if c not in _aquecidos]
+        _aquecidos.update(novos)
+    if not novos:
+        return
+    pool = _obter_pool()
+    for _ in range(PROCESSOS):  # um por processo, em geral (cada um leva ~1 s no primeiro uso)
+        pool.submit(_aquecer_no_processo, novos)
+
+
+def estatisticas() -> dict:
+    return {"processos": PROCESSOS if _pool is not None else 0, "max_em_voo": MAX_EM_VOO,
+            "em_voo": _em_voo, "isola": ISOLA}
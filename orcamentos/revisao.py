@@ -0,0 +1,94 @@
+# orcamentos/revisao.py
+"""Cálculo, contexto do DOCX e script de venda da Revisão (por palavra)."""
+import datetime
+
+from orcamentos import config, precos
+from orcamentos.formatacao import br_int, br_money
+
+# prazo de entrega (dias): precificacao.toml, via config.atual().prazo_dias
+MAX_PARCELAS = 6
+
+
+def calcular(palavras: int, valor_palavra: float, taxa_desconto_pct: float,
+             num_parcelas: int, aplicar_desconto: bool = True) -> dict:
+    r = precos.escalar(precos.revisao(
+        palavras, valor_palavra, taxa_desconto_pct if aplicar_desconto else 0.0, num_parcelas
+    ))
+    preco_base, valor_desconto, preco_final, valor_parcela = (
+        precos.reais(r[k]) for k in ("preco_base", "valor_desconto", "preco_final", "valor_parcela")
+    )
+    return {
+        "palavras": int(palavras),
+        "valor_palavra": float(valor_palavra),
+        "taxa_desconto_pct": float(taxa_desconto_pct),
+        "desconto_aplicado": bool(aplicar_desconto and taxa_desconto_pct > 0),
+        "num_parcelas": int(num_parcelas),
+        "preco_base": preco_base,
+        "valor_desconto": valor_desconto,
+        "preco_final": preco_final,
+        "valor_parcela": valor_parcela,
+        "parcelamento_texto": f"{int(num_parcelas)}x sem juros de {br_money(valor_parcela)} cada",
+    }
+
+
+def datas(hoje: datetime.date | None = None, prazo_dias: int | None = None) -> tuple[str, str]:
+    """(data do orçamento, data de entrega) em dd/mm/aaaa."""
+    hoje = hoje or datetime.date.today()
+    if prazo_dias is None:
+        prazo_dias = config.atual().prazo_dias
+    entrega = hoje + datetime.timedelta(days=prazo_dias)
+    return hoje.strftime("%d/%m/%Y"), entrega.strftime("%d/%m/%Y")
+
+
+def montar_script(calc: dict, nome_cliente: str, consultor: str, observacoes: str,
+                  data_orcamento: str, data_entrega: str, prazo_dias: int | None = None) -> str:
+    if prazo_dias is None:
+        prazo_dias = config.atual().prazo_dias
+    desconto = f"{calc['taxa_desconto_pct']:.1f}%" if calc["desconto_aplicado"] else "— (não aplicado)"
+    return f"""
+Olá! 😊 Segue o orçamento da revisão ortográfica e gramatical (data: {data_orcamento}):
+
+• Cliente: {nome_cliente or "-"}
+• Consultor: {consultor or "-"}
+• Contagem de palavras: {br_int(calc["palavras"])}
+• Preço base: {br_money(calc["preco_base"])}
+• Desconto aplicado: {desconto}
+• Valor do desconto: {br_money(calc["valor_desconto"])}
+• Valor final: {br_money(calc["preco_final"])}
+• Condição de pagamento: {calc["parcelamento_texto"]}
+• Prazo estimado de entrega: {prazo_dias} dias (até {data_entrega})
+
+Observações: {observacoes or "-"}
+""".strip()
+
+
+# Chaves de montar_contexto(), mais "script" quando o script vai dentro do DOCX
+CHAVES_CONTEXTO = frozenset({
+    "data_orcamento", "nome_cliente", "consultor", "observacoes", "palavras", "valor_palavra",
+    "preco_base", "desconto_percent", "valor_desconto", "preco_final", "num_parcelas",
+    "valor_parcela", "parcelamento_texto", "prazo_dias", "data_entrega", "script",
+})
+
+
+def montar_contexto(calc: dict, nome_cliente: str, consultor: str, observacoes: str,
+                    data_orcamento: str, data_entrega: str, prazo_dias: int | None = None) -> dict:
+    """Contexto do modelo_dialetica.docx (mesmas chaves dos placeholders)."""
+    if prazo_dias is None:
+        prazo_dias = config.atual().prazo_dias
+    return {
+        "data_orcamento": data_orcamento,
+        "nome_cliente": nome_cliente,
+        "consultor": consultor,
+        "observacoes": observacoes,
+        "palavras": br_int(calc["palavras"]),
+        "valor_palavra": br_money(calc["valor_palavra"]),
+        "preco_base": br_money(calc["preco_base"]),
+        "desconto_percent": f"{calc['taxa_desconto_pct']:.1f}%" if calc["desconto_aplicado"] else "—",
+        "valor_desconto": br_money(calc["valor_desconto"]),
+        "preco_final": br_money(calc["preco_final"]),
+        "num_parcelas": calc["num_parcelas"],
+        "valor_parcela": br_money(calc["valor_parcela"]),
+        "parcelamento_texto": calc["parcelamento_texto"],
+        "prazo_dias": prazo_dias,
+        "data_entrega": data_entrega,
+    }
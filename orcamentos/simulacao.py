@@ -0,0 +1,209 @@
+# orcamentos/simulacao.py
+"""Simulador VLA: preço de toda tiragem de 1 a QTD_MAX numa passada vetorizada.
+
+Além da curva (total, unitário e parcela por quantidade), resolve as perguntas
+inversas mais comuns dos autores:
+
+- quantos exemplares cabem num orçamento (``max_qtd_no_orcamento``);
+- qual a quantidade mais barata com pelo menos N exemplares
+  (``mais_barata_a_partir_de``), que é onde uma quebra de faixa compensa;
+- em que faixas comprar mais sai mais barato (``quebras``).
+
+Tudo em centavos (int64), como em ``precos``.
+"""
+import csv
+import functools
+import io
+from dataclasses import dataclass
+from typing import IO
+
+import numpy as np
+
+from orcamentos import config, precos
+from orcamentos.politicas import TabelaDescontos
+
+QTD_MAX = 10_000
+
+
+@dataclass(frozen=True)
+class Curva:
+    tipo: str
+    tabela: TabelaDescontos
+    parcelas: int
+    preco_capa: float
+    qtds: np.ndarray        # 1..QTD_MAX
+    pcts: np.ndarray        # desconto (%) de cada quantidade
+    total: np.ndarray       # centavos
+    unitario: np.ndarray
+    parcela: np.ndarray
+    _min_sufixo: np.ndarray  # índice do menor total em qtds[i:] (empate: menor quantidade)
+
+
+def _indices_min_sufixo(total: np.ndarray) -> np.ndarray:
+    # varre de trás para frente: np.minimum.accumulate no array invertido dá o valor,
+    # e o índice é o do primeiro (menor quantidade) que atinge esse mínimo
+    n = len(total)
+    rev = total[::-1]
+    min_rev = np.minimum.accumulate(rev)
+    novo = np.empty(n, dtype=bool)
+    novo[0] = True
+    novo[1:] = rev[1:] <= min_rev[:-1]
+    pos_rev = np.maximum.accumulate(np.where(novo, np.arange(n), 0))
+    return (n - 1 - pos_rev)[::-1].copy()
+
+
+@functools.lru_cache(maxsize=8)
+def _faixas(cfg: config.Config, tipo: str, qtd_max: int) -> tuple[np.ndarray, np.ndarray]:
+    # quantidades e descontos não dependem do preço: uma cópia por política, compartilhada pelas curvas
+    tabela = cfg.tabelas[tipo]
+    if tabela.inicios[-1] > qtd_max:
+        raise ValueError(f"qtd_max ({qtd_max}) precisa alcançar a última faixa ({tabela.inicios[-1]}).")
+    qtds = np.arange(1, qtd_max + 1, dtype=np.int64)
+    pcts = tabela.pcts_vetor(qtds)
+    qtds.flags.writeable = pcts.flags.writeable = False
+    return qtds, pcts
+
+
+# cada curva ocupa ~320 KB (4 arrays de QTD_MAX int64) e o preço de capa é livre: com 64 entradas o cache
+# chegava a ~30 MB por processo (medido com tools/carga_paginas.py); 16 cobrem os preços em uso na hora
+@functools.lru_cache(maxsize=16)
+def _simular(cfg: config.Config, tipo: str, preco_capa: float, qtd_max: int) -> Curva:
+    tabela = cfg.tabelas[tipo]
+    qtds, pcts = _faixas(cfg, tipo, qtd_max)
+    r = precos.vla(preco_capa, qtds, pcts, cfg.vla_parcelas)
+    for v in r.values():
+        v.flags.writeable = False
+    return Curva(tipo, tabela, cfg.vla_parcelas, float(preco_capa), qtds, pcts, r["total"], r["unitario"],
+                 r["parcela"], _indices_min_sufixo(r["total"]))
+
+
+def simular(tipo: str, preco_capa: float, qtd_max: int = QTD_MAX) -> Curva:
+    # a Config entra na chave do cache: trocar o precificacao.toml invalida as curvas
+    return _simular(config.atual(), tipo, float(preco_capa), qtd_max)
+
+
+def simular_todas(preco_capa: float, qtd_max: int = QTD_MAX) -> dict[str, Curva]:
+    cfg = config.atual()
+    return {tipo: _simular(cfg, tipo, float(preco_capa), qtd_max) for tipo in cfg.tabelas}
+
+
+def quebras(curva: Curva) -> list[dict]:
+    """Faixas cujo início custa menos que comprar algumas quantidades abaixo dele.
+
+    ``vale_a_partir_de``: a partir dessa quantidade (até ``inicio - 1``) é mais
+    barato levar ``inicio`` exemplares.
+    """
+    out = []
+    tabela = curva.tabela
+    for inicio, pct in zip(tabela.inicios[1:], tabela.pcts[1:]):
+        i = inicio - 1
+        total = curva.total[i]
+        if total >= curva.total[i - 1]:
+            continue
+        # menor q < inicio com total(q) >= total(inicio): dentro da faixa anterior o total só cresce
+        antes = curva.total[:i]
+        q = int(np.argmax(antes >= total)) + 1
+        out.append({
+            "inicio": inicio,
+            "pct": float(pct),
+            "total_cent": int(total),
+            "total_anterior_cent": int(curva.total[i - 1]),
+            "vale_a_partir_de": q,
+        })
+    return out
+
+
+def mais_barata_a_partir_de(curva: Curva, n: int) -> tuple[int, int]:
+    """(quantidade, total em centavos) mais barata com pelo menos ``n`` exemplares."""
+    n = max(1, int(n))
+    if n > len(curva.qtds):
+        r = precos.escalar(precos.vla(curva.preco_capa, n, curva.tabela.pct(n), curva.parcelas))
+        return n, r["total"]
+    i = int(curva._min_sufixo[n - 1])
+    return int(curva.qtds[i]), int(curva.total[i])
+
+
+def max_qtd_no_orcamento(curva: Curva, orcamento_cent: int) -> tuple[int, int] | None:
+    """(maior quantidade, total) com total <= orçamento; None se nem 1 exemplar cabe.
+
+    Acima da última quantidade simulada o total só cresce (última faixa é
+    aberta), então a resposta além de QTD_MAX sai de uma conta direta.
+    """
+    orcamento_cent = int(orcamento_cent)
+    if curva.total[-1] <= orcamento_cent:
+        pct = curva.tabela.pcts[-1]
+        unit = precos.escalar(precos.vla(curva.preco_capa, 1, pct, 1))["total"]
+        q = max(len(curva.qtds), orcamento_cent // max(unit, 1))
+        # o arredondamento por quantidade pode deslocar alguns centavos: ajusta na vizinhança
+        while precos.escalar(precos.vla(curva.preco_capa, q + 1, pct, 1))["total"] <= orcamento_cent:
+            q += 1
+        while q > len(curva.qtds) and precos.escalar(precos.vla(curva.preco_capa, q, pct, 1))["total"] > orcamento_cent:
+            q -= 1
+        return q, precos.escalar(precos.vla(curva.preco_capa, q, pct, 1))["total"]
+    cabem = np.flatnonzero(curva.total <= orcamento_cent)
+    if not cabem.size:
+        return None
+    i = int(cabem[-1])
+    return int(curva.qtds[i]), int(curva.total[i])
+
+
+def pontos_grafico(curvas: dict[str, Curva], campo: str) -> list[dict]:
+    """Pontos (formato longo: qtd, politica, valor em R$) para desenhar as curvas sem perder forma.
+
+    Dentro de uma faixa o total é linear e o unitário constante: basta o começo
+    e o fim de cada faixa (e a última quantidade), ~20 pontos em vez de 10.000.
+    """
+    qtd_max = len(next(iter(curvas.values())).qtds)
+    marcas = {1, qtd_max}
+    for c in curvas.values():
+        for inicio in c.tabela.inicios[1:]:
+            marcas.update((inicio - 1, inicio))
+    qs = np.asarray(sorted(q for q in marcas if 1 <= q <= qtd_max), dtype=np.int64)
+    pontos = []
+    for tipo, c in curvas.items():
+        valores = precos.reais(getattr(c, campo)[qs - 1]).tolist()
+        pontos.extend({"qtd": q, "politica": tipo, "valor": v} for q, v in zip(qs.tolist(), valores))
+    return pontos
+
+
+# ------------------------- exportação -------------------------
+_BLOCO = 2_000
+
+
+def _colunas(curvas: dict[str, Curva]) -> list[str]:
+    parcelas = next(iter(curvas.values())).parcelas
+    return ["politica", "qtd", "desconto_pct", "total", "unitario", f"parcela_{parcelas}x"]
+
+
+def _linhas(curvas: dict[str, Curva]):
+    """Linhas em blocos (reais com 2 casas), sem montar a tabela inteira em memória."""
+    for tipo, c in curvas.items():
+        for ini in range(0, len(c.qtds), _BLOCO):
+            fim = ini + _BLOCO
+            yield from zip([tipo] * len(c.qtds[ini:fim]), c.qtds[ini:fim].tolist(), c.pcts[ini:fim].tolist(),
+                           (c.total[ini:fim] / 100).tolist(), (c.unitario[ini:fim] / 100).tolist(),
+                           (c.parcela[ini:fim] / 100).tolist())
+
+
+def exportar_csv(curvas: dict[str, Curva], destino: IO[bytes]) -> None:
+    """CSV para Excel BR (``;`` e vírgula decimal), escrito em blocos no arquivo."""
+    texto = io.TextIOWrapper(destino, encoding="utf-8-sig", newline="", write_through=False)
+    w = csv.writer(texto, delimiter=";")
+    w.writerow(_colunas(curvas))
+    for tipo, q, pct, total, unit, parc in _linhas(curvas):
+        w.writerow((tipo, q, f"{pct:g}".replace(".", ","), f"{total:.2f}".replace(".", ","),
+                    f"{unit:.2f}".replace(".", ","), f"{parc:.2f}".replace(".", ",")))
+    texto.flush()
+    texto.detach()  # não fecha o arquivo de destino
+
+
+def exportar_xlsx(curvas: dict[str, Curva], destino: IO[bytes]) -> None:
+    """XLSX em modo write-only do openpyxl (linhas vão direto para o arquivo)."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Simulação VLA")
+    ws.append(_colunas(curvas))
+    for linha in _linhas(curvas):
+        ws.append(linha)
+    wb.save(destino)
@@ -0,0 +1,113 @@
+# orcamentos/uploads.py
+"""Modelos .docx enviados pelos usuários, guardados uma vez só por conteúdo.
+
+Cada upload é identificado pelo SHA-256 dos bytes, calculado uma única vez por
+``file_id`` do Streamlit (reruns não releem nem re-hasheiam o arquivo). O
+conteúdo vai para ORCAMENTO_UPLOADS_DIR (padrão dados/uploads) e é lido por
+``mmap``: dez sessões com o mesmo modelo compartilham uma cópia.
+
+A sessão guarda uma ``Referencia`` (ex.: em ``st.session_state``); quando ela
+é trocada por outro upload ou a sessão acaba, a contagem de referências cai e,
+ao chegar a zero, o mapeamento é fechado e o arquivo removido.
+"""
+import mmap
+import os
+import threading
+import weakref
+from pathlib import Path
+
+from orcamentos.modelos import hash_bytes
+
+DIRETORIO = Path(os.environ.get("ORCAMENTO_UPLOADS_DIR")
+                 or Path(__file__).resolve().parent.parent / "dados" / "uploads")
+
+_lock = threading.RLock()  # _liberar pode rodar (via weakref.finalize) com o lock já tomado
+_blobs: dict[str, "_Blob"] = {}
+_por_file_id: dict[str, str] = {}
+
+
+class _Blob:
+    def __init__(self, h: str, dados: bytes):
+        self.hash = h
+        self.caminho = DIRETORIO / f"{h}.docx"
+        if not self.caminho.exists():
+            DIRETORIO.mkdir(parents=True, exist_ok=True)
+            tmp = self.caminho.with_name(f"{h}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(dados)
+            os.replace(tmp, self.caminho)
+        with open(self.caminho, "rb") as f:
+            self.mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.refs = 0
+
+    def fechar(self) -> None:
+        self.mapa.close()
+        try:
+            self.caminho.unlink()
+        except OSError:
+            pass
+
+
+class Referencia:
+    """Mantém um modelo enviado vivo enquanto a sessão a guardar."""
+
+    def __init__(self, blob: _Blob):
+        self.hash = blob.hash
+        self._blob = blob
+        blob.refs += 1  # chamado com _lock
+        weakref.finalize(self, _liberar, blob.hash)
+
+    @property
+    def dados(self) -> mmap.mmap:
+        """Conteúdo do .docx (somente leitura; aceito onde se espera bytes)."""
+        return self._blob.mapa
+
+    def __len__(self) -> int:
+        return len(self._blob.mapa)
+
+
+def _liberar(h: str) -> None:
+    with _lock:
+        blob = _blobs.get(h)
+        if blob is None:
+            return
+        blob.refs -= 1
+        if blob.refs > 0:
+            return
+        del _blobs[h]
+        for file_id in [k for k, v in _por_file_id.items() if v == h]:
+            del _por_file_id[file_id]
+    blob.fechar()
+
+
+def abrir(arquivo, atual: Referencia | None = None) -> Referencia:
+    """Referência ao upload ``arquivo`` (UploadedFile). Reaproveita ``atual`` se for o mesmo conteúdo."""
+    file_id = getattr(arquivo, "file_id", None)
+    with _lock:
+        h = _por_file_id.get(file_id) if file_id else None
+        if h is not None and h in _blobs:
+            if atual is not None and atual.hash == h:
+                return atual
+            return Referencia(_blobs[h])
+
+    dados = arquivo.getvalue()
+    if not dados:
+        raise ValueError("arquivo vazio")
+    h = hash_bytes(dados)
+    with _lock:
+        if file_id:
+            _por_file_id[file_id] = h
+        if atual is not None and atual.hash == h:
+            return atual
+        blob = _blobs.get(h)
+        if blob is None:
+            blob = _blobs[h] = _Blob(h, dados)
+        return Referencia(blob)
+
+
+def estatisticas() -> dict:
+    with _lock:
+        return {
+            "modelos": len(_blobs),
+            "referencias": sum(b.refs for b in _blobs.values()),
+            "bytes": sum(len(b.mapa) for b in _blobs.values()),
+        }
@@ -0,0 +1,88 @@
+# orcamentos/vla.py
+"""Cálculo, contexto do PDF e script de venda da Calculadora VLA (tiragem para autores)."""
+import datetime
+
+from orcamentos import config, precos
+from orcamentos.formatacao import br_money
+
+# Parcelas, frete grátis e faixas de desconto: precificacao.toml (ver config.py)
+TXT_FRETE_GRATIS = "Frete Grátis"
+TXT_FRETE_CALC = "À calcular"
+
+
+def calcular(tipo: str, preco_capa: float, qtd: int) -> dict:
+    cfg = config.atual()
+    desconto_pct = cfg.tabelas[tipo].pct(int(qtd))
+    r = precos.escalar(precos.vla(preco_capa, int(qtd), desconto_pct, cfg.vla_parcelas))
+    return {
+        "tipo": tipo,
+        "preco_capa": float(preco_capa),
+        "qtd": int(qtd),
+        "desconto_pct": desconto_pct,
+        "bruto": precos.reais(r["bruto"]),
+        "desconto": precos.reais(r["desconto"]),
+        "total": precos.reais(r["total"]),
+        "unitario": precos.reais(r["unitario"]),
+        "parcelas": cfg.vla_parcelas,
+        "parcela": precos.reais(r["parcela"]),
+        "frete": TXT_FRETE_GRATIS if qtd >= cfg.frete_gratis_min_qtd else TXT_FRETE_CALC,
+        "config_versao": cfg.versao,
+    }
+
+
+def montar_contexto(calc: dict, nome_cliente: str, consultor: str, data_hoje: str | None = None) -> dict:
+    """Contexto do layout "vla" de pdf_nativo."""
+    return {
+        "data": data_hoje or datetime.date.today().strftime("%d/%m/%Y"),
+        "cliente": nome_cliente or "",
+        "consultor": consultor or "",
+        "tipo": calc["tipo"],
+        "preco_capa": br_money(calc["preco_capa"]),
+        "qtd": calc["qtd"],
+        "desconto_pct": f"{calc['desconto_pct']:.0f}%",
+        "total": br_money(calc["total"]),
+        "unitario": br_money(calc["unitario"]),
+        "parcelas": calc["parcelas"],
+        "parcela": br_money(calc["parcela"]),
+        "frete": calc["frete"],
+    }
+
+
+def montar_script(calc: dict, nome_cliente: str, consultor: str, usar_emojis: bool = False,
+                  data_hoje: str | None = None) -> str:
+    data_hoje = data_hoje or datetime.date.today().strftime("%d/%m/%Y")
+    if usar_emojis:
+        return f"""
+Olá, {nome_cliente or ''}! 😊
+
+Segue proposta da Editora Dialética (data {data_hoje}), preparada por {consultor or 'Consultor'}.
+
+📗 Tipo de livro: {calc['tipo']}
+📘 Preço de capa: {br_money(calc['preco_capa'])}
+🧮 Tiragem: {calc['qtd']} un.
+🎯 Desconto aplicado (política): {calc['desconto_pct']:.0f}%
+
+💰 Total a pagar: {br_money(calc['total'])}
+💵 Valor unitário: {br_money(calc['unitario'])}
+💳 Parcela ({calc['parcelas']}x sem juros): {br_money(calc['parcela'])}
+🚚 Frete: {calc['frete']}
+
+Qualquer dúvida fico à disposição!
+""".strip()
+    return f"""
+Olá, {nome_cliente or ''}!
+
+Segue proposta da Editora Dialética (data {data_hoje}), preparada por {consultor or 'Consultor'}.
+
+Tipo de livro: {calc['tipo']}
+Preço de capa: {br_money(calc['preco_capa'])}
+Tiragem: {calc['qtd']} un.
+Desconto aplicado (política): {calc['desconto_pct']:.0f}%
+
+Total a pagar: {br_money(calc['total'])}
+Valor unitário: {br_money(calc['unitario'])}
+Parcela ({calc['parcelas']}x sem juros): {br_money(calc['parcela'])}
+Frete: {calc['frete']}
+
+Fico à disposição para dúvidas.
+""".strip()
@@ -0,0 +1,110 @@
+# orcamentos/zip_docx.py
+"""Gravação do .docx renderizado sem recomprimir o que não mudou.
+
+``tpl.save()`` (python-docx) serializa e comprime de novo todas as partes do
+pacote a cada orçamento, inclusive logos, estilos e tema, que são sempre os
+mesmos. Aqui cada modelo ganha uma *referência*: o conteúdo de cada membro do
+ZIP já comprimido, calculado uma vez a partir do modelo interpretado. Na hora
+de gravar, membro cujo conteúdo (CRC-32 + tamanho) bate com a referência tem
+os bytes comprimidos copiados direto; só o que o render alterou (em geral
+``word/document.xml``, cabeçalho e rodapé) passa pelo zlib.
+
+Os membros saem na mesma ordem e com o mesmo conteúdo descompactado que o
+``PackageWriter`` do python-docx produziria.
+"""
+import struct
+import time
+import zlib
+from typing import IO, Iterable, Iterator, NamedTuple
+
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from docx.opc.pkgwriter import _ContentTypesItem
+
+_LIMITE_ZIP32 = 0xFFFFFFFF
+
+
+class Membro(NamedTuple):
+    crc: int
+    tamanho: int
+    comprimido: bytes
+
+
+def _deflate(dados: bytes) -> bytes:
+    # mesmos parâmetros do zipfile com ZIP_DEFLATED (nível padrão, deflate puro)
+    c = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return c.compress(dados) + c.flush()
+
+
+def membro(dados: bytes) -> Membro:
+    return Membro(zlib.crc32(dados), len(dados), _deflate(dados))
+
+
+def membros(pacote) -> Iterator[tuple[str, bytes]]:
+    """(nome, conteúdo) de cada membro, na ordem do PackageWriter do python-docx."""
+    partes = pacote.parts
+    yield CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(partes).blob
+    yield PACKAGE_URI.rels_uri.membername, pacote.rels.xml
+    for parte in partes:
+        yield parte.partname.membername, parte.blob
+        if len(parte.rels):
+            yield parte.partname.rels_uri.membername, parte.rels.xml
+
+
+def referencia(pacote) -> dict[str, Membro]:
+    """Membros comprimidos do modelo ainda não renderizado (calculado uma vez por modelo)."""
+    return {nome: membro(dados) for nome, dados in membros(pacote)}
+
+
+def _dos(data_hora: tuple) -> tuple[int, int]:
+    ano, mes, dia, hora, minuto, seg = data_hora[:6]
+    return (hora << 11) | (minuto << 5) | (seg // 2), ((ano - 1980) << 9) | (mes << 5) | dia
+
+
+def gravar(pacote, destino: IO[bytes], ref: dict[str, Membro] | None = None,
+           data_hora: tuple | None = None) -> tuple[int, int]:
+    """Grava o pacote como .docx em ``destino``. Retorna (membros copiados, membros comprimidos).
+
+    Sem ``data_hora`` usa a hora local, como o ``zipfile``.
+    """
+    for parte in pacote.parts:
+        parte.before_marshal()
+    ref = ref or {}
+    contagem = [0, 0]
+
+    def prontos() -> Iterator[tuple[str, Membro]]:
+        for nome, dados in membros(pacote):
+            crc = zlib.crc32(dados)
+            m = ref.get(nome)
+            if m is not None and m.crc == crc and m.tamanho == len(dados):
+                contagem[0] += 1
+            else:
+                m = Membro(crc, len(dados), _deflate(dados))
+                contagem[1] += 1
+            yield nome, m
+
+    escrever(prontos(), destino, data_hora)
+    return contagem[0], contagem[1]
+
+
+def escrever(itens: Iterable[tuple[str, Membro]], destino: IO[bytes], data_hora: tuple | None = None) -> None:
+    """Grava o ZIP com membros já comprimidos, na ordem dada."""
+    dostime, dosdate = _dos(data_hora or time.localtime(time.time()))
+    central = []
+    offset = 0
+    for nome, m in itens:
+        if offset > _LIMITE_ZIP32 or m.tamanho > _LIMITE_ZIP32:
+            raise ValueError("documento grande demais para ZIP sem zip64")
+        nome_b = nome.encode("utf-8")
+        flags = 0 if nome.isascii() else 0x800
+        destino.write(struct.pack("<IHHHHHIIIHH", 0x04034B50, 20, flags, 8, dostime, dosdate,
+                                  m.crc, len(m.comprimido), m.tamanho, len(nome_b), 0))
+        destino.write(nome_b)
+        destino.write(m.comprimido)
+        central.append(struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, (3 << 8) | 20, 20, flags, 8, dostime,
+                                   dosdate, m.crc, len(m.comprimido), m.tamanho, len(nome_b), 0, 0, 0, 0,
+                                   0o600 << 16, offset) + nome_b)
+        offset += 30 + len(nome_b) + len(m.comprimido)
+    tam_central = sum(map(len, central))
+    destino.write(b"".join(central))
+    destino.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, len(central), len(central),
+                              tam_central, offset, 0))
@@ -1,62 +1,33 @@
-import datetime
 import streamlit as st
 
+from orcamentos import artefatos, config, desempenho, diagnostico, historico, nomes, pdf_nativo, precos, processos, simulacao, vla
+from orcamentos.formatacao import br_int, br_money
+
+_t0_rerun = desempenho.inicio_rerun()
+
 st.set_page_config(page_title="Calculadora VLA", page_icon="📚", layout="wide")
 
 # -------------------- POLÍTICAS --------------------
-# Acadêmico (política anterior)
-POLITICA_ACADEMICO = [
-    {"min": 1,    "max": 49,   "pct": 0},
-    {"min": 50,   "max": 99,   "pct": 20},
-    {"min": 100,  "max": 149,  "pct": 30},
-    {"min": 150,  "max": 249,  "pct": 40},
-    {"min": 250,  "max": 999,  "pct": 45},
-    {"min": 1000, "max": None, "pct": 50},
-]
-
-# Literário (conforme a imagem enviada)
-POLITICA_LITERARIO = [
-    {"min": 1,    "max": 49,   "pct": 0},
-    {"min": 50,   "max": 99,   "pct": 20},
-    {"min": 100,  "max": 149,  "pct": 30},
-    {"min": 150,  "max": 249,  "pct": 32},
-    {"min": 250,  "max": 999,  "pct": 35},
-    {"min": 1000, "max": None, "pct": 40},
-]
-
-POLITICAS = {
-    "Acadêmico": POLITICA_ACADEMICO,
-    "Literário": POLITICA_LITERARIO,
-}
-
-PARCELAS_PADRAO = 10
-FRETE_GRATIS_MIN_QTD = 100
-TXT_FRETE_GRATIS = "Frete Grátis"
-TXT_FRETE_CALC = "À calcular"
-
-# -------------------- HELPERS --------------------
-def br_money(x: float) -> str:
-    return f"R${x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-def pct_por_qtd(qtd: int, politica: list[dict]) -> float:
-    for faixa in politica:
-        lo, hi, pct = faixa["min"], faixa["max"], faixa["pct"]
-        if qtd >= lo and (hi is None or qtd <= hi):
-            return float(pct)
-    return float(politica[0]["pct"])
+# Faixas de desconto por quantidade, parcelas e frete: precificacao.toml (ver orcamentos/config.py)
+cfg = config.atual()
 
 # -------------------- UI --------------------
 st.title("📚 Calculadora de Preços e Descontos (Autores)")
 st.caption("Entradas: autor, consultor, preço de capa e tiragem. Política de descontos fixa por quantidade, com opção Acadêmico/Literário. Gera script pronto para WhatsApp/CRM.")
 
 # seletor do tipo de livro (troca a política)
-tipo = st.radio("Tipo de livro", ["Acadêmico", "Literário"], horizontal=True, index=0)
-
-id1, id2 = st.columns(2)
-with id1:
-    nome_cliente = st.text_input("Nome do autor", placeholder="Ex.: Prof. João Silva")
-with id2:
-    consultor = st.text_input("Consultor", placeholder="Ex.: Lucas Martins")
+tipo = st.radio("Tipo de livro", list(cfg.tabelas), horizontal=True, index=0)
+
+# nomes num formulário: digitar não roda a página, só "Aplicar" (ou Enter)
+with st.form("vla_identificacao", border=False):
+    id1, id2 = st.columns(2)
+    with id1:
+        nome_cliente = st.text_input("Nome do autor", placeholder="Ex.: Prof. João Silva", key="vla_cliente")
+    with id2:
+        consultor = st.text_input("Consultor", placeholder="Ex.: Lucas Martins", key="vla_consultor")
+    st.form_submit_button("Aplicar")
+nomes.sugestoes("cliente", "vla_cliente")
+nomes.sugestoes("consultor", "vla_consultor")
 
 c0, c1 = st.columns(2)
 with c0:
@@ -64,72 +35,125 @@ with c0:
 with c1:
     qtd = st.number_input("Quantidade (tiragem)", min_value=1, step=1, value=100)
 
-st.caption(f"Política aplicada • {tipo}: "
-           + ( "50–99: 20%, 100–149: 30%, 150–249: 40%, 250–999: 45%, 1000+: 50%"
-               if tipo == "Acadêmico"
-               else "50–99: 20%, 100–149: 30%, 150–249: 32%, 250–999: 35%, 1000+: 40%" ))
+st.caption(f"Política aplicada • {tipo}: {cfg.tabelas[tipo].descricao()}")
 
 # -------------------- CÁLCULO --------------------
-desconto_pct = pct_por_qtd(int(qtd), POLITICAS[tipo])
-bruto = preco_capa * qtd
-desconto_rs = bruto * (desconto_pct / 100.0)
-total = bruto - desconto_rs
-unitario = total / qtd if qtd > 0 else 0
-parcela = total / PARCELAS_PADRAO
-frete = TXT_FRETE_GRATIS if qtd >= FRETE_GRATIS_MIN_QTD else TXT_FRETE_CALC
+calc = vla.calcular(tipo, preco_capa, int(qtd))
 
 st.subheader("Resultados")
 m1, m2, m3, m4, m5 = st.columns(5)
-m1.metric("Desconto aplicado", f"{desconto_pct:.0f}%")
-m2.metric("Total a pagar", br_money(total))
-m3.metric("Valor unitário", br_money(unitario))
-m4.metric(f"Parcela ({PARCELAS_PADRAO}x)", br_money(parcela))
-m5.metric("Frete", frete)
+m1.metric("Desconto aplicado", f"{calc['desconto_pct']:.0f}%")
+m2.metric("Total a pagar", br_money(calc["total"]))
+m3.metric("Valor unitário", br_money(calc["unitario"]))
+m4.metric(f"Parcela ({calc['parcelas']}x)", br_money(calc["parcela"]))
+m5.metric("Frete", calc["frete"])
 
 st.divider()
 
 # -------------------- SCRIPT PARA WHATSAPP/CRM --------------------
 st.subheader("Copiar e enviar 📄➡️")
 
-usar_emojis = st.checkbox("Adicionar emojis no texto", value=False)
-data_hoje = datetime.date.today().strftime("%d/%m/%Y")
-
-if usar_emojis:
-    script = f"""
-Olá, {nome_cliente or ''}! 😊
-
-Segue proposta da Editora Dialética (data {data_hoje}), preparada por {consultor or 'Consultor'}.
-
-📗 Tipo de livro: {tipo}
-📘 Preço de capa: {br_money(preco_capa)}
-🧮 Tiragem: {int(qtd)} un.
-🎯 Desconto aplicado (política): {desconto_pct:.0f}%
+# Fragmento: o checkbox de emojis reroda só o script, não a página toda
+@st.fragment
+@desempenho.medir("vla.script")
+def secao_script(calc, nome_cliente, consultor):
+    usar_emojis = st.checkbox("Adicionar emojis no texto", value=False)
+    script = vla.montar_script(calc, nome_cliente, consultor, usar_emojis)
+
+    st.text_area("Script pronto para copiar", script, height=260)
+    desempenho.tamanho("download.txt", len(script.encode("utf-8")))
+    # baixar o script ou gerar o PDF conta como orçamento gerado (vai para o histórico)
+    registro = ("vla", nome_cliente, consultor, int(precos.centavos(calc["total"])), calc, script)
+    c1, c2 = st.columns(2)
+    with c1:
+        st.download_button("⬇️ Baixar script (.txt)", data=script, file_name="script_calculadora_vla.txt",
+                           on_click=historico.registrar, args=registro,
+                           kwargs={"config_versao": calc["config_versao"]})
+    with c2:
+        gerar_pdf = pdf_nativo.disponivel() and st.button("🧾 Gerar PDF", key="vla_pdf")
+    if gerar_pdf:
+        try:
+            with st.spinner("Gerando PDF..."):
+                pdf = pdf_nativo.gerar("vla", vla.montar_contexto(calc, nome_cliente, consultor))
+        except processos.FilaCheia as e:
+            st.warning(str(e))
+        except Exception as e:
+            st.error(f"Falha ao gerar PDF: {e}")
+        else:
+            historico.registrar(*registro, config_versao=calc["config_versao"])
+            desempenho.tamanho("download.pdf", len(pdf))
+            artefatos.oferecer("⬇️ Baixar PDF", "Orcamento_VLA.pdf", pdf, key="vla_pdf_download")
+
+
+secao_script(calc, nome_cliente, consultor)
 
-💰 Total a pagar: {br_money(total)}
-💵 Valor unitário: {br_money(unitario)}
-💳 Parcela ({PARCELAS_PADRAO}x sem juros): {br_money(parcela)}
-🚚 Frete: {frete}
-
-Qualquer dúvida fico à disposição!
-""".strip()
-else:
-    script = f"""
-Olá, {nome_cliente or ''}!
-
-Segue proposta da Editora Dialética (data {data_hoje}), preparada por {consultor or 'Consultor'}.
-
-Tipo de livro: {tipo}
-Preço de capa: {br_money(preco_capa)}
-Tiragem: {int(qtd)} un.
-Desconto aplicado (política): {desconto_pct:.0f}%
-
-Total a pagar: {br_money(total)}
-Valor unitário: {br_money(unitario)}
-Parcela ({PARCELAS_PADRAO}x sem juros): {br_money(parcela)}
-Frete: {frete}
-
-Fico à disposição para dúvidas.
-""".strip()
+st.divider()
 
-st.text_area("Script pronto para copiar", script, height=260)
-st.download_button("⬇️ Baixar script (.txt)", data=script, file_name="script_calculadora_vla.txt")
+# -------------------- SIMULADOR DE TIRAGEM --------------------
+# Fragmento: orçamento, quantidade mínima e gráfico rerodam só o simulador
+@st.fragment
+@desempenho.medir("vla.simulador")
+def secao_simulador(tipo, preco_capa, qtd):
+    st.caption(f"Preços de 1 a {br_int(simulacao.QTD_MAX)} exemplares nas duas políticas.")
+    with desempenho.etapa("simulacao.curvas"):
+        curvas = simulacao.simular_todas(preco_capa)
+    curva = curvas[tipo]
+
+    campos = {"Total": "total", "Valor unitário": "unitario", f"Parcela ({curva.parcelas}x)": "parcela"}
+    campo = st.radio("Curva", list(campos), horizontal=True, key="sim_campo")
+    # spec Vega-Lite direto: st.line_chart monta o gráfico via Altair a cada rerun (~60 ms)
+    st.vega_lite_chart({
+        "data": {"values": simulacao.pontos_grafico(curvas, campos[campo])},
+        "mark": {"type": "line", "point": True, "tooltip": True},
+        "encoding": {
+            "x": {"field": "qtd", "type": "quantitative", "title": "Quantidade"},
+            "y": {"field": "valor", "type": "quantitative", "title": f"{campo} (R$)"},
+            "color": {"field": "politica", "type": "nominal", "title": "Política"},
+        },
+    }, use_container_width=True)
+
+    quebras = simulacao.quebras(curva)
+    if quebras:
+        st.markdown(f"**Quando comprar mais sai mais barato ({tipo})**")
+        st.dataframe([{
+            "Faixa a partir de": br_int(q["inicio"]),
+            "Desconto": f"{q['pct']:.0f}%",
+            f"Total com {br_int(q['inicio'])}": br_money(precos.reais(q["total_cent"])),
+            "Mais barato que comprar": f"{br_int(q['vale_a_partir_de'])} a {br_int(q['inicio'] - 1)}",
+        } for q in quebras], hide_index=True, use_container_width=True)
+
+    s1, s2 = st.columns(2)
+    with s1:
+        orcamento = st.number_input("Orçamento do autor (R$)", min_value=0.0, step=100.0, value=5000.0,
+                                    format="%.2f", key="sim_orcamento")
+        r = simulacao.max_qtd_no_orcamento(curva, int(precos.centavos(orcamento)))
+        if r is None:
+            st.info("O orçamento não cobre nem 1 exemplar.")
+        else:
+            st.success(f"Cabem até **{br_int(r[0])}** exemplares ({br_money(precos.reais(r[1]))}).")
+    with s2:
+        minimo = st.number_input("Quantidade mínima", min_value=1, step=1, value=qtd, key="sim_minimo")
+        q, total = simulacao.mais_barata_a_partir_de(curva, int(minimo))
+        if q == minimo:
+            st.success(f"{br_int(q)} exemplares já é a opção mais barata ({br_money(precos.reais(total))}).")
+        else:
+            st.warning(f"Levar **{br_int(q)}** exemplares sai mais barato: {br_money(precos.reais(total))}.")
+
+    e1, e2 = st.columns(2)
+    for col, formato, exportar in ((e1, "csv", simulacao.exportar_csv), (e2, "xlsx", simulacao.exportar_xlsx)):
+        with col:
+            if st.button(f"Preparar tabela completa (.{formato})", key=f"sim_preparar_{formato}"):
+                with artefatos.novo(f"simulacao_vla.{formato}") as (f, art), desempenho.etapa(f"simulacao.{formato}"):
+                    exportar(curvas, f)
+                    desempenho.tamanho(f"download.{formato}", f.tell())
+                artefatos.oferecer_artefato(f"⬇️ Baixar .{formato}", art, key=f"sim_baixar_{formato}")
+
+
+with st.expander("📈 Simulador de tiragem e orçamento", expanded=False):
+    secao_simulador(tipo, preco_capa, int(qtd))
+
+nomes.aquecer()
+
+diagnostico.painel()
+
+desempenho.fim_rerun("vla", _t0_rerun)
@@ -1,10 +1,15 @@
 # pages/03_Orcamentos_ELIV.py
-import io
-import datetime as dt
 from pathlib import Path
 
 import streamlit as st
-from docxtpl import DocxTemplate
+
+from orcamentos import (artefatos, comparacao, config, conversor_pdf, desempenho, diagnostico, eliv, historico,
+                        manuscritos, nomes, pdf_nativo, processos)
+from orcamentos.eliv import FORMAS, TEMPLATE_COMUM, TEMPLATE_UNI, br_money
+from orcamentos.formatacao import br_int, escape_md
+from orcamentos.modelos import ler_arquivo
+
+_t0_rerun = desempenho.inicio_rerun()
 
 # ========================= CONFIG VISUAL =========================
 st.set_page_config(page_title="Orçamentos ELIV", page_icon="📦", layout="wide")
@@ -22,109 +27,282 @@ body, .stAlert p, .stMarkdown p, .st-emotion-cache-16idsys p {
 
 
 # ========================= HELPERS =========================
-def br_money(x: float | int) -> str:
-    """Formata para R$ 1.234,56."""
-    if x is None:
-        return "—"
-    s = f"R$ {x:,.2f}"
-    return s.replace(",", "X").replace(".", ",").replace("X", ".")
-
-def escape_md(s: str) -> str:
-    """Escapa caracteres que o Markdown usa como sintaxe ($, _)"""
-    return s.replace("$", r"\$").replace("_", r"\_")
-
-def render_docxtpl(template_path: Path, context: dict) -> bytes:
-    tpl = DocxTemplate(str(template_path))
-    tpl.render(context)
-    buf = io.BytesIO()
-    tpl.save(buf)
-    buf.seek(0)
-    return buf.read()
-
-# Onde estão os templates (pasta na raiz do repo)
-# pages/ está um nível abaixo da raiz → parent.parent
-TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
-TEMPLATE_COMUM = TEMPLATES_DIR / "ELIV_Comum.docx"
-TEMPLATE_UNI   = TEMPLATES_DIR / "ELIV_Universidade.docx"
-
-
-# ========================= TABELA DE PACOTES =========================
-# Valores a partir do seu material (imagem): 6x e à vista (PIX)
-PACOTES = {
-    "Básico":   {"lista_pix": 1884.60, "mensal_6x": 349.00, "parcelas": 6},
-    "Especial": {"lista_pix": 1938.60, "mensal_6x": 359.00, "parcelas": 6},
-    "Premium":  {"lista_pix": 2694.60, "mensal_6x": 499.00, "parcelas": 6},
-}
+def render_docxtpl(template_path: Path, context: dict) -> bytes | None:
+    """Renderiza no pool de processos; None (com aviso na tela) se o pool estiver lotado."""
+    dados, h = ler_arquivo(template_path)
+    try:
+        with st.spinner("Gerando documento..."):
+            return processos.renderizar(dados, context, h)
+    except processos.FilaCheia as e:
+        st.warning(str(e))
+        return None
+
+def registrar_historico(produto: str, template_path: Path, context: dict, cliente: str, consultor: str,
+                        valor_cent: int, script: str) -> None:
+    dados, h = ler_arquivo(template_path)
+    historico.registrar(produto, cliente, consultor, valor_cent, context, script, modelo=dados, modelo_hash=h)
+
+def gerar_pdf(layout: str, template_path: Path, context: dict) -> bytes | None:
+    """PDF direto do contexto (pdf_nativo); sem fpdf2, o DOCX renderizado e convertido."""
+    try:
+        if pdf_nativo.disponivel():
+            with st.spinner("Gerando PDF..."):
+                return pdf_nativo.gerar(layout, context)
+        if not conversor_pdf.pdf_disponivel():
+            st.info("PDF automático não está disponível neste servidor (sem LibreOffice/Word). Baixe o DOCX e exporte para PDF.")
+            return None
+        bin_doc = render_docxtpl(template_path, context)
+        if bin_doc is None:
+            return None
+        with st.spinner("Convertendo para PDF..."):
+            return conversor_pdf.converter_pdf(bin_doc)
+    except (processos.FilaCheia, conversor_pdf.FilaCheia) as e:
+        st.warning(str(e))
+    except Exception as e:
+        st.error(f"Falha ao gerar PDF: {e}")
+    return None
+
+# Templates (templates/ na raiz) e FORMAS: orcamentos/eliv.py; pacotes: precificacao.toml
+
+K = "eliv_"  # prefixo para keys únicas
+
+
+# Fragmento: digitar as observações ou gerar o documento reroda só esta seção
+@st.fragment
+@desempenho.medir("eliv.comum")
+def secao_comum(d: dict, pac: dict):
+    obs = st.text_area("Observações (opcional)", key=f"{K}obs")
+
+    b1, b2 = st.columns([1, 1])
+    with b1:
+        btn_comum = st.button("Gerar DOCX – Comum", type="primary", key=f"{K}btn_docx_comum")
+    with b2:
+        btn_comum_pdf = st.button("Gerar PDF – Comum", key=f"{K}btn_pdf_comum")
+    if btn_comum or btn_comum_pdf:
+        # Contexto do template COMUM
+        context = eliv.contexto_comum(pac, d["cliente"], d["consultor"], d["obra"], d["paginas"], obs)
+        if not TEMPLATE_COMUM.exists():
+            st.error("Template **ELIV_Comum.docx** não encontrado em /templates.")
+        else:
+            if btn_comum_pdf:
+                bin_doc = gerar_pdf("eliv_comum", TEMPLATE_COMUM, context)
+            else:
+                bin_doc = render_docxtpl(TEMPLATE_COMUM, context)
+            if bin_doc is None:
+                return
+            registrar_historico("eliv_comum", TEMPLATE_COMUM, context, d["cliente"], d["consultor"],
+                                pac["total_com_desc_cent"], eliv.resumo(pac))
+            if btn_comum_pdf:
+                desempenho.tamanho("download.pdf", len(bin_doc))
+                artefatos.oferecer("Baixar PDF", "Orcamento_Comum_ELIV.pdf", bin_doc, key=f"{K}down_comum_pdf")
+            else:
+                desempenho.tamanho("download.docx", len(bin_doc))
+                artefatos.oferecer("Baixar DOCX – Comum", "Orcamento_Comum_ELIV.docx", bin_doc, key=f"{K}down_comum")
+
+
+# Fragmento: campos da universidade, tiragem e geração rerodam só esta aba
+@st.fragment
+@desempenho.medir("eliv.universidade")
+def secao_universidade(d: dict, pac: dict):
+    cA, cB, cC = st.columns([1, 1, 1])
+    with cA:
+        universidade = st.text_input("Universidade", placeholder="Ex.: Universidade Federal de Viçosa", key=f"{K}uni_nome")
+        nomes.sugestoes("universidade", f"{K}uni_nome")
+    with cB:
+        tratamento = st.selectbox("Pronome de tratamento", eliv.TRATAMENTOS, index=1, key=f"{K}trat")
+    with cC:
+        contato = st.text_input("Contato (telefone/email)", placeholder="Ex.: (31) 99999-0000", key=f"{K}uni_contato")
+
+    st.subheader("Tiragem da universidade")
+    c1, c2, c3 = st.columns([1, 1, 1])
+    with c1:
+        preco_capa = st.number_input("Preço de capa (R$)", min_value=10.00, step=0.50, value=75.00, key=f"{K}capafis")
+    with c2:
+        tir_qtd = st.number_input("Quantidade", min_value=10, step=10, value=100, key=f"{K}tir_qtd")
+    with c3:
+        tir_desc_pct = st.number_input("% de desconto na tiragem", min_value=0.0, step=1.0, value=30.0, key=f"{K}tir_desc")
+
+    ebook_preco = st.number_input("Preço do e-book (R$)", min_value=0.0, step=1.0, value=0.0, key=f"{K}ebookp")
+
+    # Cálculos de tiragem
+    tir = eliv.calcular_tiragem(preco_capa, int(tir_qtd), tir_desc_pct)
+
+    azul = f"Unitário com desconto: {br_money(tir['unitario_desc'])}  |  **Total tiragem ({tir['qtd']})** : {br_money(tir['total_tiragem'])}"
+    st.info(escape_md(azul))
+
+    st.subheader("Gerar DOCX – Universidade")
+    u1, u2 = st.columns([1, 1])
+    with u1:
+        btn_uni = st.button("Gerar DOCX – Universidade", type="primary", key=f"{K}btn_docx_uni")
+    with u2:
+        btn_uni_pdf = st.button("Gerar PDF – Universidade", key=f"{K}btn_pdf_uni")
 
-FORMAS = ["6x sem juros", "à vista (PIX)"]
+    if btn_uni or btn_uni_pdf:
+        # Autor/responsável = nome do cliente (aba 1)
+        context = eliv.contexto_universidade(pac, tir, d["cliente"], d["obra"], d["paginas"],
+                                             universidade, contato, tratamento, ebook_preco)
+
+        if not TEMPLATE_UNI.exists():
+            st.error("Template **ELIV_Universidade.docx** não encontrado em /templates.")
+        else:
+            if btn_uni_pdf:
+                bin_doc = gerar_pdf("eliv_universidade", TEMPLATE_UNI, context)
+            else:
+                bin_doc = render_docxtpl(TEMPLATE_UNI, context)
+            if bin_doc is None:
+                return
+            registrar_historico("eliv_universidade", TEMPLATE_UNI, context, d["cliente"], d["consultor"],
+                                pac["total_com_desc_cent"] + tir["total_tiragem_cent"], eliv.resumo(pac))
+            if btn_uni_pdf:
+                desempenho.tamanho("download.pdf", len(bin_doc))
+                artefatos.oferecer("Baixar PDF", "Orcamento_Universidade_ELIV.pdf", bin_doc, key=f"{K}down_uni_pdf")
+            else:
+                desempenho.tamanho("download.docx", len(bin_doc))
+                artefatos.oferecer("Baixar DOCX – Universidade", "Orcamento_Universidade_ELIV.docx", bin_doc,
+                                   key=f"{K}down_uni")
+
+
+def _universidade_da_sessao() -> tuple[dict, dict]:
+    """Campos da aba Universidade (lidos do session_state, com os mesmos padrões dos widgets)."""
+    ss = st.session_state
+    tir = eliv.calcular_tiragem(ss.get(f"{K}capafis", 75.00), int(ss.get(f"{K}tir_qtd", 100)),
+                                ss.get(f"{K}tir_desc", 30.0))
+    campos = {
+        "universidade": ss.get(f"{K}uni_nome", ""),
+        "contato": ss.get(f"{K}uni_contato", ""),
+        "tratamento": ss.get(f"{K}trat", eliv.TRATAMENTOS[1]),
+        "ebook_preco": ss.get(f"{K}ebookp", 0.0),
+    }
+    return tir, campos
+
+
+# Fragmento: escolher combinações e gerar o pacote reroda só a comparação
+@st.fragment
+@desempenho.medir("eliv.comparacao")
+def secao_comparacao(d: dict, modo_uni: bool):
+    tir, uni = _universidade_da_sessao() if modo_uni else (None, None)
+    with desempenho.etapa("eliv.matriz"):
+        linhas = comparacao.matriz(tiragem_cent=tir["total_tiragem_cent"] if tir else 0)
+
+    st.markdown("**Pacote com desconto**")
+    st.dataframe(comparacao.tabela(linhas), hide_index=True, use_container_width=True)
+    if tir:
+        st.markdown(f"**Total geral** (pacote + tiragem de {tir['qtd']}: {br_money(tir['total_tiragem'])})")
+        st.dataframe(comparacao.tabela(linhas, "total_geral_cent"), hide_index=True, use_container_width=True)
+
+    st.subheader("Gerar alternativas")
+    c1, c2, c3 = st.columns([1, 1, 1])
+    with c1:
+        nomes = list(config.atual().pacotes)
+        pacotes = st.multiselect("Pacotes", nomes, default=nomes, key=f"{K}cmp_pacotes")
+    with c2:
+        formas = st.multiselect("Formas de pagamento", FORMAS, default=FORMAS[:1], key=f"{K}cmp_formas")
+    with c3:
+        descontos = st.multiselect("Descontos", comparacao.DESCONTOS, default=[15], format_func=lambda x: f"{x}%",
+                                   key=f"{K}cmp_descontos")
+    tipos = ["Comum"] + (["Universidade"] if tir else [])
+    documentos = st.multiselect("Documentos", tipos, default=tipos, key=f"{K}cmp_docs")
+
+    n = len(pacotes) * len(formas) * len(descontos) * len(documentos)
+    if not st.button(f"Gerar {n} documento(s) num ZIP", type="primary", disabled=not n, key=f"{K}cmp_gerar"):
+        return
+
+    docs, registros = [], {}
+    for pacote in pacotes:
+        for forma in formas:
+            for desconto in descontos:
+                pac = eliv.calcular_pacote(pacote, forma, desconto)
+                for tipo in documentos:
+                    if tipo == "Comum":
+                        modelo, produto, valor = TEMPLATE_COMUM, "eliv_comum", pac["total_com_desc_cent"]
+                        ctx = eliv.contexto_comum(pac, d["cliente"], d["consultor"], d["obra"], d["paginas"],
+                                                  st.session_state.get(f"{K}obs", ""))
+                    else:
+                        modelo, produto = TEMPLATE_UNI, "eliv_universidade"
+                        valor = pac["total_com_desc_cent"] + tir["total_tiragem_cent"]
+                        ctx = eliv.contexto_universidade(pac, tir, d["cliente"], d["obra"], d["paginas"], **uni)
+                    doc = comparacao.Documento(comparacao.nome_arquivo(tipo, pacote, forma, desconto), modelo, ctx)
+                    docs.append(doc)
+                    registros[doc.nome] = (produto, valor, eliv.resumo(pac))
+    faltando = {doc.modelo.name for doc in docs if not doc.modelo.exists()}
+    if faltando:
+        st.error(f"Template(s) não encontrado(s) em /templates: {', '.join(sorted(faltando))}.")
+        return
+
+    def _registrar(doc):
+        produto, valor, script = registros[doc.nome]
+        registrar_historico(produto, doc.modelo, doc.contexto, d["cliente"], d["consultor"], valor, script)
+
+    with artefatos.novo("Orcamentos_ELIV_alternativas.zip") as (zip_f, zip_art):
+        with st.spinner(f"Gerando {len(docs)} documento(s)..."), desempenho.etapa("eliv.pacote_zip"):
+            erros = comparacao.gerar_zip(docs, zip_f, ao_gerar=_registrar)
+        desempenho.tamanho("download.zip", zip_f.tell())
+    for nome, erro in erros:
+        st.error(f"{nome}: {erro}")
+    if len(erros) < len(docs):
+        artefatos.oferecer_artefato("⬇️ Baixar ZIP", zip_art, key=f"{K}cmp_down")
 
 
 # ========================= UI =========================
 st.title("📦 Orçamentos ELIV")
 
 # Dados principais (fica em uma aba separada da parte da universidade)
-tabs = st.tabs(["Dados principais", "Universidade (opcional)"])
-K = "eliv_"  # prefixo para keys únicas
+tabs = st.tabs(["Dados principais", "Universidade (opcional)", "Comparar pacotes"])
 
 with tabs[0]:
     c1, c2 = st.columns([1, 1])
     with c1:
-        cliente = st.text_input("Nome do cliente", placeholder="Ex.: Prof. João Silva", key=f"{K}cliente")
-        consultor = st.text_input("Consultor", placeholder="Ex.: Lucas Martins", key=f"{K}consultor")
-        obra = st.text_input("Título da obra", placeholder="Ex.: DICIONÁRIO TEMÁTICO DE TURISMO E PATRIMÔNIO", key=f"{K}obra")
+        # formulário: digitar os nomes não roda a página, só "Aplicar" (ou Enter)
+        with st.form(f"{K}identificacao", border=False):
+            cliente = st.text_input("Nome do cliente", placeholder="Ex.: Prof. João Silva", key=f"{K}cliente")
+            consultor = st.text_input("Consultor", placeholder="Ex.: Lucas Martins", key=f"{K}consultor")
+            obra = st.text_input("Título da obra", placeholder="Ex.: DICIONÁRIO TEMÁTICO DE TURISMO E PATRIMÔNIO", key=f"{K}obra")
+            st.form_submit_button("Aplicar")
+        for campo in ("cliente", "consultor", "obra"):
+            nomes.sugestoes(campo, f"{K}{campo}")
     with c2:
-        paginas = st.number_input("Nº de páginas", min_value=20, max_value=2000, step=10, value=250, key=f"{K}paginas")
-        pacote = st.selectbox("Pacote ELIV", list(PACOTES.keys()), index=1, key=f"{K}pacote")
+        enviados = st.file_uploader("Manuscrito (opcional): estima o nº de páginas",
+                                    type=list(manuscritos.FORMATOS), accept_multiple_files=True, key=f"{K}manuscrito")
+        if enviados:
+            with st.spinner("Contando páginas..."):
+                contagens, erros = manuscritos.contar_enviados(
+                    enviados, st.session_state.setdefault(f"{K}manuscrito_contagens", {}))
+            for nome, erro in erros:
+                st.error(f"{nome}: {erro}")
+            if contagens:
+                total_paginas = sum(c.paginas for c in contagens)
+                # só preenche quando os arquivos mudam: depois o consultor pode ajustar o número
+                assinatura = tuple(c.hash for c in contagens)
+                if st.session_state.get(f"{K}manuscrito_aplicado") != assinatura:
+                    st.session_state[f"{K}paginas"] = min(max(total_paginas, 20), 2000)
+                    st.session_state[f"{K}manuscrito_aplicado"] = assinatura
+                estimadas = any(not c.paginas_do_arquivo for c in contagens)
+                st.caption(f"{br_int(total_paginas)} página(s), {br_int(sum(c.palavras for c in contagens))} palavras"
+                           + (f" (estimativa: {manuscritos.PALAVRAS_POR_PAGINA} palavras por página)"
+                              if estimadas else ""))
+        else:
+            st.session_state.pop(f"{K}manuscrito_aplicado", None)
+        st.session_state.setdefault(f"{K}paginas", 250)
+        paginas = st.number_input("Nº de páginas", min_value=20, max_value=2000, step=10, key=f"{K}paginas")
+        nomes_pacotes = list(config.atual().pacotes)
+        pacote = st.selectbox("Pacote ELIV", nomes_pacotes, index=min(1, len(nomes_pacotes) - 1), key=f"{K}pacote")
         forma_pag = st.selectbox("Forma de pagamento", FORMAS, index=0, key=f"{K}fpag")
 
     # Desconto padrão (15% sugerido)
     desconto_pac_pct = st.slider("% de desconto no pacote", 0, 40, 15, 1, key=f"{K}desc_pac")
 
     # Cálculos
-    base = PACOTES[pacote]["lista_pix"]
-    parcelas = PACOTES[pacote]["parcelas"]
-    total_com_desc = base * (1 - desconto_pac_pct/100)
-    mensal = (total_com_desc / parcelas) if forma_pag == "6x sem juros" else None
+    pac = eliv.calcular_pacote(pacote, forma_pag, desconto_pac_pct)
 
     # Quadro de resumo sem quebrar o Markdown por causa do "R$"
-    msg = f"Pacote **{pacote}** | **{forma_pag}** | **Com desconto:** {br_money(total_com_desc)}"
-    if mensal:
-        msg += f" ({parcelas}x de {br_money(mensal)})"
-    st.success(escape_md(msg))
+    st.success(escape_md(eliv.resumo(pac)))
 
     st.divider()
 
-    st.subheader("Gerar DOCX – Comum")
-    obs = st.text_area("Observações (opcional)", key=f"{K}obs")
+    dados = {"cliente": cliente, "consultor": consultor, "obra": obra, "paginas": paginas}
 
-    btn_comum = st.button("Gerar DOCX – Comum", type="primary", key=f"{K}btn_docx_comum")
-    if btn_comum:
-        # Contexto do template COMUM
-        context = {
-            "data": dt.date.today().strftime("%d/%m/%Y"),
-            "cliente": cliente or "",
-            "consultor": consultor or "",
-            "obra": obra or "",
-            "paginas": int(paginas),
-            "pacote": pacote,
-            "forma_pag": forma_pag,
-            "preco_lista": br_money(base),
-            "desc_pac_pct": f"{desconto_pac_pct:.0f}%",
-            "valor_com_desconto": br_money(total_com_desc),
-            "mensal_final": br_money(mensal) if mensal else "",
-            "observacoes": obs or "",
-        }
-        if not TEMPLATE_COMUM.exists():
-            st.error("Template **ELIV_Comum.docx** não encontrado em /templates.")
-        else:
-            bin_doc = render_docxtpl(TEMPLATE_COMUM, context)
-            st.download_button(
-                "Baixar DOCX – Comum",
-                data=bin_doc,
-                file_name="Orcamento_Comum_ELIV.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                key=f"{K}down_comum"
-            )
+    st.subheader("Gerar DOCX – Comum")
+    secao_comum(dados, pac)
 
 
 with tabs[1]:
@@ -132,78 +310,17 @@ with tabs[1]:
     modo_uni = st.toggle("Orçamento para Universidade", value=False, key=f"{K}modo_uni")
 
     if modo_uni:
-        cA, cB, cC = st.columns([1, 1, 1])
-        with cA:
-            universidade = st.text_input("Universidade", placeholder="Ex.: Universidade Federal de Viçosa", key=f"{K}uni_nome")
-        with cB:
-            tratamento = st.selectbox(
-                "Pronome de tratamento",
-                ["Prof.", "Profa.", "Prof. Dr.", "Profa. Dra.", "Sr.", "Sra.", "Doutor", "Doutora"],
-                index=1, key=f"{K}trat"
-            )
-        with cC:
-            contato = st.text_input("Contato (telefone/email)", placeholder="Ex.: (31) 99999-0000", key=f"{K}uni_contato")
-
-        st.subheader("Tiragem da universidade")
-        c1, c2, c3 = st.columns([1, 1, 1])
-        with c1:
-            preco_capa = st.number_input("Preço de capa (R$)", min_value=10.00, step=0.50, value=75.00, key=f"{K}capafis")
-        with c2:
-            tir_qtd = st.number_input("Quantidade", min_value=10, step=10, value=100, key=f"{K}tir_qtd")
-        with c3:
-            tir_desc_pct = st.number_input("% de desconto na tiragem", min_value=0.0, step=1.0, value=30.0, key=f"{K}tir_desc")
-
-        ebook_preco = st.number_input("Preço do e-book (R$)", min_value=0.0, step=1.0, value=0.0, key=f"{K}ebookp")
-
-        # Cálculos de tiragem
-        unitario_desc = preco_capa * (1 - tir_desc_pct/100)
-        total_tiragem = unitario_desc * tir_qtd
-
-        azul = f"Unitário com desconto: {br_money(unitario_desc)}  |  **Total tiragem ({int(tir_qtd)})** : {br_money(total_tiragem)}"
-        st.info(escape_md(azul))
-
-        st.subheader("Gerar DOCX – Universidade")
-        btn_uni = st.button("Gerar DOCX – Universidade", type="primary", key=f"{K}btn_docx_uni")
+        secao_universidade(dados, pac)
 
-        if btn_uni:
-            # Autor/responsável = nome do cliente (aba 1)
-            autor = cliente or ""
-
-            context = {
-                "data": dt.date.today().strftime("%d/%m/%Y"),
-                # Cabeçalho específico de universidade
-                "universidade": universidade or "",
-                "contato": contato or "",
-                "tratamento": tratamento or "",
-                "autor": autor,
-                # Obra / pacote / forma de pagamento
-                "obra": obra or "",
-                "paginas": int(paginas),
-                "pacote": pacote,
-                "forma_pag": forma_pag,
-                "preco_lista": br_money(base),
-                "desc_pac_pct": f"{desconto_pac_pct:.0f}%",
-                "valor_com_desconto": br_money(total_com_desc),
-                "mensal_final": br_money(mensal) if mensal else "",
-                # Tiragem / e-book
-                "preco_capa": br_money(preco_capa),
-                "desc_tiragem_pct": f"{tir_desc_pct:.0f}%",
-                "preco_unitario": br_money(unitario_desc),
-                "tiragem_qtd": int(tir_qtd),
-                "total_tiragem": br_money(total_tiragem),
-                "ebook_preco": br_money(ebook_preco),
-                # Total geral (editoração + tiragem)
-                "total_geral": br_money(total_com_desc + total_tiragem),
-            }
-
-            if not TEMPLATE_UNI.exists():
-                st.error("Template **ELIV_Universidade.docx** não encontrado em /templates.")
-            else:
-                bin_doc = render_docxtpl(TEMPLATE_UNI, context)
-                st.download_button(
-                    "Baixar DOCX – Universidade",
-                    data=bin_doc,
-                    file_name="Orcamento_Universidade_ELIV.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    key=f"{K}down_uni"
-                )
+with tabs[2]:
+    st.markdown("Todas as combinações de pacote, forma de pagamento e desconto lado a lado. Com a seção "
+                "de Universidade ativa, inclui a tiragem e o total geral.")
+    secao_comparacao(dados, modo_uni)
+
+# UI já desenhada: carrega docxtpl e os modelos ELIV em segundo plano
+processos.aquecer([TEMPLATE_COMUM, TEMPLATE_UNI])
+nomes.aquecer()
+
+diagnostico.painel()
+
+desempenho.fim_rerun("eliv", _t0_rerun)
@@ -0,0 +1,129 @@
+# pages/04_Historico.py
+import time
+
+import streamlit as st
+
+from orcamentos import artefatos, desempenho, diagnostico, historico, pdf_nativo, processos
+from orcamentos.formatacao import br_money
+
+_t0_rerun = desempenho.inicio_rerun()
+
+st.set_page_config(page_title="Histórico de orçamentos", page_icon="🗂️", layout="wide")
+
+TODOS = "(todos)"
+
+st.title("🗂️ Histórico de orçamentos")
+
+if not historico.ATIVO:
+    st.info("Histórico desligado neste servidor (ORCAMENTO_HISTORICO=0).")
+    st.stop()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _consultores() -> list[str]:
+    return historico.consultores()
+
+
+# -------------------- FILTROS --------------------
+f1, f2, f3 = st.columns([2, 2, 2])
+with f1:
+    cliente = st.text_input("Cliente (começo do nome)", placeholder="Ex.: joão silva")
+with f2:
+    consultor = st.selectbox("Consultor", [TODOS] + _consultores())
+with f3:
+    produtos = st.multiselect("Produto", list(historico.PRODUTOS), format_func=historico.PRODUTOS.get)
+
+f4, f5, f6, f7 = st.columns(4)
+with f4:
+    desde = st.date_input("De", value=None, format="DD/MM/YYYY")
+with f5:
+    ate = st.date_input("Até", value=None, format="DD/MM/YYYY")
+with f6:
+    valor_min = st.number_input("Valor mínimo (R$)", min_value=0.0, value=None, step=100.0)
+with f7:
+    valor_max = st.number_input("Valor máximo (R$)", min_value=0.0, value=None, step=100.0)
+
+t0 = time.perf_counter()
+linhas = historico.buscar(
+    cliente=cliente,
+    consultor="" if consultor == TODOS else consultor,
+    produtos=produtos,
+    desde=desde,
+    ate=ate,
+    valor_min_cent=None if valor_min is None else round(valor_min * 100),
+    valor_max_cent=None if valor_max is None else round(valor_max * 100),
+)
+ms = (time.perf_counter() - t0) * 1000
+st.caption(f"{len(linhas)} orçamento(s), mais recentes primeiro (máx. {historico.LIMITE_BUSCA}) • consulta em {ms:.1f} ms")
+
+# -------------------- RESULTADOS --------------------
+tabela = [
+    {
+        "id": r["id"],
+        "data": r["criado_em"],
+        "produto": historico.PRODUTOS.get(r["produto"], r["produto"]),
+        "cliente": r["cliente"],
+        "consultor": r["consultor"],
+        "valor": br_money(r["valor_cent"] / 100),
+    }
+    for r in linhas
+]
+evento = st.dataframe(tabela, hide_index=True, use_container_width=True,
+                      on_select="rerun", selection_mode="single-row", key="historico_tabela")
+
+selecionadas = evento.selection.rows if evento else []
+if not selecionadas:
+    st.caption("Selecione uma linha para ver o orçamento e baixá-lo de novo.")
+else:
+    orc = historico.obter(tabela[selecionadas[0]]["id"])
+    st.subheader(f"Orçamento #{orc.id} • {historico.PRODUTOS.get(orc.produto, orc.produto)}")
+    st.write(f"**Cliente:** {orc.cliente or '—'}  |  **Consultor:** {orc.consultor or '—'}  |  "
+             f"**Data:** {orc.criado_em}  |  **Valor:** {br_money(orc.valor_cent / 100)}")
+    if orc.config_versao:
+        st.caption(f"Preços da configuração versão {orc.config_versao}")
+    if orc.script:
+        with st.expander("Script"):
+            st.text(orc.script)
+
+    # regenera a partir do contexto gravado: DOCX com o mesmo modelo usado na época
+    # (só quem tem modelo), PDF nativo para todos os produtos, inclusive a VLA
+    pode_pdf = bool(orc.contexto) and orc.produto in pdf_nativo.LAYOUTS and pdf_nativo.disponivel()
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        regenerar_docx = orc.modelo_hash and st.button("📄 Regenerar DOCX", key="historico_regenerar")
+    with c2:
+        regenerar_pdf = pode_pdf and st.button("📕 Regenerar PDF", key="historico_regenerar_pdf")
+    with c3:
+        if orc.script:
+            st.download_button("⬇️ Baixar script (.txt)", data=orc.script,
+                               file_name=f"script_{orc.produto}_{orc.id}.txt")
+
+    if regenerar_docx:
+        dados = historico.modelo(orc.modelo_hash)
+        if dados is None:
+            st.error("O modelo usado neste orçamento não está mais no histórico.")
+        else:
+            try:
+                with st.spinner("Gerando documento..."):
+                    docx = processos.renderizar(dados, orc.contexto, orc.modelo_hash)
+            except processos.FilaCheia as e:
+                st.warning(str(e))
+            else:
+                desempenho.tamanho("download.docx", len(docx))
+                artefatos.oferecer("⬇️ Baixar DOCX", f"Orcamento_{orc.produto}_{orc.id}.docx", docx)
+    if regenerar_pdf:
+        try:
+            with st.spinner("Gerando PDF..."):
+                pdf = pdf_nativo.gerar(orc.produto, orc.contexto)
+        except processos.FilaCheia as e:
+            st.warning(str(e))
+        except Exception as e:
+            st.error(f"Falha ao gerar PDF: {e}")
+        else:
+            desempenho.tamanho("download.pdf", len(pdf))
+            artefatos.oferecer("⬇️ Baixar PDF", f"Orcamento_{orc.produto}_{orc.id}.pdf", pdf,
+                               key="historico_pdf_download")
+
+diagnostico.painel()
+
+desempenho.fim_rerun("historico", _t0_rerun)
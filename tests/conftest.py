@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+# sem gravar no histórico de verdade nem reaproveitar documentos do cache em disco
+os.environ.setdefault("ORCAMENTO_HISTORICO", "0")
+os.environ.setdefault("ORCAMENTO_CACHE", "0")
+
+# os testes importam ``orcamentos`` da raiz do repositório, como os scripts de tools/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,27 @@
+from orcamentos import artefatos
+
+
+class _Runtime:
+    def __init__(self, ativas):
+        self.ativas = ativas
+
+    def is_active_session(self, sessao):
+        return sessao in self.ativas
+
+
+def test_sessao_encerrada_libera_a_reserva(monkeypatch):
+    monkeypatch.setattr(artefatos, "_em_memoria", {("a", "doc"): (artefatos.MAX_MEMORIA, 0.0),
+                                                   ("b", "doc"): (10, 0.0)})
+    monkeypatch.setattr(artefatos.Runtime, "exists", staticmethod(lambda: True))
+    monkeypatch.setattr(artefatos.Runtime, "instance", staticmethod(lambda: _Runtime({"b"})))
+
+    assert artefatos._reservar("novo", 100)  # "a" saiu: a memória dela volta a contar como livre
+    assert set(artefatos._em_memoria) == {("b", "doc"), ("", "novo")}
+
+
+def test_sem_espaco_com_sessoes_ativas(monkeypatch):
+    monkeypatch.setattr(artefatos, "_em_memoria", {("a", "doc"): (artefatos.MAX_MEMORIA, 0.0)})
+    monkeypatch.setattr(artefatos.Runtime, "exists", staticmethod(lambda: True))
+    monkeypatch.setattr(artefatos.Runtime, "instance", staticmethod(lambda: _Runtime({"a"})))
+
+    assert not artefatos._reservar("novo", 100)
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from orcamentos import cotacao, lote_jsonl
+
+
+@pytest.mark.parametrize("valor", [float("nan"), float("inf"), -float("inf"), True, "1e400", 1e9])
+def test_num_invalido_vira_erro_de_entrada(valor):
+    with pytest.raises(cotacao.ErroEntrada):
+        cotacao.cotar({"produto": "vla", "preco_capa": valor, "qtd": 10})
+
+
+def test_quantidade_acima_do_teto():
+    with pytest.raises(cotacao.ErroEntrada):
+        cotacao.cotar({"produto": "revisao", "palavras": cotacao.MAX_QTD + 1})
+
+
+def test_lote_nunca_escreve_nan():
+    ok, linha = lote_jsonl._processar((1, '{"produto": "vla", "preco_capa": NaN, "qtd": 10}'))
+    assert not ok and "preco_capa" in json.loads(linha)["erro"]
+
+    ok, linha = lote_jsonl._processar((2, '{"id": NaN, "produto": "vla", "preco_capa": 50, "qtd": 10}'))
+    assert not ok
+    json.loads(linha, parse_constant=lambda c: pytest.fail(f"{c} na saída"))
+
+
+def test_api_responde_422_para_nan():
+    testclient = pytest.importorskip("starlette.testclient")
+    from orcamentos import api
+
+    with testclient.TestClient(api.app) as cliente:
+        r = cliente.post("/vla", content='{"preco_capa": NaN, "qtd": 10}',
+                         headers={"Content-Type": "application/json"})
+    assert r.status_code == 422
+
+
+def test_resumo_do_lote_retomado_conta_o_lote_inteiro(tmp_path, capsys):
+    entrada = tmp_path / "pedidos.jsonl"
+    entrada.write_text('{"produto": "vla", "preco_capa": 50, "qtd": 10}\n'
+                       '{"produto": "vla"}\n'
+                       '{"produto": "vla", "preco_capa": 60, "qtd": 10}\n', encoding="utf-8")
+    saida, checkpoint = tmp_path / "saida.jsonl", tmp_path / "ck.json"
+    # simula uma queda depois das duas primeiras linhas
+    lote_jsonl.main([str(entrada), "-o", str(saida), "--processos", "0"])
+    duas = b"".join(saida.read_bytes().splitlines(keepends=True)[:2])
+    saida.write_bytes(duas)
+    lote_jsonl._gravar_checkpoint(checkpoint, {"entrada": str(entrada), "linha": 2, "bytes": len(duas),
+                                               "ok": 1, "erros": 1})
+    capsys.readouterr()
+
+    lote_jsonl.main([str(entrada), "-o", str(saida), "--checkpoint", str(checkpoint), "--processos", "0"])
+    assert "3 linhas (1 com erro); 1 nesta execução" in capsys.readouterr().err
+    assert len(saida.read_bytes().splitlines()) == 3
@@ -0,0 +1,22 @@
+from orcamentos import desempenho
+
+
+def test_desligado_nao_registra_nada(monkeypatch):
+    monkeypatch.setattr(desempenho, "ATIVO", False)
+    antes = (desempenho.resumo(), desempenho.contadores(), len(desempenho.eventos(limite=10_000)))
+
+    desempenho.registrar("teste.pagina", 10_000.0)
+    desempenho.fim_rerun("teste.pagina", 0.0)
+    desempenho.registrar_etapa("teste.etapa", 5.0)
+    desempenho.contar("teste.contador")
+    desempenho.tamanho("teste.bytes", 123)
+    assert desempenho.medir("teste.fragmento")(lambda x: x + 1)(1) == 2
+
+    depois = (desempenho.resumo(), desempenho.contadores(), len(desempenho.eventos(limite=10_000)))
+    assert depois == antes
+
+
+def test_ligado_registra_rerun(monkeypatch):
+    monkeypatch.setattr(desempenho, "ATIVO", True)
+    desempenho.registrar("teste.ligado", 1.0)
+    assert "teste.ligado" in desempenho.resumo()
@@ -0,0 +1,20 @@
+from collections import OrderedDict
+
+from orcamentos import incremental
+
+
+def _marcar(*hashes):
+    with incremental._lock:
+        for h in hashes:
+            incremental._marcar_completo(h)
+
+
+def test_modelos_so_completos_tem_teto(monkeypatch):
+    monkeypatch.setattr(incremental, "_completos", OrderedDict())
+    _marcar("h0", "h1")
+    assert incremental._so_completo("h0")  # usado: vai para o fim da fila
+    _marcar(*(f"n{i}" for i in range(incremental.MAX_COMPLETOS - 1)))
+
+    assert len(incremental._completos) == incremental.MAX_COMPLETOS
+    assert incremental._so_completo("h0")
+    assert not incremental._so_completo("h1")
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from orcamentos.politicas import PoliticaInvalida, TabelaDescontos
+
+FAIXAS = [
+    {"min": 1, "max": 49, "pct": 0},
+    {"min": 50, "max": 99, "pct": 20},
+    {"min": 100, "max": None, "pct": 35},
+]
+
+
+def test_faixas_fora_de_ordem_sao_ordenadas():
+    tabela = TabelaDescontos("ok", list(reversed(FAIXAS)))
+    assert tabela.inicios == (1, 50, 100)
+    assert [tabela.pct(q) for q in (1, 49, 50, 99, 100, 10_000)] == [0, 0, 20, 20, 35, 35]
+
+
+def test_vetor_igual_ao_escalar():
+    tabela = TabelaDescontos("ok", FAIXAS)
+    qtds = np.arange(1, 300)
+    assert tabela.pcts_vetor(qtds).tolist() == [tabela.pct(int(q)) for q in qtds]
+
+
+def test_descricao_omite_faixas_sem_desconto():
+    assert TabelaDescontos("ok", FAIXAS).descricao() == "50–99: 20%, 100+: 35%"
+
+
+@pytest.mark.parametrize("faixas, mensagem", [
+    ([], "sem faixas"),
+    ([{"min": 2, "max": None, "pct": 0}], "começar em 1"),
+    ([{"min": 1, "max": 60, "pct": 0}, {"min": 50, "max": None, "pct": 10}], "sobrepostas"),
+    ([{"min": 1, "max": None, "pct": 0}, {"min": 50, "max": None, "pct": 10}], "sobrepostas"),
+    ([{"min": 1, "max": 40, "pct": 0}, {"min": 50, "max": None, "pct": 10}], "lacuna"),
+    ([{"min": 1, "max": 49, "pct": 0}, {"min": 50, "max": None, "pct": 120}], "fora de 0–100"),
+    ([{"min": 1, "max": 49, "pct": -1}, {"min": 50, "max": None, "pct": 10}], "fora de 0–100"),
+    ([{"min": 1, "max": 49, "pct": 0}, {"min": 50, "max": 99, "pct": 10}], "deve ser aberta"),
+])
+def test_politica_invalida(faixas, mensagem):
+    with pytest.raises(PoliticaInvalida, match=mensagem):
+        TabelaDescontos("x", faixas)
+
+
+def test_quantidade_abaixo_da_primeira_faixa():
+    tabela = TabelaDescontos("ok", FAIXAS)
+    with pytest.raises(ValueError):
+        tabela.pct(0)
+    with pytest.raises(ValueError):
+        tabela.pcts_vetor([5, 0])
@@ -0,0 +1,34 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from orcamentos import modelos, processos
+from orcamentos.cotacao import MODELO_REVISAO
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+TOLERANCIA = 0.5  # a mesma de tools/carga_render.py
+
+
+def test_pool_gera_o_mesmo_documento():
+    import carga_render
+
+    dados, h = modelos.ler_arquivo(MODELO_REVISAO)
+    contexto = carga_render._contexto_revisao()
+    assert (processos.renderizar(dados, contexto, h, usar_cache=False)
+            == modelos.renderizar(dados, contexto, h, usar_cache=False))
+
+
+@pytest.mark.skipif((os.cpu_count() or 1) < 2, reason="com 1 CPU o pool não isola o render (processos.ISOLA)")
+@pytest.mark.skipif(processos.PROCESSOS <= 0, reason="sem pool de processos (ORCAMENTO_RENDER_PROCESSOS=0 ou sem fork)")
+def test_p95_dos_reruns_estavel_com_renders_no_pool():
+    """Rerun de uma sessão com 4 renders simultâneos no pool: p95 até 50% acima do base."""
+    import carga_render
+
+    processos.aquecer([MODELO_REVISAO])
+    base = carga_render.medir("base", 0, 30)
+    com_renders = carga_render.medir("processos", 4, 30)
+    assert com_renders["renders_s"] > 0
+    assert com_renders["p95"] <= base["p95"] * (1 + TOLERANCIA), (base, com_renders)
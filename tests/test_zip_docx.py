@@ -0,0 +1,74 @@
+import io
+import zipfile
+
+import pytest
+
+from orcamentos import eliv, modelos, revisao, zip_docx
+from orcamentos.cotacao import MODELO_REVISAO
+
+
+def _contexto_revisao() -> dict:
+    calc = revisao.calcular(85_000, 0.03, 20.0, 4, aplicar_desconto=True)
+    return revisao.montar_contexto(calc, "Prof. João Silva", "Lucas Martins", "", "01/03/2026", "31/03/2026")
+
+
+def _contexto_comum() -> dict:
+    pac = eliv.calcular_pacote("Especial", eliv.FORMAS[0], 15.0)
+    return eliv.contexto_comum(pac, "Prof. João Silva", "Lucas Martins", "Obra", 250, "")
+
+
+CASOS = [(MODELO_REVISAO, _contexto_revisao), (eliv.TEMPLATE_COMUM, _contexto_comum)]
+
+
+def _membros(docx: bytes) -> list[tuple[str, bytes]]:
+    with zipfile.ZipFile(io.BytesIO(docx)) as z:
+        assert z.testzip() is None
+        return [(i.filename, z.read(i)) for i in z.infolist()]
+
+
+def _comprimidos(docx: bytes) -> dict[str, bytes]:
+    """Bytes comprimidos de cada membro, como estão no arquivo."""
+    saida = {}
+    with zipfile.ZipFile(io.BytesIO(docx)) as z:
+        for i in z.infolist():
+            inicio = i.header_offset + 30 + len(i.filename.encode()) + len(i.extra)
+            saida[i.filename] = docx[inicio:inicio + i.compress_size]
+    return saida
+
+
+@pytest.mark.parametrize("caminho, contexto", CASOS)
+def test_mesmo_conteudo_que_tpl_save(caminho, contexto):
+    dados, h = modelos.ler_arquivo(caminho)
+    ctx = contexto()
+    rapido = modelos.renderizar(dados, ctx, h, usar_cache=False)
+    tpl = modelos.obter_modelo(dados, h)
+    tpl.render(ctx)
+    buf = io.BytesIO()
+    tpl.save(buf)
+    assert _membros(rapido) == _membros(buf.getvalue())
+
+
+@pytest.mark.parametrize("caminho, contexto", CASOS)
+def test_membros_sem_mudanca_sao_copiados_byte_a_byte(caminho, contexto):
+    dados, h = modelos.ler_arquivo(caminho)
+    tpl, ref = modelos._clonar(dados, h)
+    tpl.render(contexto())
+    buf = io.BytesIO()
+    copiados, comprimidos = zip_docx.gravar(tpl.docx.part.package, buf, ref, data_hora=modelos.DATA_ZIP)
+    assert copiados > 0 and comprimidos > 0
+    saida = _comprimidos(buf.getvalue())
+    iguais = [nome for nome, m in ref.items() if saida.get(nome) == m.comprimido]
+    assert len(iguais) == copiados
+
+
+def test_mesma_entrada_mesmos_bytes():
+    dados, h = modelos.ler_arquivo(MODELO_REVISAO)
+    ctx = _contexto_revisao()
+    assert modelos.renderizar(dados, ctx, h, usar_cache=False) == modelos.renderizar(dados, ctx, h, usar_cache=False)
+
+
+def test_escrever_gera_zip_valido():
+    itens = [("a.xml", zip_docx.membro(b"<a/>" * 100)), ("pasta/ção.txt", zip_docx.membro("olá".encode()))]
+    buf = io.BytesIO()
+    zip_docx.escrever(itens, buf, data_hora=(2024, 5, 17, 10, 30, 0))
+    assert _membros(buf.getvalue()) == [("a.xml", b"<a/>" * 100), ("pasta/ção.txt", "olá".encode())]
@@ -0,0 +1,222 @@
+"""Micro-benchmarks da geração de orçamentos, sem navegador.
+
+Mede formatação (br_money/br_int/escape_md), consulta de faixas de desconto
+(pct_por_qtd), montagem dos contextos e a renderização dos três modelos DOCX
+pelo mesmo caminho das páginas (ler_arquivo + renderizar, usado por
+``_render_docx`` na Revisão e ``render_docxtpl`` no ELIV), além da contagem de
+palavras de um manuscrito de ~1.000 páginas (.txt e .docx). Para cada caso grava
+p50/p95 por chamada e o pico de memória (tracemalloc) de uma chamada.
+
+    python tools/bench.py                            # relatório
+    python tools/bench.py --salvar base.json         # grava baseline
+    python tools/bench.py --comparar base.json       # exit 1 se piorar
+    python tools/bench.py --filtro render            # só os casos "render*"
+"""
+import argparse
+import functools
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from orcamentos import eliv, incremental, manuscritos, modelos, pdf_nativo, processos, revisao, vla  # noqa: E402
+from orcamentos.formatacao import br_int, br_money, escape_md  # noqa: E402
+from orcamentos.politicas import pct_por_qtd  # noqa: E402
+
+MODELO_REVISAO = RAIZ / "modelo_dialetica.docx"
+DATA = "18/10/2026"
+
+
+def _contexto_revisao() -> dict:
+    calc = revisao.calcular(85_000, 0.03, 20.0, 4)
+    return revisao.montar_contexto(calc, "Prof. João Silva", "Lucas Martins", "Entrega em duas etapas.",
+                                   DATA, "17/11/2026")
+
+
+def _contexto_comum() -> dict:
+    pac = eliv.calcular_pacote("Especial", eliv.FORMAS[0], 15)
+    return eliv.contexto_comum(pac, "Prof. João Silva", "Lucas Martins", "Dicionário Temático", 250,
+                               "", data=DATA)
+
+
+def _contexto_universidade() -> dict:
+    pac = eliv.calcular_pacote("Premium", eliv.FORMAS[0], 15)
+    tir = eliv.calcular_tiragem(75.0, 300, 30)
+    return eliv.contexto_universidade(pac, tir, "Prof. João Silva", "Dicionário Temático", 250,
+                                      "Universidade Federal de Viçosa", "(31) 99999-0000", "Profa.", 39.9,
+                                      data=DATA)
+
+
+def _render(caminho: Path, contexto):
+    def caso():
+        dados, h = modelos.ler_arquivo(caminho)
+        return modelos.renderizar(dados, contexto(), h, usar_cache=False)
+    return caso
+
+
+def _render_cache(caminho: Path, contexto):
+    def caso():
+        dados, h = modelos.ler_arquivo(caminho)
+        return modelos.renderizar(dados, contexto(), h)
+    return caso
+
+
+def _render_revisao_incremental():
+    # revisão de um orçamento já gerado: só desconto e parcelas mudam (esqueleto já montado)
+    calc = revisao.calcular(85_000, 0.03, 25.0, 5)
+    ctx = {**_contexto_revisao(), **{k: v for k, v in revisao.montar_contexto(calc, "", "", "", "", "").items()
+                                     if k in incremental.VARIAVEIS}}
+
+    def caso():
+        dados, h = modelos.ler_arquivo(MODELO_REVISAO)
+        return incremental._incremental(dados, ctx, h, incremental.VARIAVEIS, None)
+    return caso
+
+
+def _contexto_vla() -> dict:
+    return vla.montar_contexto(vla.calcular("Literário", 84.9, 350), "Autor", "Consultor", data_hoje=DATA)
+
+
+def _pdf(layout: str, contexto):
+    def caso():
+        return pdf_nativo.gerar_sem_cache(layout, contexto())
+    return caso
+
+
+def _interpretar(caminho: Path):
+    def caso():
+        return modelos._interpretar(caminho.read_bytes())
+    return caso
+
+
+@functools.lru_cache
+def _tese(formato: str) -> bytes:
+    # ~1.000 páginas: 12.000 parágrafos de 30 palavras (360.000 palavras)
+    vocab = "a pesquisa análise metodologia educação guarda-chuva d'água 1.000,50 resultado teórico".split()
+    paragrafo = " ".join(vocab[i % len(vocab)] for i in range(30))
+    if formato == "txt":
+        return "\n".join([paragrafo] * 12_000).encode()
+    corpo = f"<w:p><w:r><w:t>{paragrafo[:100]}</w:t></w:r><w:r><w:t>{paragrafo[100:]}</w:t></w:r></w:p>" * 12_000
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("word/document.xml", f'<?xml version="1.0"?><w:document><w:body>{corpo}</w:body></w:document>')
+    return buf.getvalue()
+
+
+def _contar_tese(formato: str):
+    def caso():
+        return manuscritos._contar(f"tese.{formato}", _tese(formato), "")
+    return caso
+
+
+_QTDS = list(range(1, 5001, 7))
+_VALORES = [i * 13.37 for i in range(500)]
+
+# nome -> (função sem argumentos, chamadas por amostra)
+CASOS = {
+    "formatacao.br_money": (lambda: [br_money(v) for v in _VALORES], len(_VALORES)),
+    "formatacao.br_int": (lambda: [br_int(int(v)) for v in _VALORES], len(_VALORES)),
+    "formatacao.escape_md": (lambda: [escape_md(f"R$ {v}_x") for v in _VALORES], len(_VALORES)),
+    "politicas.pct_por_qtd": (lambda: [pct_por_qtd(q, "Acadêmico") for q in _QTDS], len(_QTDS)),
+    "contexto.revisao": (_contexto_revisao, 1),
+    "contexto.vla": (lambda: vla.montar_script(vla.calcular("Literário", 84.9, 350), "Autor", "Consultor",
+                                               True, data_hoje=DATA), 1),
+    "contexto.eliv_comum": (_contexto_comum, 1),
+    "contexto.eliv_universidade": (_contexto_universidade, 1),
+    "modelo.interpretar_revisao": (_interpretar(MODELO_REVISAO), 1),
+    "render.revisao": (_render(MODELO_REVISAO, _contexto_revisao), 1),
+    "render.eliv_comum": (_render(eliv.TEMPLATE_COMUM, _contexto_comum), 1),
+    "render.eliv_universidade": (_render(eliv.TEMPLATE_UNI, _contexto_universidade), 1),
+    "render.revisao_cache": (_render_cache(MODELO_REVISAO, _contexto_revisao), 1),
+    "render.revisao_incremental": (_render_revisao_incremental(), 1),
+    "pdf.revisao": (_pdf("revisao", _contexto_revisao), 1),
+    "pdf.eliv_comum": (_pdf("eliv_comum", _contexto_comum), 1),
+    "pdf.eliv_universidade": (_pdf("eliv_universidade", _contexto_universidade), 1),
+    "pdf.vla": (_pdf("vla", _contexto_vla), 1),
+    "manuscrito.txt_1000_paginas": (_contar_tese("txt"), 1),
+    "manuscrito.docx_1000_paginas": (_contar_tese("docx"), 1),
+}
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def medir_caso(fn, por_amostra: int, segundos: float, min_amostras: int) -> dict:
+    fn()  # aquecimento: imports preguiçosos e cache de modelos
+    amostras = []
+    fim = time.perf_counter() + segundos
+    while len(amostras) < min_amostras or time.perf_counter() < fim:
+        t0 = time.perf_counter_ns()
+        fn()
+        amostras.append((time.perf_counter_ns() - t0) / por_amostra / 1000)
+    # memória medida à parte: o tracemalloc deixa tudo bem mais lento
+    tracemalloc.start()
+    fn()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "n": len(amostras) * por_amostra,
+        "p50_us": round(_percentil(amostras, 50), 3),
+        "p95_us": round(_percentil(amostras, 95), 3),
+        "pico_kib": round(pico / 1024, 1),
+    }
+
+
+def comparar(atual: dict, base: dict, tolerancia: float) -> list[str]:
+    """Lista de regressões (p50 ou pico de memória acima da tolerância)."""
+    problemas = []
+    for nome, r in atual.items():
+        anterior = base.get(nome)
+        if not anterior:
+            continue
+        for chave in ("p50_us", "pico_kib"):
+            if anterior[chave] and r[chave] > anterior[chave] * (1 + tolerancia):
+                problemas.append(f"{nome}: {chave} {anterior[chave]} → {r[chave]}")
+    return problemas
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--segundos", type=float, default=1.0, help="tempo mínimo por caso")
+    ap.add_argument("--min-amostras", type=int, default=20)
+    ap.add_argument("--filtro", default="", help="só casos cujo nome contém este texto")
+    ap.add_argument("--salvar", type=Path)
+    ap.add_argument("--comparar", type=Path)
+    ap.add_argument("--tolerancia", type=float, default=0.20, help="piora relativa aceita (0.20 = 20%%)")
+    ap.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = ap.parse_args()
+    processos.PROCESSOS = 0  # renders medidos neste processo, sem o pool
+
+    casos = {k: v for k, v in CASOS.items() if args.filtro in k}
+    resultados = {nome: medir_caso(fn, n, args.segundos, args.min_amostras) for nome, (fn, n) in casos.items()}
+    saida = {"python": platform.python_version(), "maquina": platform.machine(), "casos": resultados}
+
+    if args.json:
+        print(json.dumps(saida, indent=2, ensure_ascii=False))
+    else:
+        for nome, r in resultados.items():
+            print(f"{nome:30s} p50={r['p50_us']:11.3f} µs  p95={r['p95_us']:11.3f} µs  "
+                  f"pico={r['pico_kib']:9.1f} KiB  (n={r['n']})")
+
+    falhou = False
+    if args.comparar:
+        base = json.loads(args.comparar.read_text())["casos"]
+        for linha in comparar(resultados, base, args.tolerancia):
+            falhou = True
+            print(f"REGRESSÃO: {linha}", file=sys.stderr)
+    if args.salvar:
+        args.salvar.write_text(json.dumps(saida, indent=2, ensure_ascii=False))
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
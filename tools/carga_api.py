@@ -0,0 +1,123 @@
+"""Teste de carga da API de orçamentos (orcamentos/api.py), só com a stdlib.
+
+Sobe N clientes (threads com conexão keep-alive) contra uma API já rodando e
+mede requisições/s sustentadas e latência p50/p95/p99 por endpoint.
+
+    uvicorn orcamentos.api:app --port 8000 --workers 4 &
+    python tools/carga_api.py --url http://127.0.0.1:8000 --clientes 32 --segundos 20
+    python tools/carga_api.py --docx     # inclui renderização do DOCX nas cotações
+"""
+import argparse
+import http.client
+import json
+import random
+import socket
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+CORPOS = {
+    "/revisao": lambda docx: {"palavras": random.randrange(1000, 200000, 100), "valor_palavra": 0.03,
+                              "desconto_pct": random.choice([0, 10, 20, 25]), "parcelas": random.randint(1, 6),
+                              "cliente": "Cliente Teste", "consultor": "Consultor", "docx": docx},
+    "/vla": lambda docx: {"tipo": random.choice(["Acadêmico", "Literário"]), "preco_capa": 84.90,
+                          "qtd": random.randint(1, 3000), "cliente": "Autor Teste"},
+    "/eliv": lambda docx: {"pacote": random.choice(["Básico", "Especial", "Premium"]),
+                           "forma_pag": "6x sem juros", "desconto_pct": random.randint(0, 40),
+                           "cliente": "Cliente Teste", "obra": "Obra", "paginas": 250, "docx": docx},
+}
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def _conectar(host: str, porta: int) -> http.client.HTTPConnection:
+    conn = http.client.HTTPConnection(host, porta, timeout=30)
+    conn.connect()
+    # sem isso o Nagle + ACK atrasado somam ~40 ms a cada requisição
+    conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return conn
+
+
+def _cliente(host: str, porta: int, fim: float, docx: bool, lat: dict, erros: dict, lock: threading.Lock):
+    conn = _conectar(host, porta)
+    locais = defaultdict(list)
+    falhas = defaultdict(int)
+    while time.perf_counter() < fim:
+        caminho = random.choice(list(CORPOS))
+        corpo = json.dumps(CORPOS[caminho](docx)).encode()
+        t0 = time.perf_counter()
+        try:
+            conn.request("POST", caminho, body=corpo, headers={"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status != 200:
+                falhas[caminho] += 1
+                continue
+        except (OSError, http.client.HTTPException):
+            falhas[caminho] += 1
+            conn.close()
+            conn = _conectar(host, porta)
+            continue
+        locais[caminho].append((time.perf_counter() - t0) * 1000)
+    conn.close()
+    with lock:
+        for k, v in locais.items():
+            lat[k].extend(v)
+        for k, v in falhas.items():
+            erros[k] += v
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--clientes", type=int, default=16)
+    ap.add_argument("--segundos", type=float, default=15)
+    ap.add_argument("--docx", action="store_true")
+    ap.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = ap.parse_args()
+
+    u = urlparse(args.url)
+    lat: dict[str, list[float]] = defaultdict(list)
+    erros: dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    inicio = time.perf_counter()
+    fim = inicio + args.segundos
+    threads = [threading.Thread(target=_cliente, args=(u.hostname, u.port or 80, fim, args.docx, lat, erros, lock))
+               for _ in range(args.clientes)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duracao = time.perf_counter() - inicio
+
+    total = sum(len(v) for v in lat.values())
+    resultado = {
+        "clientes": args.clientes,
+        "segundos": round(duracao, 2),
+        "docx": args.docx,
+        "req_por_s": round(total / duracao, 1),
+        "erros": dict(erros),
+        "endpoints": {
+            k: {"n": len(v), "p50_ms": round(_percentil(v, 50), 2), "p95_ms": round(_percentil(v, 95), 2),
+                "p99_ms": round(_percentil(v, 99), 2)}
+            for k, v in sorted(lat.items())
+        },
+    }
+    if args.json:
+        print(json.dumps(resultado, indent=2, ensure_ascii=False))
+        return
+    print(f"{total} requisições em {duracao:.1f}s com {args.clientes} clientes → {resultado['req_por_s']} req/s")
+    for k, r in resultado["endpoints"].items():
+        print(f"  {k:10s} n={r['n']:6d}  p50={r['p50_ms']:7.2f} ms  p95={r['p95_ms']:7.2f} ms  p99={r['p99_ms']:7.2f} ms")
+    if erros:
+        print(f"  erros: {dict(erros)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+"""Teste de carga das páginas: N sessões simultâneas contra um ``streamlit run`` local.
+
+Sobe o servidor (``streamlit run app.py`` numa porta livre, sem navegador) e
+abre N sessões pelo mesmo websocket que o navegador usa (``/_stcore/stream``),
+com as mensagens do protocolo do Streamlit (BackMsg/ForwardMsg) e o cliente de
+websocket do tornado, que já vem com o Streamlit. Cada sessão faz o fluxo de um
+consultor na Revisão (app.py), na Calculadora VLA ou no ELIV: digitar os nomes
+e aplicar o formulário, mudar as entradas, gerar o DOCX e o PDF. Cliques em
+``@st.fragment`` rerodam só o fragmento, como no navegador.
+
+As sessões se alternam entre as páginas e repetem o fluxo ``--rodadas`` vezes
+(todas juntas, rodada a rodada), com valores sorteados a partir de
+``--semente``: a mesma semente repete a mesma carga. Antes da medição, uma
+sessão por página faz o fluxo uma vez (imports, modelos, pool de processos).
+
+Relatório:
+
+- latência de cada rerun, do envio até o ``script_finished`` (p50/p95/p99),
+  no geral e por página/passo;
+- documentos gerados por segundo;
+- RSS do servidor (Linux, /proc): quanto cada sessão aberta acrescenta
+  (depois da primeira rodada) e quanto ele cresce por rodada depois disso.
+  As mesmas sessões refazendo o mesmo fluxo deveriam ficar perto de zero; o
+  RSS dos processos de render (``orcamentos.processos``) sai à parte.
+  Caches limitados também crescem até encher (o ``orcamentos.cache_saida``
+  guarda cada DOCX/PDF gerado): para procurar vazamento, use ``--sem-cache``
+  e várias rodadas.
+
+    python tools/carga_paginas.py                           # 6 sessões, 3 rodadas
+    python tools/carga_paginas.py --sessoes 24 --rodadas 5 --pausa 0.5
+    python tools/carga_paginas.py --sem-cache               # todo documento é renderizado
+    python tools/carga_paginas.py --salvar base.json
+    python tools/carga_paginas.py --comparar base.json      # exit 1 se piorar
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+_CLIENTES = ["Prof. João Silva", "Dra. Maria Souza", "Ana Lima", "Carlos Pereira", "Profa. Beatriz Rocha"]
+_CONSULTORES = ["Lucas Martins", "Fernanda Alves", "Rafael Costa"]
+
+# página -> (page_name da URL, [(passo, ação, rótulo, valor sorteado)]); passos "docx"/"pdf" geram documento.
+# Ações: "form" (campos de texto + botão de envio), "numero", "slider", "checkbox", "clicar".
+FLUXOS = {
+    "revisao": ("", [
+        ("dados", "form", "Aplicar dados", lambda rng: {"Nome do cliente": rng.choice(_CLIENTES),
+                                                        "Consultor": rng.choice(_CONSULTORES)}),
+        ("palavras", "numero", "Contagem de palavras", lambda rng: rng.randrange(5_000, 200_000, 100)),
+        ("desconto", "numero", "% de desconto", lambda rng: rng.choice([0, 10, 15, 20, 25])),
+        ("docx", "clicar", "📄 Gerar DOCX", None),
+        ("pdf", "clicar", "🧾 Gerar PDF", None),
+    ]),
+    "vla": ("Calculadora_VLA", [
+        ("dados", "form", "Aplicar", lambda rng: {"Nome do autor": rng.choice(_CLIENTES),
+                                                  "Consultor": rng.choice(_CONSULTORES)}),
+        ("preco", "numero", "Preço de capa (R$)", lambda rng: round(rng.uniform(40, 120), 2)),
+        ("tiragem", "numero", "Quantidade (tiragem)", lambda rng: rng.randrange(50, 3000, 10)),
+        ("emojis", "checkbox", "Adicionar emojis no texto", lambda rng: rng.random() < 0.5),
+        ("pdf", "clicar", "🧾 Gerar PDF", None),
+    ]),
+    "eliv": ("Orcamentos_Eliv", [
+        ("dados", "form", "Aplicar", lambda rng: {"Nome do cliente": rng.choice(_CLIENTES),
+                                                  "Consultor": rng.choice(_CONSULTORES),
+                                                  "Título da obra": f"Obra {rng.randrange(1000)}"}),
+        ("paginas", "numero", "Nº de páginas", lambda rng: rng.randrange(60, 800, 10)),
+        ("desconto", "slider", "% de desconto no pacote", lambda rng: rng.randrange(0, 41, 5)),
+        ("docx", "clicar", "Gerar DOCX – Comum", None),
+        ("pdf", "clicar", "Gerar PDF – Comum", None),
+    ]),
+}
+
+FOLGA_RSS_MIB = 0.5  # ruído do RSS por sessão em --comparar
+_TIPOS_WIDGET = {"button", "download_button", "number_input", "text_input", "slider", "checkbox"}
+
+
+class ErroDePasso(RuntimeError):
+    pass
+
+
+# ------------------------- uma sessão (navegador) -------------------------
+class Sessao:
+    def __init__(self, url_ws: str, pagina: str, rng: random.Random, pausa: float):
+        self.url_ws, self.pagina, self.rng, self.pausa = url_ws, pagina, rng, pausa
+        self.page_name, self.passos = FLUXOS[pagina]
+        self.ws = None
+        # (tipo, rótulo) -> (id, fragment_id): o último widget visto com esse rótulo
+        self.widgets: dict[tuple[str, str], tuple[str, str]] = {}
+        # valores que o "navegador" mantém e reenvia a cada rerun
+        self.valores: dict[str, WidgetState] = {}
+
+    async def conectar(self) -> None:
+        self.ws = await websocket_connect(self.url_ws, subprotocols=["streamlit"], max_message_size=256 * 2**20)
+
+    def fechar(self) -> None:
+        if self.ws is not None:
+            self.ws.close()
+
+    def _widget(self, tipo: str, rotulo: str) -> tuple[str, str]:
+        try:
+            return self.widgets[(tipo, rotulo)]
+        except KeyError:
+            raise ErroDePasso(f"widget não encontrado: {tipo} {rotulo!r}") from None
+
+    async def rerun(self, gatilho: str | None = None, fragmento: str = "") -> tuple[float, list]:
+        """Reroda a página (ou o fragmento) e espera o fim. Devolve (ms, elementos recebidos)."""
+        msg = BackMsg()
+        estado = msg.rerun_script
+        estado.page_name = self.page_name
+        estado.widget_states.widgets.extend(self.valores.values())
+        if gatilho:
+            estado.widget_states.widgets.add(id=gatilho, trigger_value=True)
+        if fragmento:
+            estado.fragment_id = fragmento
+        t0 = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        elementos = []
+        while True:
+            dados = await self.ws.read_message()
+            if dados is None:
+                raise ErroDePasso("o servidor fechou o websocket")
+            fm = ForwardMsg()
+            fm.ParseFromString(dados)
+            tipo = fm.WhichOneof("type")
+            if tipo == "delta" and fm.delta.WhichOneof("type") == "new_element":
+                el = fm.delta.new_element
+                tipo_el = el.WhichOneof("type")
+                if tipo_el in _TIPOS_WIDGET:
+                    w = getattr(el, tipo_el)
+                    self.widgets[(tipo_el, w.label)] = (w.id, fm.delta.fragment_id)
+                elementos.append(el)
+            elif tipo == "script_finished":
+                if fm.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise ErroDePasso("erro de compilação na página")
+                return (time.perf_counter() - t0) * 1000, elementos
+
+    async def passo(self, acao: str, rotulo: str, valor) -> tuple[float, list]:
+        if acao == "form":
+            for campo, texto in valor.items():
+                id_, _ = self._widget("text_input", campo)
+                self.valores[id_] = WidgetState(id=id_, string_value=texto)
+            id_, frag = self._widget("button", rotulo)
+            return await self.rerun(id_, frag)
+        if acao == "clicar":
+            id_, frag = self._widget("button", rotulo)
+            return await self.rerun(id_, frag)
+        tipo = {"numero": "number_input", "slider": "slider", "checkbox": "checkbox"}[acao]
+        id_, frag = self._widget(tipo, rotulo)
+        if acao == "numero":
+            self.valores[id_] = WidgetState(id=id_, double_value=valor)
+        elif acao == "slider":
+            self.valores[id_] = WidgetState(id=id_, double_array_value={"data": [valor]})
+        else:
+            self.valores[id_] = WidgetState(id=id_, bool_value=valor)
+        return await self.rerun(fragmento=frag)
+
+
+def _falhas(elementos: list) -> list[str]:
+    falhas = []
+    for el in elementos:
+        tipo = el.WhichOneof("type")
+        if tipo == "exception":
+            falhas.append(f"{el.exception.type}: {el.exception.message}")
+        elif tipo == "alert" and el.alert.format in (Alert.ERROR, Alert.WARNING):
+            falhas.append(el.alert.body)
+    return falhas
+
+
+def _documento_oferecido(elementos: list) -> bool:
+    """O rerun terminou com um botão ou link de download (ver artefatos.oferecer)."""
+    for el in elementos:
+        tipo = el.WhichOneof("type")
+        if tipo == "download_button" and "Baixar" in el.download_button.label:
+            return True
+        if tipo == "markdown" and "download=" in el.markdown.body:
+            return True
+    return False
+
+
+# ------------------------- servidor e memória -------------------------
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def servidor(porta: int, sem_cache: bool):
+    env = {**os.environ, "ORCAMENTO_HISTORICO": os.environ.get("ORCAMENTO_HISTORICO", "0")}
+    if sem_cache:
+        env["ORCAMENTO_CACHE"] = "0"
+    cmd = [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+           "--server.port", str(porta), "--server.address", "127.0.0.1", "--server.fileWatcherType", "none",
+           "--browser.gatherUsageStats", "false"]
+    with tempfile.TemporaryFile("w+") as log:
+        proc = subprocess.Popen(cmd, cwd=RAIZ, env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            limite = time.monotonic() + 60
+            while True:
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=2) as r:
+                        if r.status == 200:
+                            break
+                except OSError:
+                    pass
+                if proc.poll() is not None or time.monotonic() > limite:
+                    log.seek(0)
+                    raise RuntimeError(f"o servidor não subiu:\n{log.read()[-3000:]}")
+                time.sleep(0.2)
+            yield proc
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+def _rss_mib(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for linha in f:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _filhos(pid: int) -> list[int]:
+    filhos = []
+    try:
+        for tarefa in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tarefa}/children") as f:
+                filhos.extend(int(p) for p in f.read().split())
+    except OSError:
+        pass
+    return filhos
+
+
+def memoria(pid: int) -> tuple[float, float]:
+    """(RSS do servidor, soma do RSS dos filhos) em MiB; (0, 0) fora do Linux."""
+    return _rss_mib(pid), sum(_rss_mib(f) for f in _filhos(pid))
+
+
+# ------------------------- carga -------------------------
+def _percentis(valores: list[float]) -> dict:
+    ordenados = sorted(valores)
+    if not ordenados:
+        return {"n": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    return {"n": len(ordenados),
+            **{f"p{p}": round(ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))], 1)
+               for p in (50, 95, 99)}}
+
+
+class Carga:
+    def __init__(self, url_ws: str, pid: int, args: argparse.Namespace, paginas: list[str]):
+        self.url_ws, self.pid, self.args, self.paginas = url_ws, pid, args, paginas
+        self.tempos: dict[tuple[str, str], list[float]] = defaultdict(list)
+        self.documentos = 0
+        self.erros: list[str] = []
+
+    async def _medir(self, s: Sessao, passo: str, coro) -> None:
+        try:
+            ms, elementos = await coro
+        except ErroDePasso as e:
+            self.erros.append(f"{s.pagina}.{passo}: {e}")
+            return
+        self.tempos[(s.pagina, passo)].append(ms)
+        falhas = _falhas(elementos)
+        if passo in ("docx", "pdf"):
+            if _documento_oferecido(elementos):
+                self.documentos += 1
+            else:
+                falhas.append("nenhum download oferecido")
+        self.erros.extend(f"{s.pagina}.{passo}: {f}" for f in falhas)
+
+    async def _fluxo(self, s: Sessao, medir: bool = True) -> None:
+        for passo, acao, rotulo, sortear in s.passos:
+            if s.pausa > 0:
+                await asyncio.sleep(s.rng.expovariate(1 / s.pausa))  # consultor lendo/digitando
+            coro = s.passo(acao, rotulo, sortear(s.rng) if sortear else None)
+            if medir:
+                await self._medir(s, passo, coro)
+            else:
+                await coro
+
+    async def _aquecer(self) -> None:
+        for pagina in self.paginas:
+            s = Sessao(self.url_ws, pagina, random.Random(-1), 0)
+            await s.conectar()
+            await s.rerun()
+            await self._fluxo(s, medir=False)
+            s.fechar()
+
+    async def rodar(self) -> dict:
+        await self._aquecer()
+        await asyncio.sleep(1)  # o servidor solta a sessão de aquecimento
+        rss_base, _ = memoria(self.pid)
+        a = self.args
+        sessoes = [Sessao(self.url_ws, self.paginas[i % len(self.paginas)],
+                          random.Random(a.semente * 1000 + i), a.pausa) for i in range(a.sessoes)]
+        t0 = time.perf_counter()
+        await asyncio.gather(*(s.conectar() for s in sessoes))
+        await asyncio.gather(*(self._medir(s, "abrir", s.rerun()) for s in sessoes))
+        rss_rodadas, pool_rodadas = [], []
+        for _ in range(a.rodadas):
+            await asyncio.gather(*(self._fluxo(s) for s in sessoes))
+            rss, pool = memoria(self.pid)
+            rss_rodadas.append(rss)
+            pool_rodadas.append(pool)
+        duracao = time.perf_counter() - t0
+        for s in sessoes:
+            s.fechar()
+
+        todos = [ms for lista in self.tempos.values() for ms in lista]
+        crescimento = (rss_rodadas[-1] - rss_rodadas[0]) / (len(rss_rodadas) - 1) if len(rss_rodadas) > 1 else 0.0
+        return {
+            "sessoes": a.sessoes,
+            "rodadas": a.rodadas,
+            "semente": a.semente,
+            "pausa_s": a.pausa,
+            "sem_cache": a.sem_cache,
+            "duracao_s": round(duracao, 2),
+            "reruns_s": round(len(todos) / duracao, 2),
+            "documentos_s": round(self.documentos / duracao, 2),
+            "rerun_ms": _percentis(todos),
+            "passos_ms": {f"{p}.{s}": _percentis(v) for (p, s), v in sorted(self.tempos.items())},
+            "rss_base_mib": round(rss_base, 1),
+            "rss_rodadas_mib": [round(r, 1) for r in rss_rodadas],
+            "rss_pool_mib": [round(r, 1) for r in pool_rodadas],
+            "rss_por_sessao_mib": round((rss_rodadas[0] - rss_base) / a.sessoes, 2),
+            "rss_por_rodada_mib": round(crescimento, 2),
+            "erros": self.erros,
+        }
+
+
+def comparar(atual: dict, base: dict, tolerancia: float) -> list[str]:
+    """Regressões: p95 do rerun e RSS por sessão acima da tolerância."""
+    problemas = []
+    if base["rerun_ms"]["p95"] and atual["rerun_ms"]["p95"] > base["rerun_ms"]["p95"] * (1 + tolerancia):
+        problemas.append(f"rerun p95 {base['rerun_ms']['p95']} → {atual['rerun_ms']['p95']} ms")
+    # RSS por sessão é pequeno e ruidoso (~0,3 MiB): diferença abaixo de FOLGA_RSS_MIB não conta
+    limite = max(base["rss_por_sessao_mib"] * (1 + tolerancia), base["rss_por_sessao_mib"] + FOLGA_RSS_MIB)
+    if atual["rss_por_sessao_mib"] > limite:
+        problemas.append(f"RSS por sessão {base['rss_por_sessao_mib']} → {atual['rss_por_sessao_mib']} MiB")
+    return problemas
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sessoes", type=int, default=6)
+    ap.add_argument("--rodadas", type=int, default=3, help="vezes que cada sessão repete o fluxo")
+    ap.add_argument("--semente", type=int, default=1)
+    ap.add_argument("--pausa", type=float, default=0.0, help="pausa média entre passos (s); 0 = sem pausa")
+    ap.add_argument("--paginas", default=",".join(FLUXOS), help="páginas, separadas por vírgula")
+    ap.add_argument("--sem-cache", action="store_true", help="ORCAMENTO_CACHE=0: todo documento é renderizado")
+    ap.add_argument("--porta", type=int, default=0, help="porta do servidor (0 = uma livre)")
+    ap.add_argument("--limite-vazamento", type=float, default=5.0,
+                    help="crescimento máximo do RSS por rodada (MiB) antes de falhar")
+    ap.add_argument("--salvar", type=Path)
+    ap.add_argument("--comparar", type=Path)
+    ap.add_argument("--tolerancia", type=float, default=0.25, help="piora relativa aceita (0.25 = 25%%)")
+    ap.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = ap.parse_args()
+
+    paginas = [p for p in args.paginas.split(",") if p]
+    desconhecidas = set(paginas) - set(FLUXOS)
+    if desconhecidas:
+        ap.error(f"páginas desconhecidas: {', '.join(sorted(desconhecidas))}")
+    porta = args.porta or _porta_livre()
+    with servidor(porta, args.sem_cache) as proc:
+        r = asyncio.run(Carga(f"ws://127.0.0.1:{porta}/_stcore/stream", proc.pid, args, paginas).rodar())
+    saida = {"python": platform.python_version(), "maquina": platform.machine(), "cpus": os.cpu_count(),
+             "resultado": r}
+
+    if args.json:
+        print(json.dumps(saida, indent=2, ensure_ascii=False))
+    else:
+        print(f"{r['sessoes']} sessões x {r['rodadas']} rodadas em {r['duracao_s']} s: "
+              f"{r['reruns_s']} reruns/s, {r['documentos_s']} documentos/s")
+        t = r["rerun_ms"]
+        print(f"rerun              p50={t['p50']:8.1f} ms  p95={t['p95']:8.1f} ms  p99={t['p99']:8.1f} ms  (n={t['n']})")
+        for nome, t in r["passos_ms"].items():
+            print(f"  {nome:16s} p50={t['p50']:8.1f} ms  p95={t['p95']:8.1f} ms  p99={t['p99']:8.1f} ms  (n={t['n']})")
+        print(f"RSS do servidor: base {r['rss_base_mib']} MiB, por rodada {r['rss_rodadas_mib']} "
+              f"(pool de render: {r['rss_pool_mib']}); "
+              f"+{r['rss_por_sessao_mib']} MiB por sessão, {r['rss_por_rodada_mib']:+} MiB por rodada")
+        for erro in r["erros"][:20]:
+            print(f"ERRO: {erro}", file=sys.stderr)
+
+    falhou = bool(r["erros"])
+    if r["rss_por_rodada_mib"] > args.limite_vazamento:
+        falhou = True
+        print(f"VAZAMENTO: RSS cresce {r['rss_por_rodada_mib']} MiB por rodada (limite {args.limite_vazamento})",
+              file=sys.stderr)
+    if args.comparar:
+        base = json.loads(args.comparar.read_text())["resultado"]
+        for linha in comparar(r, base, args.tolerancia):
+            falhou = True
+            print(f"REGRESSÃO: {linha}", file=sys.stderr)
+    if args.salvar:
+        args.salvar.write_text(json.dumps(saida, indent=2, ensure_ascii=False))
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Latência dos reruns de uma sessão enquanto outras geram documentos.
+
+Roda a página da Calculadora VLA repetidamente (AppTest, no mesmo processo,
+como uma sessão do Streamlit) e mede p50/p95 de cada rerun em três cenários:
+
+- ``base``: nada mais rodando;
+- ``threads``: N threads renderizando DOCX no próprio processo (como antes);
+- ``processos``: as mesmas N threads, mas o render vai para ``orcamentos.processos``.
+
+Sai com código 1 se o p95 com o pool de processos passar do p95 base mais a
+tolerância. Com uma CPU só o pool não tem como isolar (``processos.ISOLA``):
+as medidas saem, mas a comparação é pulada. O mesmo critério roda no pytest
+(tests/test_processos.py).
+
+    python tools/carga_render.py
+    python tools/carga_render.py --renders 8 --reruns 60 --tolerancia 0.5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+os.environ.setdefault("ORCAMENTO_HISTORICO", "0")
+os.environ.setdefault("ORCAMENTO_CACHE", "0")  # cada render de fato renderiza
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from bench import MODELO_REVISAO, _contexto_revisao  # noqa: E402
+from orcamentos import modelos, processos  # noqa: E402
+
+PAGINA = RAIZ / "pages" / "02_Calculadora_VLA.py"
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def _renders(n: int, render, parar: threading.Event, feitos: list[int]) -> list[threading.Thread]:
+    dados, h = modelos.ler_arquivo(MODELO_REVISAO)
+    contexto = _contexto_revisao()
+
+    def laco():
+        while not parar.is_set():
+            render(dados, contexto, h)
+            feitos[0] += 1
+
+    threads = [threading.Thread(target=laco, daemon=True) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def medir(cenario: str, renders: int, reruns: int) -> dict:
+    at = AppTest.from_file(str(PAGINA), default_timeout=60)
+    at.run()  # aquecimento: imports e cache da página
+    parar, feitos = threading.Event(), [0]
+    threads = []
+    if cenario == "threads":
+        threads = _renders(renders, lambda d, c, h: modelos.renderizar(d, c, h, usar_cache=False), parar, feitos)
+    elif cenario == "processos":
+        threads = _renders(renders, lambda d, c, h: processos.renderizar(d, c, h, usar_cache=False, espera=None),
+                           parar, feitos)
+    time.sleep(0.5)  # renders já em regime
+    tempos = []
+    t_ini = time.perf_counter()
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        tempos.append((time.perf_counter() - t0) * 1000)
+    duracao = time.perf_counter() - t_ini
+    parar.set()
+    for t in threads:
+        t.join()
+    return {"p50": _percentil(tempos, 50), "p95": _percentil(tempos, 95), "renders_s": feitos[0] / duracao}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--renders", type=int, default=4, help="threads renderizando ao mesmo tempo")
+    ap.add_argument("--reruns", type=int, default=40)
+    ap.add_argument("--tolerancia", type=float, default=0.5, help="piora aceita do p95 (0.5 = 50%%)")
+    args = ap.parse_args()
+
+    processos.aquecer([MODELO_REVISAO])
+    res = {c: medir(c, args.renders, args.reruns) for c in ("base", "threads", "processos")}
+    for c, r in res.items():
+        print(f"{c:10s} rerun p50={r['p50']:7.1f} ms  p95={r['p95']:7.1f} ms  renders/s={r['renders_s']:6.1f}")
+
+    limite = res["base"]["p95"] * (1 + args.tolerancia)
+    if not processos.ISOLA:
+        print(f"comparação pulada: {os.cpu_count()} CPU(s), o pool não isola o render do servidor",
+              file=sys.stderr)
+        return 0
+    if res["processos"]["p95"] > limite:
+        print(f"FALHOU: p95 com processos {res['processos']['p95']:.1f} ms > {limite:.1f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Relatório de tempo de import das páginas (python -X importtime).
+
+Para cada página, importa o Streamlit e os módulos de ``orcamentos`` que a
+página usa num processo novo e mede quanto o nosso código acrescenta por cima
+do Streamlit. Falha (exit 1) se alguma dependência pesada de documento for
+importada no carregamento ou se o tempo piorar além da tolerância.
+
+    python tools/importtime.py                       # relatório
+    python tools/importtime.py --salvar base.json    # grava baseline
+    python tools/importtime.py --comparar base.json  # compara com baseline
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+PAGINAS = {
+    "revisao": ["orcamentos.conversor_pdf", "orcamentos.desempenho", "orcamentos.lote",
+                "orcamentos.revisao", "orcamentos.formatacao", "orcamentos.modelos", "orcamentos.pdf_nativo",
+                "orcamentos.incremental", "orcamentos.nomes", "orcamentos.pagina_revisao"],
+    "vla": ["orcamentos.desempenho", "orcamentos.precos", "orcamentos.formatacao",
+            "orcamentos.politicas", "orcamentos.pdf_nativo", "orcamentos.nomes"],
+    "eliv": ["orcamentos.conversor_pdf", "orcamentos.desempenho", "orcamentos.precos",
+             "orcamentos.formatacao", "orcamentos.modelos", "orcamentos.pdf_nativo", "orcamentos.nomes"],
+}
+
+# Só podem ser importados quando um documento é gerado
+PROIBIDOS_NO_CARREGAMENTO = {"docxtpl", "docx", "lxml", "jinja2", "docx2pdf", "openpyxl", "fpdf", "fontTools"}
+
+
+def _importtime(codigo: str) -> dict[str, tuple[int, int]]:
+    """{modulo: (self_us, cumulativo_us)} de um processo que executa ``codigo``."""
+    r = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                       capture_output=True, text=True, cwd=RAIZ, check=True)
+    tempos = {}
+    for linha in r.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        self_us, cumul_us, nome = (p.strip() for p in linha[len("import time:"):].split("|"))
+        tempos[nome.strip()] = (int(self_us), int(cumul_us))
+    return tempos
+
+
+def medir(repeticoes: int = 3) -> dict:
+    base = [_importtime("import streamlit") for _ in range(repeticoes)]
+    mods_base = set(base[0])
+    relatorio = {}
+    for pagina, modulos in PAGINAS.items():
+        codigo = "import streamlit\n" + "\n".join(f"import {m}" for m in modulos)
+        rodadas = [_importtime(codigo) for _ in range(repeticoes)]
+        extras = {}
+        for m in set(rodadas[0]) - mods_base:
+            extras[m] = min(r[m][0] for r in rodadas if m in r)
+        relatorio[pagina] = {
+            "extra_us": sum(extras.values()),
+            "modulos_extras": len(extras),
+            "mais_lentos": sorted(extras.items(), key=lambda kv: -kv[1])[:10],
+            "proibidos": sorted({m.split(".")[0] for m in extras} & PROIBIDOS_NO_CARREGAMENTO),
+        }
+    return relatorio
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeticoes", type=int, default=3)
+    ap.add_argument("--salvar", type=Path)
+    ap.add_argument("--comparar", type=Path)
+    ap.add_argument("--tolerancia", type=float, default=0.25, help="piora relativa aceita (0.25 = 25%%)")
+    args = ap.parse_args()
+
+    rel = medir(args.repeticoes)
+    falhou = False
+    base = json.loads(args.comparar.read_text()) if args.comparar else {}
+    for pagina, r in rel.items():
+        print(f"[{pagina}] +{r['extra_us'] / 1000:.1f} ms sobre o Streamlit ({r['modulos_extras']} módulos)")
+        for nome, us in r["mais_lentos"]:
+            print(f"    {us / 1000:8.2f} ms  {nome}")
+        if r["proibidos"]:
+            falhou = True
+            print(f"    ERRO: importados no carregamento: {', '.join(r['proibidos'])}")
+        if pagina in base:
+            anterior = base[pagina]["extra_us"]
+            if anterior and r["extra_us"] > anterior * (1 + args.tolerancia):
+                falhou = True
+                print(f"    REGRESSÃO: {anterior / 1000:.1f} ms → {r['extra_us'] / 1000:.1f} ms")
+    if args.salvar:
+        args.salvar.write_text(json.dumps(rel, indent=2, ensure_ascii=False))
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
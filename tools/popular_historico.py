@@ -0,0 +1,123 @@
+"""Enche um histórico de teste com orçamentos sintéticos e mede as buscas e o autocompletar.
+
+    ORCAMENTO_HISTORICO=/tmp/hist.sqlite3 python tools/popular_historico.py --n 500000
+"""
+import argparse
+import datetime
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from orcamentos import historico, nomes  # noqa: E402
+
+NOMES = ["Ana", "Bruno", "Carla", "Débora", "Eduardo", "Fábio", "Gabriela", "Helena", "Íris", "João",
+         "Kátia", "Lucas", "Marina", "Nicolas", "Otávio", "Paula", "Rafael", "Sílvia", "Tiago", "Vânia"]
+SOBRENOMES = ["Silva", "Souza", "Oliveira", "Santos", "Lima", "Pereira", "Costa", "Almeida", "Araújo",
+              "Ribeiro", "Carvalho", "Gomes", "Martins", "Rocha", "Barbosa"]
+SILABAS = ["ba", "be", "ca", "co", "da", "de", "fa", "fi", "ga", "go", "la", "le", "ma", "mo", "na", "ne",
+           "pa", "pe", "ra", "ri", "sa", "so", "ta", "te", "va", "vi", "za", "zo", "lu", "mi"]
+OBRAS = ["Dicionário Temático de", "Ensaios sobre", "Manual de", "História de", "Introdução a"]
+UNIVERSIDADES = ["Universidade Federal de", "Universidade Estadual de", "Instituto Federal de"]
+
+BUSCAS = {
+    "sem filtro": {},
+    "cliente (prefixo)": {"cliente": "mar"},
+    "cliente + consultor": {"cliente": "joao s", "consultor": "lucas martins"},
+    "consultor": {"consultor": "paula costa"},
+    "consultor + produto": {"consultor": "paula costa", "produtos": ["eliv_comum"]},
+    "produto + período": {"produtos": ["vla"], "desde": datetime.date(2025, 3, 1),
+                          "ate": datetime.date(2025, 3, 31)},
+    "faixa de valor": {"valor_min_cent": 500_000, "valor_max_cent": 510_000},
+}
+
+AUTOCOMPLETAR = {
+    "cliente (prefixo)": ("cliente", "joao s"),
+    "cliente (sobrenome)": ("cliente", "silva ma"),
+    "cliente (erro)": ("cliente", "mrina"),
+    "cliente (erro no fim)": ("cliente", "marina costa baf"),
+    "obra": ("obra", "manual de ga"),
+    "universidade (erro)": ("universidade", "universidade federla"),
+}
+
+
+def _palavra() -> str:
+    return "".join(random.choice(SILABAS) for _ in range(3)).title()
+
+
+def popular(n: int) -> None:
+    conn = historico._conectar()
+    historico._garantir_esquema(conn)
+    produtos = list(historico.PRODUTOS)
+    consultores = ["Lucas Martins", "Paula Costa"] + [f"{random.choice(NOMES)} {random.choice(SOBRENOMES)}"
+                                                     for _ in range(38)]
+    inicio = datetime.datetime(2024, 1, 1)
+    linhas = []
+    for _ in range(n):
+        cliente = (f"{random.choice(['', 'Prof. ', 'Dra. '])}{random.choice(NOMES)} {random.choice(SOBRENOMES)}"
+                   f" {_palavra()}")
+        consultor = random.choice(consultores)
+        quando = inicio + datetime.timedelta(seconds=random.randrange(3 * 365 * 86400))
+        produto = random.choice(produtos)
+        contexto = {}
+        if produto.startswith("eliv"):
+            contexto["obra"] = f"{random.choice(OBRAS)} {_palavra()}"
+        if produto == "eliv_universidade":
+            contexto["universidade"] = f"{random.choice(UNIVERSIDADES)} {_palavra()}"
+        linhas.append((quando.strftime("%Y-%m-%d %H:%M:%S"), produto, cliente,
+                       historico.normalizar(cliente), consultor, historico.normalizar(consultor),
+                       random.randrange(5_000, 2_000_000), None, json.dumps(contexto), None))
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO orcamentos (criado_em, produto, cliente, cliente_busca, consultor, consultor_busca,"
+        " valor_cent, modelo_hash, contexto, script) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", linhas)
+    conn.executemany("INSERT OR REPLACE INTO consultores (busca, nome) VALUES (?, ?)",
+                     {historico.normalizar(c): c for c in consultores}.items())
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--n", type=int, default=500_000, help="orçamentos a inserir (0 = só medir)")
+    args = ap.parse_args()
+    print(f"histórico: {historico.CAMINHO}")
+    if args.n:
+        t0 = time.perf_counter()
+        popular(args.n)
+        print(f"{args.n} orçamentos inseridos em {time.perf_counter() - t0:.1f}s")
+    for nome, filtros in BUSCAS.items():
+        historico.buscar(**filtros)
+        t0 = time.perf_counter()
+        for _ in range(10):
+            r = historico.buscar(**filtros)
+        print(f"  {nome:22s} {len(r):4d} linhas  {(time.perf_counter() - t0) * 100:7.2f} ms")
+    medir_autocompletar()
+
+
+def medir_autocompletar() -> None:
+    if not nomes.carregar(nomes.caminho_arquivo()):
+        t0 = time.perf_counter()
+        nomes._sincronizar()
+        print(f"índice de nomes montado em {time.perf_counter() - t0:.1f}s")
+        nomes.salvar(nomes._indices, nomes._ate_id, nomes.caminho_arquivo())
+    t0 = time.perf_counter()
+    nomes._indices = None
+    nomes._sincronizar()
+    tamanho = nomes.caminho_arquivo().stat().st_size / 2**20
+    print(f"índice de nomes carregado do arquivo ({tamanho:.1f} MiB) em {time.perf_counter() - t0:.2f}s:",
+          ", ".join(f"{campo} {len(nomes._indices[campo].nomes)}" for campo in nomes.CAMPOS))
+    for nome, (campo, texto) in AUTOCOMPLETAR.items():
+        nomes.sugerir(campo, texto)
+        t0 = time.perf_counter()
+        for _ in range(100):
+            r = nomes.sugerir(campo, texto)
+        print(f"  {nome:22s} {len(r):4d} nomes   {(time.perf_counter() - t0) * 10:7.3f} ms  {r[:2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Confere que ``modelos.renderizar`` gera o mesmo .docx que ``tpl.save``.
+
+Renderiza cada modelo do repositório com um contexto de exemplo pelos dois
+caminhos e compara membro a membro o conteúdo descompactado (nomes, ordem e
+bytes). Datas dentro do ZIP e bytes comprimidos podem diferir; o conteúdo não.
+Também confere que duas renderizações iguais dão exatamente os mesmos bytes e
+que as revisões do orçamento da Revisão (outro desconto e outras parcelas)
+montadas por ``orcamentos.incremental`` são idênticas ao render completo.
+
+    python tools/verificar_docx.py
+"""
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from orcamentos import incremental, modelos, processos, revisao  # noqa: E402
+from bench import (MODELO_REVISAO, _contexto_comum, _contexto_revisao,  # noqa: E402
+                   _contexto_universidade)
+from orcamentos.eliv import TEMPLATE_COMUM, TEMPLATE_UNI  # noqa: E402
+
+CASOS = {
+    "revisao": (MODELO_REVISAO, _contexto_revisao),
+    "eliv_comum": (TEMPLATE_COMUM, _contexto_comum),
+    "eliv_universidade": (TEMPLATE_UNI, _contexto_universidade),
+}
+
+
+def _conteudo(docx: bytes) -> list[tuple[str, bytes]]:
+    with zipfile.ZipFile(io.BytesIO(docx)) as z:
+        assert z.testzip() is None
+        return [(i.filename, z.read(i)) for i in z.infolist()]
+
+
+def diferencas(caminho: Path, contexto: dict) -> list[str]:
+    dados, h = modelos.ler_arquivo(caminho)
+    rapido = modelos.renderizar(dados, contexto, h, usar_cache=False)
+    if rapido != modelos.renderizar(dados, contexto, h, usar_cache=False):
+        return ["duas renderizações com a mesma entrada geraram bytes diferentes"]
+    tpl = modelos.obter_modelo(dados, h)
+    tpl.render(contexto)
+    buf = io.BytesIO()
+    tpl.save(buf)
+    a, b = _conteudo(rapido), _conteudo(buf.getvalue())
+    if [n for n, _ in a] != [n for n, _ in b]:
+        return [f"membros diferentes: {[n for n, _ in a]} != {[n for n, _ in b]}"]
+    return [nome for (nome, x), (_, y) in zip(a, b) if x != y]
+
+
+def diferencas_revisoes(caminho: Path, base: dict) -> list[str]:
+    """Revisões de desconto/parcelas pelo caminho incremental x render completo."""
+    dados, h = modelos.ler_arquivo(caminho)
+    dif = []
+    for desconto in (0.0, 12.5, 20.0, 25.0):
+        for parcelas in range(1, revisao.MAX_PARCELAS + 1):
+            calc = revisao.calcular(85_000, 0.03, desconto, parcelas, aplicar_desconto=desconto > 0)
+            ctx = {**base, **{k: v for k, v in revisao.montar_contexto(calc, "", "", "", "", "").items()
+                              if k in incremental.VARIAVEIS}}
+            if incremental._incremental(dados, ctx, h, incremental.VARIAVEIS, None) != \
+                    modelos.renderizar(dados, ctx, h, usar_cache=False):
+                dif.append(f"{desconto}% em {parcelas}x")
+    if incremental.estatisticas()["modelos_completos"]:
+        dif.append("modelo não admite o render incremental")
+    return dif
+
+
+def main() -> int:
+    processos.PROCESSOS = 0  # tudo neste processo
+    falhou = False
+    for nome, (caminho, contexto) in CASOS.items():
+        dif = diferencas(caminho, contexto())
+        falhou |= bool(dif)
+        print(f"{nome:20s} {'OK' if not dif else 'DIFERENTE: ' + ', '.join(dif)}")
+    dif = diferencas_revisoes(MODELO_REVISAO, _contexto_revisao())
+    falhou |= bool(dif)
+    print(f"{'revisao.incremental':20s} {'OK' if not dif else 'DIFERENTE: ' + ', '.join(dif)}")
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())